@@ -1,19 +1,7 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+"""
+The HTTP backend.
 
-app = FastAPI()
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Import route handlers
-from .main import simulate
-
-# Register routes
-app.add_route("/simulate", simulate, methods=["POST"])
\ No newline at end of file
+Its modules import each other by top-level name (``from settings import
+...``), so serve it from this directory (``uvicorn main:app``) or through
+the repository root's main.py, which puts this directory on ``sys.path``.
+"""
@@ -0,0 +1,192 @@
+"""
+Cost-based admission control for /simulate, /truth-table and /equivalence.
+
+Before a simulation runs, its cost is estimated from the parsed circuit
+as the work it will do: every step updates each gate, flip-flop and memory and
+appends one value per recorded signal, so
+
+    cost = steps x (gates + flip-flops + memories + recorded signals)
+
+An :class:`AdmissionController` then
+
+* rejects requests above ``max_cost`` (:class:`OverBudget`, HTTP 413),
+* runs requests up to ``fast_cost`` in a fast lane with its own slots, so
+  interactive edits never wait behind long runs,
+* gives the remaining requests a few slow-lane slots, handed out
+  round-robin per client so one client's burst cannot starve the others,
+* refuses requests once ``max_queued`` are already waiting in their lane
+  (:class:`AdmissionQueueFull`, HTTP 503).
+
+The controller is driven from the event loop: ``await acquire()`` before
+the simulation, ``release()`` after it. It is not thread-safe.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+FAST, SLOW = "fast", "slow"
+LANES = (FAST, SLOW)
+
+
+class OverBudget(Exception):
+    """Raised by :meth:`AdmissionController.acquire` for a request costing more than ``max_cost``."""
+
+
+class AdmissionQueueFull(Exception):
+    """Raised by :meth:`AdmissionController.acquire` when the request's lane has too many waiters."""
+
+
+def max_delay(circuit) -> int:
+    """Longest gate DELAY of ``circuit`` (1 without any)."""
+    delays = [gate.delay for gate in circuit.gates if gate.delay is not None]
+    return max(delays + list(circuit.gate_delays.values()) + [1])
+
+
+def estimate_cost(circuit, steps: int, record: bool = True, timing: bool = False) -> int:
+    """Work units of simulating ``circuit`` for ``steps`` steps.
+
+    With ``timing`` the timing simulator's wheel of up to ``max_delay``
+    buckets is added.
+    """
+    work = len(circuit.gates) + len(circuit.flipflops) + len(circuit.memories)
+    if record:
+        work += len(circuit.signals)
+    cost = max(0, steps) * max(1, work)
+    if timing:
+        cost += min(max_delay(circuit), max(0, steps))
+    return cost
+
+
+def estimate_truth_table_cost(circuit) -> int:
+    """Work units of tabulating ``circuit``: every gate at most once per row."""
+    return (1 << len(circuit.inputs)) * max(1, len(circuit.gates))
+
+
+# Vectors of an equivalence check that cost one work unit: they share one
+# machine word of the bit-parallel evaluation.
+VECTORS_PER_UNIT = 64
+
+
+def estimate_equivalence_cost(circuit_a, circuit_b, vectors: int, exhaustive_limit: int = 20) -> int:
+    """Work units of checking two circuits on ``vectors`` input vectors.
+
+    Combinational circuits with at most ``exhaustive_limit`` inputs are
+    checked on all ``2 ** inputs`` vectors instead, so the larger count is used.
+    """
+    work = sum(len(c.gates) + len(c.flipflops) for c in (circuit_a, circuit_b))
+    vectors = max(vectors, 1 << min(len(circuit_a.inputs), exhaustive_limit))
+    return -(-vectors // VECTORS_PER_UNIT) * max(1, work)
+
+
+class Ticket:
+    """One admitted (or waiting) request."""
+
+    def __init__(self, cost: int, client: str, lane: str):
+        self.cost = cost
+        self.client = client
+        self.lane = lane
+        self.queued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self._granted: Optional[asyncio.Future] = None
+
+    @property
+    def wait(self) -> float:
+        """Seconds spent queued before the request could run."""
+        return (self.started_at or time.perf_counter()) - self.queued_at
+
+
+class AdmissionController:
+    """
+    :param fast_cost: highest cost that runs in the fast lane
+    :param max_cost: highest cost accepted at all
+    :param fast_slots: fast-lane requests running at once
+    :param slow_slots: slow-lane requests running at once
+    :param max_queued: waiting requests per lane before :class:`AdmissionQueueFull`
+    """
+
+    def __init__(self, fast_cost: int, max_cost: int, fast_slots: int = 4, slow_slots: int = 1,
+                 max_queued: int = 32):
+        if fast_cost > max_cost:
+            raise ValueError("fast_cost must not exceed max_cost.")
+        self.fast_cost = fast_cost
+        self.max_cost = max_cost
+        self.max_queued = max_queued
+        self._slots = {FAST: fast_slots, SLOW: slow_slots}
+        self._running = {FAST: 0, SLOW: 0}
+        # Per lane: client -> its waiting tickets; the first client is served next.
+        self._waiting: Dict[str, "OrderedDict[str, Deque[Ticket]]"] = {FAST: OrderedDict(), SLOW: OrderedDict()}
+        self._queued = {FAST: 0, SLOW: 0}
+        self.rejected = {"over_budget": 0, "queue_full": 0}
+
+    def lane(self, cost: int) -> str:
+        """The lane a request of this cost runs in; raises :class:`OverBudget`."""
+        if cost > self.max_cost:
+            raise OverBudget(f"Estimated cost {cost} exceeds the budget of {self.max_cost} "
+                             f"(steps x (gates + flip-flops + memories + recorded signals)). "
+                             f"Reduce the steps, record fewer signals, or submit it to POST /jobs.")
+        return FAST if cost <= self.fast_cost else SLOW
+
+    async def acquire(self, cost: int, client: str) -> Ticket:
+        """Waits for a slot in the request's lane; pair with :meth:`release`."""
+        try:
+            lane = self.lane(cost)
+        except OverBudget:
+            self.rejected["over_budget"] += 1
+            raise
+        ticket = Ticket(cost, client, lane)
+        if self._running[lane] < self._slots[lane] and not self._queued[lane]:
+            self._start(ticket)
+            return ticket
+        if self._queued[lane] >= self.max_queued:
+            self.rejected["queue_full"] += 1
+            raise AdmissionQueueFull(f"Too many {lane} simulations waiting ({self.max_queued}); try again later.")
+
+        ticket._granted = asyncio.get_running_loop().create_future()
+        self._waiting[lane].setdefault(client, deque()).append(ticket)
+        self._queued[lane] += 1
+        try:
+            await ticket._granted
+        except asyncio.CancelledError:
+            # The client went away: give the slot back, or leave the queue.
+            if ticket.started_at is not None:
+                self.release(ticket)
+            else:
+                self._withdraw(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: Ticket):
+        lane = ticket.lane
+        self._running[lane] -= 1
+        waiting = self._waiting[lane]
+        if not waiting:
+            return
+        # Round-robin: the client served now goes to the back of the line.
+        client, tickets = next(iter(waiting.items()))
+        following = tickets.popleft()
+        if tickets:
+            waiting.move_to_end(client)
+        else:
+            del waiting[client]
+        self._queued[lane] -= 1
+        self._start(following)
+        following._granted.set_result(None)
+
+    def _start(self, ticket: Ticket):
+        self._running[ticket.lane] += 1
+        ticket.started_at = time.perf_counter()
+
+    def _withdraw(self, ticket: Ticket):
+        waiting = self._waiting[ticket.lane]
+        tickets = waiting[ticket.client]
+        tickets.remove(ticket)
+        if not tickets:
+            del waiting[ticket.client]
+        self._queued[ticket.lane] -= 1
+
+    def depths(self) -> Dict[str, Dict[str, int]]:
+        """Running and queued requests per lane."""
+        return {lane: {"running": self._running[lane], "queued": self._queued[lane],
+                       "clients": len(self._waiting[lane])} for lane in LANES}
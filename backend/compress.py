@@ -0,0 +1,157 @@
+"""
+HTTP response compression.
+
+Waveform payloads are long runs of repeated digits and compress by one to
+two orders of magnitude. ``negotiate`` picks the best encoding the client
+accepts among those installed (zstd and brotli are optional packages, gzip
+is always there), and ``compressed_response`` builds the FastAPI response,
+streaming the compressor output for large bodies so the first bytes leave
+before the whole payload is compressed.
+"""
+
+import gzip
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies smaller than this are sent as they are.
+MIN_SIZE = 1024
+# Bodies larger than this are compressed and sent in chunks.
+STREAM_THRESHOLD = 4 * 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+
+def available_encodings() -> list:
+    """Supported content codings, best first."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Chooses a content coding from an ``Accept-Encoding`` header value, or
+    None for an uncompressed body."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding is None:
+        return body
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported content encoding '{encoding}'.")
+
+
+def decompress(data: bytes, encoding: Optional[str]) -> bytes:
+    if encoding is None:
+        return data
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br":
+        return brotli.decompress(data)
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"Unsupported content encoding '{encoding}'.")
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Incrementally compresses ``chunks``; yields non-empty output pieces."""
+    if encoding == "gzip":
+        c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        feed, finish = c.compress, c.flush
+    elif encoding == "br":
+        c = brotli.Compressor(quality=BROTLI_QUALITY)
+        feed, finish = c.process, c.finish
+    elif encoding == "zstd":
+        c = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        feed, finish = c.compress, c.flush
+    else:
+        raise ValueError(f"Unsupported content encoding '{encoding}'.")
+    for chunk in chunks:
+        out = feed(chunk)
+        if out:
+            yield out
+    out = finish()
+    if out:
+        yield out
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield view[start:start + CHUNK_SIZE]
+
+
+def compressed_response(body: bytes, media_type: str, accept_encoding: Optional[str],
+                        headers: Optional[dict] = None, cache=None, key: Optional[str] = None):
+    """Builds a (possibly streamed) compressed FastAPI response for ``body``.
+
+    With a :class:`result_cache.ResultCache` and ``key`` the compressed
+    bytes are stored so later hits are served without re-encoding.
+    """
+    from fastapi.responses import Response, StreamingResponse
+
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept, Accept-Encoding"
+    encoding = negotiate(accept_encoding) if len(body) >= MIN_SIZE else None
+
+    if encoding is None:
+        if cache is not None and key is not None:
+            cache.put(key, media_type, body, None)
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    headers["Content-Encoding"] = encoding
+    if len(body) < STREAM_THRESHOLD:
+        data = compress(body, encoding)
+        if cache is not None and key is not None:
+            cache.put(key, media_type, data, encoding)
+        return Response(content=data, media_type=media_type, headers=headers)
+
+    def stream() -> Iterator[bytes]:
+        parts = []
+        for part in compress_stream(_chunks(body), encoding):
+            parts.append(part)
+            yield part
+        if cache is not None and key is not None:
+            cache.put(key, media_type, b"".join(parts), encoding)
+
+    return StreamingResponse(stream(), media_type=media_type, headers=headers)
@@ -0,0 +1,251 @@
+"""
+Background simulation jobs.
+
+``POST /jobs`` hands a simulation to a :class:`JobManager` instead of
+running it inside the request, so long runs are not cut off by proxy
+timeouts. Jobs wait in a bounded priority queue, cheapest first
+(steps x components), and run on a small pool of worker threads that
+report progress through the simulator's progress callback. Each job
+records straight into an on-disk waveform store (core.wavestore), so a
+run is limited by disk rather than memory; the stores live in a local
+directory, one per job, next to a copy of the netlist.
+
+A job id is the hash of everything that determines its result, so
+identical submissions share one job, and a result already on disk (for
+example from before a restart) is served without running anything.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from core.optimizer import optimize_circuit
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.stimulus import Spec
+from core.wavecodec import encode_waveforms
+from core.wavestore import META_FILE, WaveStore, WaveStoreWriter
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueueFull(Exception):
+    """Raised by :meth:`JobManager.submit` when the queue is at capacity."""
+
+
+class Job:
+    def __init__(self, job_id: str, netlist: str, steps: int, inputs: Dict[str, Spec],
+                 optimize: bool, cost: int):
+        self.id = job_id
+        self.netlist = netlist
+        self.steps = steps
+        self.inputs = inputs
+        self.optimize = optimize
+        self.cost = cost
+        self.status = QUEUED
+        self.step = 0
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "step": self.step,
+            "total": self.steps,
+            "progress": self.step / self.steps if self.steps else 1.0,
+            "cost": self.cost,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def job_id(netlist: str, steps: int, inputs: Dict[str, Spec], optimize: bool) -> str:
+    blob = json.dumps([netlist, steps, inputs, optimize], sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+_JOB_ID = re.compile(r"[0-9a-f]{64}")
+
+
+def is_job_id(text: str) -> bool:
+    """Whether ``text`` has the form of a job id (a SHA-256 hex digest).
+
+    Ids name files in the store directory, so anything else is refused
+    before it reaches a path.
+    """
+    return bool(_JOB_ID.fullmatch(text))
+
+
+class JobManager:
+    """Queue, worker pool and on-disk result store for simulation jobs.
+
+    :param store_dir: directory for result files (created if missing)
+    :param workers: worker threads
+    :param max_pending: queued jobs accepted before :class:`JobQueueFull`
+    """
+
+    def __init__(self, store_dir: Optional[str] = None, workers: int = 2, max_pending: int = 64):
+        self.store_dir = store_dir or os.path.join(tempfile.gettempdir(), "vhdlsim-jobs")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.jobs: Dict[str, Job] = {}
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._pending = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def result_path(self, job_id: str) -> str:
+        """Directory of the job's waveform store."""
+        return os.path.join(self.store_dir, f"{self._checked(job_id)}.wave")
+
+    def _has_result(self, job_id: str) -> bool:
+        return os.path.exists(os.path.join(self.result_path(job_id), META_FILE))
+
+    def netlist_path(self, job_id: str) -> str:
+        return os.path.join(self.store_dir, f"{self._checked(job_id)}.net")
+
+    @staticmethod
+    def _checked(job_id: str) -> str:
+        if not is_job_id(job_id):
+            raise ValueError(f"Invalid job id {job_id!r}.")
+        return job_id
+
+    def submit(self, netlist: str, steps: int, inputs: Dict[str, Spec], optimize: bool = False) -> Job:
+        """Queues a simulation, or returns the existing job for the same
+        submission. Raises NetlistParseError for an invalid netlist."""
+        jid = job_id(netlist, steps, inputs, optimize)
+        with self._lock:
+            job = self.jobs.get(jid)
+            if job is not None and job.status != FAILED:
+                return job
+
+        circuit = NetlistParser(netlist, allow_files=False).parse()
+        cost = steps * max(1, len(circuit.gates) + len(circuit.flipflops))
+        job = Job(jid, netlist, steps, inputs, optimize, cost)
+
+        with self._lock:
+            existing = self.jobs.get(jid)
+            if existing is not None and existing.status != FAILED:
+                return existing
+            if self._has_result(jid):
+                job.status, job.step, job.finished = DONE, steps, time.time()
+                self.jobs[jid] = job
+                return job
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({self.max_pending} pending).")
+            self.jobs[jid] = job
+            self._pending += 1
+            self._seq += 1
+            self._queue.put((cost, self._seq, jid))
+            self._start_workers()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """The job with this id, or None (also for malformed ids)."""
+        if not is_job_id(job_id):
+            return None
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None and self._has_result(job_id):
+            # Finished in an earlier process; only the result is known.
+            with self.open_result(job_id) as store:
+                steps = store.steps
+            job = Job(job_id, "", steps, {}, False, 0)
+            job.status, job.step = DONE, steps
+            with self._lock:
+                job = self.jobs.setdefault(job_id, job)
+        return job
+
+    def open_result(self, job_id: str) -> WaveStore:
+        """The memory-mapped store of a finished job; close it after use."""
+        return WaveStore(self.result_path(job_id))
+
+    def read_result(self, job_id: str) -> bytes:
+        """The whole result of a finished job in the binary waveform format
+        (core.wavecodec). This expands every waveform in memory; use
+        :meth:`open_result` for windows of large results."""
+        waveforms, steps, meta = self.load(job_id)
+        return encode_waveforms(waveforms, steps, meta=meta)
+
+    def load(self, job_id: str):
+        """Returns ``(waveforms, steps, meta)`` of a finished job."""
+        with self.open_result(job_id) as store:
+            return store.waveforms(sorted(store.signals)), store.steps, store.meta
+
+    def load_netlist(self, job_id: str) -> str:
+        with open(self.netlist_path(job_id), encoding="utf-8") as f:
+            return f.read()
+
+    def _start_workers(self):
+        # Called with the lock held; threads start on first use.
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"sim-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            _, _, jid = self._queue.get()
+            with self._lock:
+                self._pending -= 1
+                job = self.jobs[jid]
+            try:
+                self._run(job)
+            except Exception as e:
+                job.error = str(e)
+                job.finished = time.time()
+                job.status = FAILED
+            self._queue.task_done()
+
+    def _run(self, job: Job):
+        job.status, job.started = RUNNING, time.time()
+        circuit = NetlistParser(job.netlist, allow_files=False).parse()
+        meta = {}
+        if job.optimize:
+            meta["optimization"] = optimize_circuit(circuit).to_dict()
+
+        def progress(step: int, total: int):
+            job.step = step
+
+        # Recorded under a temporary name and renamed when complete, so
+        # readers never see a partial store.
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = self.result_path(job.id)
+        partial = tempfile.mkdtemp(dir=self.store_dir, suffix=".partial")
+        try:
+            sim = Simulator(circuit, progress=progress, recorder=WaveStoreWriter(partial, meta=meta))
+            sim.run(job.steps, job.inputs)
+            self._write(self.netlist_path(job.id), job.netlist.encode("utf-8"))
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            os.replace(partial, path)
+        finally:
+            shutil.rmtree(partial, ignore_errors=True)
+        job.finished = time.time()
+        job.status = DONE
+
+    def _write(self, path: str, data: bytes):
+        # Write then rename so readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def join(self):
+        """Blocks until every queued job has finished."""
+        self._queue.join()
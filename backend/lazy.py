@@ -0,0 +1,38 @@
+"""
+Deferred imports for a fast cold start.
+
+``core = LazyModules("core")`` gives an object whose attributes are the
+modules of the ``core`` package, imported on first access
+(``core.simulator.Simulator``). The first access pays the import and is
+timed; later accesses are plain attribute lookups. ``LazyModules()``
+without a package does the same for top-level modules, such as the
+backend's own ``jobs`` and ``fastjson``.
+"""
+
+import importlib
+import threading
+import time
+from typing import Dict, Optional
+
+
+class LazyModules:
+    def __init__(self, package: Optional[str] = None):
+        self._package = package
+        self._lock = threading.Lock()
+        # module name -> seconds its first import took
+        self.import_times: Dict[str, float] = {}
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        full = f"{self._package}.{name}" if self._package else name
+        with self._lock:
+            start = time.perf_counter()
+            module = importlib.import_module(full)
+            self.import_times.setdefault(full, time.perf_counter() - start)
+            # Cache on the instance so __getattr__ is not called again.
+            setattr(self, name, module)
+        return module
+
+    def loaded(self) -> Dict[str, float]:
+        return dict(self.import_times)
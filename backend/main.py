@@ -1,78 +1,182 @@
+"""
+The simulator's HTTP API.
+
+``create_app()`` builds the FastAPI application and ``app`` is the
+instance uvicorn serves (``uvicorn main:app`` here, or from the repository
+root through its main.py). Simulation code is imported on first use (see
+lazy.py), so a new process starts serving right away. Unless
+PREWARM_TEMPLATES is empty, a background thread then loads it and runs
+the template circuits once (prewarm.py), so the first request is hot.
+Startup times are reported by /health and /metrics.
+"""
+
+import time
+_IMPORT_START = time.perf_counter()
+
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+import functools
+import io
+import json
+import threading
 import traceback
 from pydantic import BaseModel
-from core.parser import NetlistParser
-from settings import ALLOWED_ORIGINS, ENV
+from settings import (ALLOWED_ORIGINS, ENV, PREWARM_TEMPLATES, ADMISSION_FAST_COST, ADMISSION_MAX_COST,
+                      ADMISSION_FAST_SLOTS, ADMISSION_SLOW_SLOTS, ADMISSION_MAX_QUEUED, EQUIVALENCE_MAX_VECTORS,
+                      TRUSTED_PROXIES)
+from metrics import METRICS
+from compress import compressed_response, negotiate
+from result_cache import ResultCache
+from lazy import LazyModules
+from admission import (AdmissionController, AdmissionQueueFull, OverBudget, estimate_cost,
+                       estimate_equivalence_cost, estimate_truth_table_cost)
+
+# core.* and the heavier backend modules (jobs, fastjson) load on first use.
+core = LazyModules("core")
+local = LazyModules()
+
+RESULT_CACHE = ResultCache()
+ADMISSION = AdmissionController(ADMISSION_FAST_COST, ADMISSION_MAX_COST, fast_slots=ADMISSION_FAST_SLOTS,
+                                slow_slots=ADMISSION_SLOW_SLOTS, max_queued=ADMISSION_MAX_QUEUED)
+METRICS.admission = ADMISSION
+# Seconds spent importing this module, building the app and pre-warming.
+STARTUP = {"import": None, "app": None, "prewarm": None}
 
-app = FastAPI(title="VHDL Web Simulator Backend")
+router = APIRouter()
 
-# ✅ Enable CORS based on environment
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+def _record_startup(step: str, seconds: float):
+    STARTUP[step] = seconds
+    METRICS.observe_startup(step, seconds)
+
+
+@functools.lru_cache(maxsize=None)
+def job_manager():
+    return local.jobs.JobManager(store_dir=os.getenv("JOB_STORE_DIR"), workers=int(os.getenv("JOB_WORKERS", "2")))
 
 # --- Health check endpoint ---
-@app.get("/health")
+@router.get("/health")
 async def health_check():
-    return {"status": "ok", "mode": ENV, "message": "Backend is running"}
+    lazy_imports = {**core.loaded(), **local.loaded()}
+    return {"status": "ok", "mode": ENV, "message": "Backend is running",
+            "startup": {**STARTUP, "lazy_imports": lazy_imports}, "admission": ADMISSION.depths()}
+
+# --- Prometheus metrics ---
+@router.get("/metrics")
+async def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
 
 # --- Request model ---
 class SimulateRequest(BaseModel):
     netlist: str
     steps: int
-    inputs: dict[str, str]
+    inputs: dict[str, str | dict]  # value strings or lazy stimulus specs (core/stimulus.py)
+    optimize: bool = False  # simplify the netlist before simulating
+    timings: bool = False  # add a per-phase "timings" block to the response
+    activity: bool = False  # add per-signal toggle / time-at-1 statistics
+    stats_only: bool = False  # return the statistics without waveforms
+    four_state: bool = False  # 0/1/X/Z simulation; waveform values 2 = X, 3 = Z
+    timing: bool = False  # honour gate DELAYs (core/timing.py) instead of zero-delay
+    max_failures: int = 1  # stop after this many ASSERT failures (0 = run all steps)
+    checks_only: bool = False  # return the ASSERT/MONITOR report without waveforms
+    capture: dict | None = None  # trigger capture (core/capture.py): only windows around trigger events
 
 # --- Simulation endpoint ---
-@app.post("/simulate")
-async def simulate(req: SimulateRequest):
+@router.post("/simulate")
+async def simulate(req: SimulateRequest, request: Request):
+    binary = core.wavecodec.MEDIA_TYPE in request.headers.get("accept", "")
+    accept_encoding = request.headers.get("accept-encoding")
+    # Timings describe one particular request, so those responses are not cached.
+    key = None
+    if not req.timings:
+        key = ResultCache.key("/simulate", req.netlist, req.steps, req.inputs, req.optimize,
+                              req.activity, req.stats_only, req.four_state, req.timing,
+                              req.max_failures, req.checks_only, req.capture, binary)
+        encoding = negotiate(accept_encoding)
+        cached = RESULT_CACHE.get(key, encoding)
+        if cached is not None:
+            media_type, data = cached
+            headers = {"Vary": "Accept, Accept-Encoding", "Server-Timing": "cache;desc=hit"}
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+            METRICS.observe_request("/simulate", 200)
+            return Response(content=data, media_type=media_type, headers=headers)
+
+    try:
+        # Clients may not make the server read its own files.
+        stimuli = core.stimulus.compile_inputs(req.inputs, allow_files=False)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    collect = req.activity or req.stats_only
+    if (req.four_state or req.timing) and collect:
+        raise HTTPException(status_code=400, detail="Activity statistics need the zero-delay two-state simulator.")
+    if req.four_state and req.timing:
+        raise HTTPException(status_code=400, detail="'four_state' and 'timing' cannot be combined.")
+    if req.optimize and req.four_state:
+        raise HTTPException(status_code=400, detail="'optimize' assumes 0/1 values and cannot be combined with 'four_state'.")
+    if req.optimize and req.timing:
+        raise HTTPException(status_code=400, detail="'optimize' ignores gate delays and cannot be combined with 'timing'.")
+    if req.checks_only and (req.four_state or req.timing):
+        raise HTTPException(status_code=400, detail="Checks are evaluated by the zero-delay two-state simulator only.")
+    waveforms_wanted = not (req.stats_only or req.checks_only)
+    capture = None
+    if req.capture is not None:
+        if req.four_state or req.timing or not waveforms_wanted:
+            raise HTTPException(status_code=400, detail="'capture' needs the zero-delay two-state simulator with waveforms.")
+        try:
+            capture = core.capture.Capture(**req.capture)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid capture: {e}")
+
+    instr = core.instrumentation.Instrumentation(counters=req.timings)
     try:
-        parser = NetlistParser(text=req.netlist)
+        parser = core.parser.NetlistParser(text=req.netlist, instrumentation=instr, allow_files=False)
         circuit = parser.parse()
+        report = None
+        if req.optimize:
+            with instr.phase("optimize"):
+                report = core.optimizer.optimize_circuit(circuit)
 
-        all_signal_names = set(circuit.signals.keys())
-        for clock in circuit.clocks:
-            all_signal_names.add(clock.name)
-        sorted_signal_names = sorted(list(all_signal_names))
-
-        steps_data = []
-        for step in range(req.steps):
-            # Set input values
-            for signal_name, vector_str in req.inputs.items():
-                if signal_name in circuit.signals and step < len(vector_str):
-                    value = int(vector_str[step])
-                    circuit.signals[signal_name].set_value(value)
-
-            # Update clocks and gates
-            for clock in circuit.clocks:
-                clock.update(step)
-            for gate in circuit.gates:
-                gate.update()
-
-            # Record signal values
-            state = {name: circuit.signals[name].get_value()
-                     for name in sorted_signal_names if name in circuit.signals}
-            steps_data.append(state)
-
-        waveforms = {name: [s.get(name, 0) for s in steps_data]
-                     for name in sorted_signal_names}
+        if circuit.memories and (req.four_state or req.timing):
+            raise HTTPException(status_code=400, detail="RAM/ROM blocks need the zero-delay two-state simulator.")
+        if circuit.checks and (req.four_state or req.timing):
+            # Rather than returning waveforms without the report the netlist asked for.
+            raise HTTPException(status_code=400, detail="ASSERT/MONITOR lines are evaluated by the zero-delay "
+                                                        "two-state simulator only; remove them or drop "
+                                                        "'four_state'/'timing'.")
+        if capture is not None:
+            try:
+                capture.validate(circuit.signals)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        # A capture keeps a bounded number of windows, not the waveforms.
+        cost = estimate_cost(circuit, req.steps, record=waveforms_wanted and capture is None, timing=req.timing)
+        if capture is not None:
+            cost += capture.max_bytes(circuit.signals)
+        ticket = await _admit("/simulate", cost, request)
+        try:
+            # Off the event loop, so fast-lane requests keep being served meanwhile.
+            body, media_type = await run_in_threadpool(
+                _run_simulation, req, circuit, report, stimuli, instr, binary, collect, waveforms_wanted, capture)
+        finally:
+            _release(ticket)
 
-        response = {
-            "waveforms": waveforms,
-            "steps": list(range(req.steps))
-        }
-
-        return JSONResponse(content=response)
+        METRICS.observe(instr)
+        METRICS.observe_request("/simulate", 200)
+        return compressed_response(body, media_type, accept_encoding,
+                                   headers={"Server-Timing": instr.server_timing(),
+                                            "X-Admission": f"lane={ticket.lane};cost={cost}"},
+                                   cache=RESULT_CACHE if key else None, key=key)
 
+    except HTTPException:
+        raise
     except Exception as e:
+        METRICS.observe_request("/simulate", 500)
         error_trace = traceback.format_exc()
         print(f"\n!!! Error during simulation !!!")
         print(error_trace)
@@ -80,3 +184,319 @@ async def simulate(req: SimulateRequest):
             status_code=500,
             detail=f"Simulation error: {str(e)}\n{error_trace}"
         )
+
+
+async def _admit(endpoint: str, cost: int, request: Request, over_budget: str | None = None):
+    """Waits for an admission slot; rejections become 413 / 503 responses."""
+    try:
+        return await ADMISSION.acquire(cost, _client_id(request))
+    except OverBudget as e:
+        METRICS.observe_request(endpoint, 413)
+        raise HTTPException(status_code=413, detail=over_budget or str(e))
+    except AdmissionQueueFull as e:
+        METRICS.observe_request(endpoint, 503)
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _release(ticket):
+    ADMISSION.release(ticket)
+    METRICS.observe_admission(ticket.lane, ticket.wait, time.perf_counter() - ticket.queued_at)
+
+
+def _client_id(request: Request) -> str:
+    """Whom a request is queued for: the peer address, or the X-Client-Id
+    header set by a proxy listed in TRUSTED_PROXIES."""
+    peer = request.client.host if request.client else "anonymous"
+    if peer in TRUSTED_PROXIES:
+        return request.headers.get("x-client-id") or peer
+    return peer
+
+
+def _run_simulation(req: SimulateRequest, circuit, report, stimuli, instr, binary: bool,
+                    collect: bool, waveforms_wanted: bool, capture=None):
+    """Simulates and encodes one /simulate request; returns ``(body, media_type)``."""
+    if req.four_state:
+        # Value strings keep their x/z characters; specs were validated above.
+        sim = core.fourstate.FourStateSimulator(circuit)
+        with instr.phase("simulate"):
+            history = sim.run(req.steps, req.inputs)
+    elif req.timing:
+        sim = core.timing.TimingSimulator(circuit)
+        with instr.phase("simulate"):
+            history = sim.run(req.steps, stimuli)
+    else:
+        sim = core.simulator.Simulator(circuit, instrumentation=instr, activity=collect,
+                        max_failures=max(0, req.max_failures), recorder=capture)
+        history = sim.run(req.steps, stimuli, record=waveforms_wanted)
+    checks = sim.check_report if isinstance(sim, core.simulator.Simulator) else None
+    # A failing ASSERT can end the run early.
+    steps = checks.steps if checks is not None and checks.stopped_at is not None else req.steps
+
+    if capture is not None:
+        # The captured windows replace the waveforms.
+        response = {"steps": capture.steps, "capture": capture.to_dict()}
+    elif not waveforms_wanted:
+        response = {"steps": steps}
+    else:
+        response = {
+            "waveforms": {name: history[name] for name in sorted(history)},
+            "steps": range(steps)
+        }
+    if collect:
+        response["activity"] = sim.activity.to_dict()
+    if checks is not None:
+        response["checks"] = checks.to_dict()
+    if report is not None:
+        response["optimization"] = report.to_dict()
+    if sim.cycle is not None:
+        start, length = sim.cycle
+        response["cycle"] = {"start": start, "length": length}
+
+    if binary and waveforms_wanted and capture is None:
+        # Waveforms go into the compact stream, everything else into its JSON trailer.
+        waveforms = response.pop("waveforms")
+        response["steps"] = steps
+        if req.timings:
+            response["timings"] = instr.to_dict()
+        with instr.phase("encode"):
+            body = core.wavecodec.encode_waveforms(waveforms, steps, meta=response)
+        return body, core.wavecodec.MEDIA_TYPE
+
+    with instr.phase("encode"):
+        body = local.fastjson.dumps(response)
+    if req.timings:
+        # Appended after encoding so the block can include the encode phase.
+        timings = json.dumps(instr.to_dict(), separators=(",", ":")).encode("utf-8")
+        body = body[:-1] + b',"timings":' + timings + b"}"
+    return body, "application/json"
+
+
+# --- Truth-table endpoint ---
+class TruthTableRequest(BaseModel):
+    netlist: str
+    outputs: list[str] | None = None  # defaults to the circuit's OUTPUTs
+    stream: bool = False  # NDJSON blocks of rows instead of one table
+
+@router.post("/truth-table")
+async def truth_table_endpoint(req: TruthTableRequest, request: Request):
+    try:
+        circuit = core.parser.NetlistParser(text=req.netlist, allow_files=False).parse()
+    except core.parser.NetlistParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(circuit.inputs) > core.truthtable.MAX_INPUTS:
+        raise HTTPException(status_code=400, detail=f"Truth-table mode supports at most "
+                                                    f"{core.truthtable.MAX_INPUTS} inputs, circuit has {len(circuit.inputs)}.")
+    ticket = await _admit("/truth-table", estimate_truth_table_cost(circuit), request)
+    # Tabulated off the event loop; a stream keeps its slot until the last block is sent.
+    try:
+        if not req.stream:
+            table = await run_in_threadpool(core.truthtable.truth_table, circuit, outputs=req.outputs)
+            _release(ticket)
+            return JSONResponse(content=table.to_dict())
+        chunks = core.truthtable.iter_truth_table(circuit, outputs=req.outputs)
+        first = await run_in_threadpool(next, chunks)
+    except (core.parser.NetlistParseError, ValueError) as e:
+        _release(ticket)
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        _release(ticket)
+        raise
+
+    header = {
+        "inputs": [s.name for s in circuit.inputs],
+        "outputs": req.outputs or [s.name for s in circuit.outputs],
+        "rows": 1 << len(circuit.inputs),
+    }
+
+    async def lines():
+        try:
+            yield json.dumps(header) + "\n"
+            chunk = first
+            while chunk is not None:
+                yield json.dumps(chunk.to_dict()) + "\n"
+                chunk = await run_in_threadpool(next, chunks, None)
+        finally:
+            _release(ticket)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# --- Equivalence checking endpoint ---
+class EquivalenceRequest(BaseModel):
+    netlist_a: str
+    netlist_b: str
+    vectors: int = 1 << 20
+    seed: int | None = None
+
+@router.post("/equivalence")
+async def equivalence_endpoint(req: EquivalenceRequest, request: Request):
+    if not 1 <= req.vectors <= EQUIVALENCE_MAX_VECTORS:
+        raise HTTPException(status_code=400, detail=f"'vectors' must be between 1 and {EQUIVALENCE_MAX_VECTORS}.")
+    try:
+        circuit_a = core.parser.NetlistParser(text=req.netlist_a, allow_files=False).parse()
+        circuit_b = core.parser.NetlistParser(text=req.netlist_b, allow_files=False).parse()
+    except core.parser.NetlistParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cost = estimate_equivalence_cost(circuit_a, circuit_b, req.vectors)
+    ticket = await _admit("/equivalence", cost, request,
+                          over_budget=f"Estimated cost {cost} exceeds the budget of {ADMISSION.max_cost}; "
+                                      f"check fewer vectors.")
+    try:
+        # CPU-bound: keep the event loop free for other requests.
+        result = await run_in_threadpool(core.equivalence.check_equivalence, req.netlist_a, req.netlist_b,
+                                         vectors=req.vectors, seed=req.seed, allow_files=False)
+    except (core.parser.NetlistParseError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        _release(ticket)
+    return JSONResponse(content=result.to_dict())
+
+
+# --- Background jobs ---
+class JobRequest(BaseModel):
+    netlist: str
+    steps: int
+    inputs: dict[str, str | dict]
+    optimize: bool = False
+
+JOB_RESULT_FORMATS = ("json", "binary", "export", "vcd")
+
+def _finished_job(job_id: str):
+    job = job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    if job.status == local.jobs.FAILED:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != local.jobs.DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status} ({job.step}/{job.steps} steps).")
+    return job
+
+@router.post("/jobs", status_code=202)
+async def submit_job(req: JobRequest):
+    try:
+        core.stimulus.compile_inputs(req.inputs, allow_files=False)
+        job = job_manager().submit(req.netlist, req.steps, req.inputs, optimize=req.optimize)
+    except (core.parser.NetlistParseError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except local.jobs.JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str, request: Request, format: str = "json"):
+    if format not in JOB_RESULT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}', expected one of {', '.join(JOB_RESULT_FORMATS)}.")
+    _finished_job(job_id)
+    accept_encoding = request.headers.get("accept-encoding")
+
+    if format == "binary":
+        return compressed_response(job_manager().read_result(job_id), core.wavecodec.MEDIA_TYPE, accept_encoding)
+    if format == "vcd":
+        out = io.StringIO()
+        with job_manager().open_result(job_id) as store:
+            store.write_vcd(out, sorted(store.signals))
+        return compressed_response(out.getvalue().encode("utf-8"), "text/plain", accept_encoding)
+
+    waveforms, steps, meta = job_manager().load(job_id)
+    if format == "json":
+        response = {"waveforms": waveforms, "steps": range(steps), **meta}
+    else:
+        circuit = core.parser.NetlistParser(text=job_manager().load_netlist(job_id), allow_files=False).parse()
+        if "optimization" in meta:
+            core.optimizer.optimize_circuit(circuit)
+        sim = core.simulator.Simulator(circuit)
+        sim.history = waveforms
+        response = core.exporter.export_to_json(circuit, sim, steps)
+    return compressed_response(local.fastjson.dumps(response), "application/json", accept_encoding)
+
+
+@router.get("/jobs/{job_id}/window")
+async def job_window(job_id: str, request: Request, start: int = 0, end: int | None = None,
+                     signals: str | None = None):
+    """Steps ``start..end-1`` of a finished job, read from its memory-mapped store."""
+    _finished_job(job_id)
+    with job_manager().open_result(job_id) as store:
+        names = sorted(store.signals) if signals is None else signals.split(",")
+        unknown = [name for name in names if name not in store.signals]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown signals: {', '.join(unknown)}.")
+        end = store.steps if end is None else min(end, store.steps)
+        start = max(0, min(start, end))
+        response = {"waveforms": store.waveforms(names, start, end), "start": start, "end": end,
+                    "total": store.steps, **store.meta}
+    return compressed_response(local.fastjson.dumps(response), "application/json",
+                               request.headers.get("accept-encoding"))
+
+# --- Waveform diff ---
+class DiffRequest(BaseModel):
+    a: str
+    b: str
+    signals: list[str] | None = None
+
+@router.post("/diff")
+async def diff_endpoint(req: DiffRequest, request: Request):
+    for job_id in (req.a, req.b):
+        if not local.jobs.is_job_id(job_id):
+            raise HTTPException(status_code=400, detail=f"'{job_id}' is not a job id.")
+    _finished_job(req.a)
+    _finished_job(req.b)
+    manager = job_manager()
+    # Compared on the stored transition encodings, one signal at a time.
+    with manager.open_result(req.a) as a, manager.open_result(req.b) as b:
+        result = core.wavediff.diff_stores(a, b, req.signals)
+    return compressed_response(local.fastjson.dumps(result.to_dict()), "application/json",
+                               request.headers.get("accept-encoding"))
+
+
+def _prewarm(paths):
+    start = time.perf_counter()
+    # Through the lazy loaders, so /health shows what each import cost.
+    for name in ("parser", "compiled", "simulator", "optimizer", "stimulus", "instrumentation", "wavecodec"):
+        getattr(core, name)
+    getattr(local, "fastjson")
+    prewarm = local.prewarm
+    result = prewarm.prewarm(prewarm.load_templates(paths))
+    for error in result["errors"]:
+        print(f"Pre-warming skipped a template: {error}")
+    _record_startup("prewarm", time.perf_counter() - start)
+
+
+def create_app(prewarm_templates: list[str] | None = None) -> FastAPI:
+    """Builds the application.
+
+    :param prewarm_templates: netlist or ``.js`` template files to warm up
+        with after startup; defaults to PREWARM_TEMPLATES, ``[]`` disables it
+    """
+    start = time.perf_counter()
+    app = FastAPI(title="VHDL Web Simulator Backend")
+
+    # ✅ Enable CORS based on environment
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.include_router(router)
+
+    paths = PREWARM_TEMPLATES if prewarm_templates is None else prewarm_templates
+    if paths:
+        @app.on_event("startup")
+        async def start_prewarm():
+            # In the background: the server accepts requests while it runs.
+            threading.Thread(target=_prewarm, args=(paths,), name="prewarm", daemon=True).start()
+
+    _record_startup("app", time.perf_counter() - start)
+    return app
+
+
+_record_startup("import", time.perf_counter() - _IMPORT_START)
+app = create_app()
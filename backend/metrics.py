@@ -0,0 +1,127 @@
+"""
+Process-wide request metrics in the Prometheus text exposition format.
+
+Kept dependency-free on purpose: a few counters and one histogram per
+pipeline phase are all the backend needs, served from GET /metrics.
+"""
+
+import threading
+
+# Upper bounds (seconds) of the phase duration histogram buckets.
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}          # (endpoint, status) -> count
+        self.phase_wall = {}        # phase -> seconds
+        self.phase_cpu = {}         # phase -> seconds
+        self.phase_buckets = {}     # phase -> [count per bucket] (+Inf last)
+        self.phase_count = {}       # phase -> observations
+        self.counters = {"gate_evaluations": 0, "signal_toggles": 0, "settle_iterations": 0, "steps": 0}
+        self.startup = {}           # startup step -> seconds (import, app, prewarm, lazy imports)
+        self.lane_wait = {}         # admission lane -> [count per bucket] of queue wait (+Inf last)
+        self.lane_latency = {}      # admission lane -> [count per bucket] of wait + run time
+        self.lane_sums = {}         # (histogram, lane) -> summed seconds
+        self.admission = None       # admission.AdmissionController, for queue gauges
+
+    def observe_startup(self, step: str, seconds: float):
+        with self._lock:
+            self.startup[step] = seconds
+
+    def observe_admission(self, lane: str, wait: float, latency: float):
+        """Adds one admitted /simulate request: its queue wait and total latency."""
+        with self._lock:
+            for name, histogram, value in (("wait", self.lane_wait, wait), ("latency", self.lane_latency, latency)):
+                buckets = histogram.setdefault(lane, [0] * (len(BUCKETS) + 1))
+                for i, bound in enumerate(BUCKETS):
+                    if value <= bound:
+                        buckets[i] += 1
+                buckets[-1] += 1
+                self.lane_sums[name, lane] = self.lane_sums.get((name, lane), 0.0) + value
+
+    def observe_request(self, endpoint: str, status: int):
+        with self._lock:
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def observe(self, instrumentation):
+        """Adds one request's :class:`core.instrumentation.Instrumentation`."""
+        with self._lock:
+            for name, t in instrumentation.phases.items():
+                self.phase_wall[name] = self.phase_wall.get(name, 0.0) + t.wall
+                self.phase_cpu[name] = self.phase_cpu.get(name, 0.0) + t.cpu
+                self.phase_count[name] = self.phase_count.get(name, 0) + 1
+                buckets = self.phase_buckets.setdefault(name, [0] * (len(BUCKETS) + 1))
+                for i, bound in enumerate(BUCKETS):
+                    if t.wall <= bound:
+                        buckets[i] += 1
+                buckets[-1] += 1
+            if instrumentation.counters:
+                self.counters["gate_evaluations"] += instrumentation.gate_evaluations
+                self.counters["signal_toggles"] += instrumentation.signal_toggles
+                self.counters["settle_iterations"] += instrumentation.settle_iterations
+                self.counters["steps"] += instrumentation.steps
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines += ["# HELP vhdlsim_requests_total HTTP requests by endpoint and status.",
+                      "# TYPE vhdlsim_requests_total counter"]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'vhdlsim_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines += ["# HELP vhdlsim_phase_seconds_total Wall-clock time spent per pipeline phase.",
+                      "# TYPE vhdlsim_phase_seconds_total counter"]
+            for name, value in sorted(self.phase_wall.items()):
+                lines.append(f'vhdlsim_phase_seconds_total{{phase="{name}"}} {value:.6f}')
+
+            lines += ["# HELP vhdlsim_phase_cpu_seconds_total CPU time spent per pipeline phase.",
+                      "# TYPE vhdlsim_phase_cpu_seconds_total counter"]
+            for name, value in sorted(self.phase_cpu.items()):
+                lines.append(f'vhdlsim_phase_cpu_seconds_total{{phase="{name}"}} {value:.6f}')
+
+            lines += ["# HELP vhdlsim_phase_duration_seconds Duration of each pipeline phase.",
+                      "# TYPE vhdlsim_phase_duration_seconds histogram"]
+            for name, buckets in sorted(self.phase_buckets.items()):
+                for bound, count in zip(BUCKETS, buckets):
+                    lines.append(f'vhdlsim_phase_duration_seconds_bucket{{phase="{name}",le="{bound}"}} {count}')
+                lines.append(f'vhdlsim_phase_duration_seconds_bucket{{phase="{name}",le="+Inf"}} {buckets[-1]}')
+                lines.append(f'vhdlsim_phase_duration_seconds_sum{{phase="{name}"}} {self.phase_wall[name]:.6f}')
+                lines.append(f'vhdlsim_phase_duration_seconds_count{{phase="{name}"}} {self.phase_count[name]}')
+
+            for name, value in self.counters.items():
+                lines += [f"# TYPE vhdlsim_{name}_total counter", f"vhdlsim_{name}_total {value}"]
+
+            lines += ["# HELP vhdlsim_startup_seconds Time spent in each startup step.",
+                      "# TYPE vhdlsim_startup_seconds gauge"]
+            for name, value in sorted(self.startup.items()):
+                lines.append(f'vhdlsim_startup_seconds{{step="{name}"}} {value:.6f}')
+
+            for name, histogram, help_text in (
+                    ("wait", self.lane_wait, "Time /simulate requests spent queued for admission."),
+                    ("latency", self.lane_latency, "Queue wait plus run time of admitted /simulate requests.")):
+                lines += [f"# HELP vhdlsim_admission_{name}_seconds {help_text}",
+                          f"# TYPE vhdlsim_admission_{name}_seconds histogram"]
+                for lane, buckets in sorted(histogram.items()):
+                    for bound, count in zip(BUCKETS, buckets):
+                        lines.append(f'vhdlsim_admission_{name}_seconds_bucket{{lane="{lane}",le="{bound}"}} {count}')
+                    lines.append(f'vhdlsim_admission_{name}_seconds_bucket{{lane="{lane}",le="+Inf"}} {buckets[-1]}')
+                    lines.append(f'vhdlsim_admission_{name}_seconds_sum{{lane="{lane}"}} {self.lane_sums[name, lane]:.6f}')
+                    lines.append(f'vhdlsim_admission_{name}_seconds_count{{lane="{lane}"}} {buckets[-1]}')
+
+            if self.admission is not None:
+                lines += ["# HELP vhdlsim_admission_requests Running and queued /simulate requests per lane.",
+                          "# TYPE vhdlsim_admission_requests gauge"]
+                for lane, depth in self.admission.depths().items():
+                    for state in ("running", "queued"):
+                        lines.append(f'vhdlsim_admission_requests{{lane="{lane}",state="{state}"}} {depth[state]}')
+                lines += ["# HELP vhdlsim_admission_rejected_total /simulate requests refused by admission control.",
+                          "# TYPE vhdlsim_admission_rejected_total counter"]
+                for reason, count in sorted(self.admission.rejected.items()):
+                    lines.append(f'vhdlsim_admission_rejected_total{{reason="{reason}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
@@ -0,0 +1,62 @@
+"""
+Startup pre-warming.
+
+A cold process pays for module imports and for the first call of every
+code path on its first ``/simulate``. :func:`prewarm` takes the same path
+(parse, simulate, encode) once at boot with a set of template circuits (by
+default the frontend's ``CircuitTemplates.js``), so the first user request
+finds everything imported. Nothing is cached: requests parse and simulate
+their own netlists.
+"""
+
+import os
+import re
+import time
+from typing import Iterable, List
+
+# Template literals holding a netlist, as in frontend/src/CircuitTemplates.js.
+_TEMPLATE_RE = re.compile(r"`(\s*CIRCUIT\b[^`]*)`")
+
+
+def load_templates(paths: Iterable[str]) -> List[str]:
+    """Netlists from ``paths``: netlist files as they are, ``.js`` files
+    scanned for template literals. Missing files are skipped."""
+    netlists = []
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if path.endswith(".js"):
+            netlists += [m.strip() for m in _TEMPLATE_RE.findall(text)]
+        else:
+            netlists.append(text)
+    return netlists
+
+
+def prewarm(netlists: Iterable[str], steps: int = 16) -> dict:
+    """Parses, simulates and encodes every netlist once, as /simulate does.
+
+    Returns ``{"circuits", "seconds", "errors"}``; a bad template is
+    reported, not raised.
+    """
+    start = time.perf_counter()
+    from core.parser import NetlistParser
+    from core.simulator import Simulator
+    from core.wavecodec import encode_waveforms
+    import fastjson
+
+    count, errors = 0, []
+    for netlist in netlists:
+        try:
+            circuit = NetlistParser(netlist).parse()
+            pattern = "01" * (steps // 2)
+            inputs = {s.name: pattern[k % 2:] for k, s in enumerate(circuit.inputs)}
+            history = Simulator(circuit).run(steps, inputs)
+            waveforms = {name: history[name] for name in sorted(history)}
+            fastjson.dumps({"waveforms": waveforms, "steps": range(steps)})
+            encode_waveforms(waveforms, steps)
+            count += 1
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    return {"circuits": count, "seconds": time.perf_counter() - start, "errors": errors}
@@ -0,0 +1,91 @@
+"""
+In-memory LRU cache of finished response bodies.
+
+Entries are stored in the content coding they were first sent with, so a
+repeated request is answered with the stored bytes and no JSON encoding or
+compression work. A client asking for a different coding costs one
+recompression, after which that variant is cached too.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from compress import compress, decompress
+
+
+class CachedResult:
+    """One cached body, keyed by content coding (None = uncompressed)."""
+
+    def __init__(self, media_type: str):
+        self.media_type = media_type
+        self.variants: Dict[Optional[str], bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return sum(len(data) for data in self.variants.values())
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by the total size of stored bodies."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Stable key for JSON-serialisable request parts."""
+        blob = json.dumps(parts, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def put(self, key: str, media_type: str, data: bytes, encoding: Optional[str]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.media_type != media_type:
+                if entry is not None:
+                    self.size -= entry.size
+                entry = CachedResult(media_type)
+                self._entries[key] = entry
+            old = entry.variants.get(encoding)
+            entry.variants[encoding] = data
+            self.size += len(data) - (len(old) if old is not None else 0)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def get(self, key: str, encoding: Optional[str]):
+        """Returns ``(media_type, body)`` in ``encoding``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            data = entry.variants.get(encoding)
+            if data is not None:
+                return entry.media_type, data
+            source, stored = next(iter(entry.variants.items()))
+        # Recompress outside the lock; another coding of the same body.
+        data = compress(decompress(stored, source), encoding)
+        self.put(key, entry.media_type, data, encoding)
+        return entry.media_type, data
+
+    def _evict(self):
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self.size -= entry.size
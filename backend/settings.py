@@ -13,3 +13,28 @@ else:
     ALLOWED_ORIGINS = [
         "http://localhost:5173"
     ]
+
+# Netlists parsed, compiled and simulated once at startup so the first
+# request does not pay for imports and first-run code paths. A list of
+# paths separated by os.pathsep; ``.js`` files are scanned for template
+# literals starting with CIRCUIT. Set PREWARM_TEMPLATES="" to disable.
+_DEFAULT_TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "frontend", "src", "CircuitTemplates.js")
+PREWARM_TEMPLATES = [p for p in os.getenv("PREWARM_TEMPLATES", _DEFAULT_TEMPLATES).split(os.pathsep) if p]
+
+# Admission control for /simulate (admission.py). Cost is estimated as
+# steps x (gates + flip-flops + memories + recorded signals). Requests up to
+# ADMISSION_FAST_COST run in the fast lane, larger ones share the slow
+# lane per client, and anything above ADMISSION_MAX_COST gets a 413.
+ADMISSION_FAST_COST = int(os.getenv("ADMISSION_FAST_COST", "5000000"))
+ADMISSION_MAX_COST = int(os.getenv("ADMISSION_MAX_COST", "500000000"))
+ADMISSION_FAST_SLOTS = int(os.getenv("ADMISSION_FAST_SLOTS", "4"))
+ADMISSION_SLOW_SLOTS = int(os.getenv("ADMISSION_SLOW_SLOTS", "1"))
+ADMISSION_MAX_QUEUED = int(os.getenv("ADMISSION_MAX_QUEUED", "32"))
+# Peer addresses of reverse proxies whose X-Client-Id header names the
+# client for fair queueing (comma-separated). Other requests are keyed
+# on their peer address, so clients cannot pick their own queue.
+TRUSTED_PROXIES = {p.strip() for p in os.getenv("TRUSTED_PROXIES", "").split(",") if p.strip()}
+
+# Largest "vectors" accepted by /equivalence.
+EQUIVALENCE_MAX_VECTORS = int(os.getenv("EQUIVALENCE_MAX_VECTORS", str(1 << 24)))
@@ -0,0 +1,156 @@
+"""
+generators.py
+
+Parametric netlists in the text format understood by core.parser.
+
+Every generator returns netlist text; ``gate_count`` tells how many GATE
+lines a given size produces so benchmark sizes can be picked by gate count.
+"""
+
+from __future__ import annotations
+import random
+from typing import List
+
+
+def _header(name: str, inputs: List[str], outputs: List[str], signals: List[str]) -> List[str]:
+    lines = [f"CIRCUIT {name}"]
+    if inputs:
+        lines.append("INPUT " + " ".join(inputs))
+    if outputs:
+        lines.append("OUTPUT " + " ".join(outputs))
+    if signals:
+        lines.append("SIGNAL " + " ".join(signals))
+    return lines
+
+
+def _full_adder(lines: List[str], prefix: str, a: str, b: str, cin: str, s: str, cout: str, signals: List[str]):
+    x, c1, c2 = f"{prefix}_x", f"{prefix}_c1", f"{prefix}_c2"
+    signals += [x, c1, c2]
+    lines.append(f"GATE {prefix}_g1 XOR {a} {b} {x}")
+    lines.append(f"GATE {prefix}_g2 XOR {x} {cin} {s}")
+    lines.append(f"GATE {prefix}_g3 AND {a} {b} {c1}")
+    lines.append(f"GATE {prefix}_g4 AND {x} {cin} {c2}")
+    lines.append(f"GATE {prefix}_g5 OR {c1} {c2} {cout}")
+
+
+def ripple_carry_adder(bits: int) -> str:
+    """``bits``-wide adder: inputs a*, b*, cin; outputs s*, cout (5 gates per bit)."""
+    a = [f"a{i}" for i in range(bits)]
+    b = [f"b{i}" for i in range(bits)]
+    s = [f"s{i}" for i in range(bits)]
+    carries = [f"c{i}" for i in range(1, bits)]
+    signals: List[str] = list(carries)
+    body: List[str] = []
+    chain = ["cin"] + carries + ["cout"]
+    for i in range(bits):
+        _full_adder(body, f"fa{i}", a[i], b[i], chain[i], s[i], chain[i + 1], signals)
+    return "\n".join(_header(f"rca{bits}", a + b + ["cin"], s + ["cout"], signals) + body) + "\n"
+
+
+def array_multiplier(bits: int) -> str:
+    """``bits`` x ``bits`` unsigned array multiplier built from AND partial
+    products and rows of ripple-carry adders."""
+    a = [f"a{i}" for i in range(bits)]
+    b = [f"b{i}" for i in range(bits)]
+    p = [f"p{i}" for i in range(2 * bits)]
+    signals: List[str] = ["zero"]
+    body: List[str] = []
+
+    def pp(i: int, j: int) -> str:
+        name = f"pp{i}_{j}"
+        signals.append(name)
+        body.append(f"GATE and{i}_{j} AND {a[j]} {b[i]} {name}")
+        return name
+
+    # Row 0 is the first partial product; each further row is added in.
+    row = [pp(0, j) for j in range(bits)]
+    body.append(f"GATE out0 BUF {row[0]} {p[0]}")
+    acc = row[1:] + ["zero"]
+    for i in range(1, bits):
+        addend = [pp(i, j) for j in range(bits)]
+        carry = "zero"
+        sums = []
+        for j in range(bits):
+            s, c = f"r{i}_s{j}", f"r{i}_c{j}"
+            signals += [s, c]
+            _full_adder(body, f"r{i}_fa{j}", acc[j], addend[j], carry, s, c, signals)
+            sums.append(s)
+            carry = c
+        body.append(f"GATE out{i} BUF {sums[0]} {p[i]}")
+        acc = sums[1:] + [carry]
+    for j, net in enumerate(acc):
+        body.append(f"GATE out{bits + j} BUF {net} {p[bits + j]}")
+    return "\n".join(_header(f"mul{bits}", a + b, p, signals) + body) + "\n"
+
+
+def counter_chain(bits: int, period: int = 2) -> str:
+    """Free-running binary counter: ``bits`` DFFs with an AND carry chain."""
+    q = [f"q{i}" for i in range(bits)]
+    d = [f"d{i}" for i in range(bits)]
+    # enable[i] = q0 AND ... AND q(i-1); bit i toggles when it is 1.
+    enable = ["", "q0"] + [f"t{i}" for i in range(2, bits)]
+    body = [f"CLOCK clk PERIOD {period} DUTY 0.5", "GATE tg0 NOT q0 d0"]
+    for i in range(1, bits):
+        if i > 1:
+            body.append(f"GATE cy{i} AND {enable[i - 1]} q{i - 1} {enable[i]}")
+        body.append(f"GATE tg{i} XOR {enable[i]} q{i} d{i}")
+    body += [f"DFF ff{i} d{i} clk q{i}" for i in range(bits)]
+    return "\n".join(_header(f"counter{bits}", [], q, d + enable[2:]) + body) + "\n"
+
+
+def lfsr(bits: int, taps: List[int] = None, period: int = 2) -> str:
+    """Fibonacci LFSR with XOR feedback from ``taps`` (defaults to the two
+    top stages). Stage 0 is seeded by an XNOR so the all-zero state is left.
+    The feedback costs ``len(taps) - 1`` gates; :func:`dense_lfsr` taps
+    every stage so the logic grows with the register."""
+    taps = taps or [bits - 1, bits - 2]
+    q = [f"q{i}" for i in range(bits)]
+    body = [f"CLOCK clk PERIOD {period} DUTY 0.5"]
+    signals = []
+    acc = q[taps[0]]
+    for k, tap in enumerate(taps[1:], start=1):
+        out = "fb" if k == len(taps) - 1 else f"fb{k}"
+        signals.append(out)
+        gate = "XNOR" if k == len(taps) - 1 else "XOR"
+        body.append(f"GATE x{k} {gate} {acc} {q[tap]} {out}")
+        acc = out
+    # Later stages first: flip-flops update in netlist order within a step.
+    for i in reversed(range(1, bits)):
+        body.append(f"DFF ff{i} {q[i - 1]} clk {q[i]}")
+    body.append(f"DFF ff0 {acc} clk q0")
+    return "\n".join(_header(f"lfsr{bits}", [], q, signals) + body) + "\n"
+
+
+def dense_lfsr(gates: int, period: int = 2) -> str:
+    """LFSR of ``gates + 1`` stages whose feedback XORs every stage,
+    i.e. one gate per stage (the sequence is not maximal-length)."""
+    bits = max(3, gates + 1)
+    return lfsr(bits, taps=list(range(bits - 1, -1, -1)), period=period)
+
+
+def random_dag(gates: int, inputs: int = 32, outputs: int = 16, seed: int = 0) -> str:
+    """Random acyclic network; each gate reads earlier nets with a bias
+    towards recent ones, which keeps depth and fan-out realistic."""
+    rng = random.Random(seed)
+    types = ["AND", "OR", "XOR", "NAND", "NOR", "XNOR", "NOT"]
+    ins = [f"i{k}" for k in range(inputs)]
+    nets = list(ins)
+    body = []
+    for g in range(gates):
+        kind = rng.choice(types)
+        out = f"n{g}"
+        recent = nets[rng.randrange(max(0, len(nets) - max(64, len(nets) // 8)), len(nets))]
+        if kind == "NOT":
+            body.append(f"GATE g{g} NOT {recent} {out}")
+        else:
+            body.append(f"GATE g{g} {kind} {recent} {rng.choice(nets)} {out}")
+        nets.append(out)
+    outs = [f"o{k}" for k in range(outputs)]
+    for k, name in enumerate(outs):
+        body.append(f"GATE ob{k} BUF {nets[-1 - k]} {name}")
+    internal = nets[inputs:]
+    return "\n".join(_header(f"dag{gates}", ins, outs, internal) + body) + "\n"
+
+
+def gate_count(netlist: str) -> int:
+    return sum(1 for line in netlist.splitlines() if line.startswith("GATE "))
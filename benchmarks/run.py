@@ -0,0 +1,228 @@
+"""
+run.py
+
+Simulator benchmark harness.
+
+Generates scalable netlists (see generators.py) and times each phase of the
+pipeline separately:
+
+    parse     NetlistParser.parse
+    simulate  Simulator.run
+    export    export_to_json
+    e2e       POST /simulate through the FastAPI app (skipped when FastAPI
+              or its test client is not installed)
+
+Each case runs in a fresh child process so peak RSS is per case. Results
+can be written to JSON and compared with a saved baseline; any phase that
+is slower than the baseline by more than ``--tolerance`` makes the run fail.
+
+Usage:
+    python -m benchmarks.run --sizes 100,1000,10000 --steps 32 --output results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import generators
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("parse", "simulate", "export", "e2e")
+
+# generator name -> (netlist builder taking a target gate count, size label)
+SUITE: Dict[str, Callable[[int], str]] = {
+    "adder": lambda gates: generators.ripple_carry_adder(max(1, gates // 5)),
+    "multiplier": lambda gates: generators.array_multiplier(max(2, int(math.sqrt(gates / 6)))),
+    "counter": lambda gates: generators.counter_chain(max(2, gates // 2)),
+    # Feedback over every stage, so the gate work grows with the size like the other cases.
+    "lfsr": generators.dense_lfsr,
+    "dag": lambda gates: generators.random_dag(gates),
+}
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _best_of(repeat: int, fn: Callable[[], object]):
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def _load_app():
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:
+        return None
+    backend_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    from backend.main import app, RESULT_CACHE
+    return TestClient(app), RESULT_CACHE
+
+
+def run_case(case: dict) -> dict:
+    """Runs one benchmark case and returns its result record."""
+    from core.parser import NetlistParser
+    from core.simulator import Simulator
+    from core.exporter import export_to_json
+
+    netlist = SUITE[case["generator"]](case["size"])
+    steps, repeat = case["steps"], case["repeat"]
+
+    parse_s, circuit = _best_of(repeat, lambda: NetlistParser(netlist).parse())
+    rng = random.Random(0)
+    inputs = {s.name: "".join(rng.choice("01") for _ in range(steps)) for s in circuit.inputs}
+
+    sim = Simulator(circuit, detect_cycles=False)
+    simulate_s, _ = _best_of(repeat, lambda: sim.run(steps, inputs))
+    export_s, _ = _best_of(repeat, lambda: export_to_json(circuit, sim, steps))
+
+    e2e_s = None
+    if case.get("e2e"):
+        loaded = _load_app()
+        if loaded is not None:
+            client, cache = loaded
+            body = {"netlist": netlist, "steps": steps, "inputs": inputs}
+
+            def post():
+                # Every repeat must simulate, not be answered from the result cache.
+                cache.clear()
+                return client.post("/simulate", json=body).raise_for_status()
+
+            e2e_s, _ = _best_of(repeat, post)
+
+    gates = len(circuit.gates)
+    return {
+        "case": f"{case['generator']}-{case['size']}",
+        "generator": case["generator"],
+        "size": case["size"],
+        "gates": gates,
+        "flipflops": len(circuit.flipflops),
+        "signals": len(circuit.signals),
+        "steps": steps,
+        "parse_s": parse_s,
+        "simulate_s": simulate_s,
+        "export_s": export_s,
+        "e2e_s": e2e_s,
+        "gate_steps_per_s": (max(gates, 1) * steps) / simulate_s if simulate_s else None,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def run_suite(cases: List[dict], in_process: bool = False) -> List[dict]:
+    results = []
+    for case in cases:
+        if in_process:
+            result = run_case(case)
+        else:
+            with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+                result = pool.apply(run_case, (case,))
+        results.append(result)
+        _print_result(result)
+    return results
+
+
+def compare(results: List[dict], baseline: dict, tolerance: float) -> List[str]:
+    """Lists phases that got slower than ``baseline`` by more than ``tolerance``."""
+    previous = {r["case"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get(r["case"])
+        if old is None or old.get("steps") != r["steps"]:
+            continue
+        for phase in PHASES:
+            key = f"{phase}_s"
+            if r.get(key) is None or not old.get(key):
+                continue
+            ratio = r[key] / old[key]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{r['case']} {phase}: {old[key]:.4f}s -> {r[key]:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def _fmt(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:9.1f}ms"
+
+
+def _print_result(r: dict):
+    rate = r["gate_steps_per_s"]
+    rss = r["peak_rss_kb"]
+    print(
+        f"{r['case']:<18} gates={r['gates']:<8} parse={_fmt(r['parse_s'])} "
+        f"simulate={_fmt(r['simulate_s'])} export={_fmt(r['export_s'])} e2e={_fmt(r['e2e_s'])} "
+        f"gate-steps/s={rate:,.0f} rss={'-' if rss is None else f'{rss // 1024}MB'}",
+        flush=True,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Simulator benchmarks")
+    ap.add_argument("--sizes", default="100,1000", help="comma-separated target gate counts")
+    ap.add_argument("--generators", default=",".join(SUITE), help="comma-separated subset of " + ", ".join(SUITE))
+    ap.add_argument("--steps", type=int, default=32)
+    ap.add_argument("--repeat", type=int, default=3, help="runs per phase; the best time is kept")
+    ap.add_argument("--no-e2e", action="store_true", help="skip the /simulate round trip")
+    ap.add_argument("--in-process", action="store_true", help="do not fork a process per case")
+    ap.add_argument("--output", help="write results to this JSON file")
+    ap.add_argument("--baseline", help="compare against a previous results file")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs. baseline (0.25 = 25%%)")
+    args = ap.parse_args(argv)
+
+    names = [g for g in args.generators.split(",") if g]
+    unknown = [g for g in names if g not in SUITE]
+    if unknown:
+        ap.error(f"unknown generators: {', '.join(unknown)}")
+    cases = [
+        {"generator": g, "size": int(size), "steps": args.steps, "repeat": args.repeat, "e2e": not args.no_e2e}
+        for size in args.sizes.split(",") for g in names
+    ]
+
+    results = run_suite(cases, in_process=args.in_process)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 from .circuit import Circuit
-from .gates import Gate, AndGate, OrGate, NotGate, XorGate
+from .gates import Gate, AndGate, OrGate, NotGate, XorGate, BufGate, ConstGate
 from .signal import Signal
 from .clock import Clock
 from .flipflop import DFlipFlop
 from .parser import NetlistParser, NetlistParseError
+from .optimizer import optimize_circuit, OptimizationReport
 
 __all__ = [
     "Signal",
@@ -21,5 +22,9 @@ __all__ = [
     "NetlistParseError",
     "NandGate",
     "NorGate",
-    "XnorGate"
+    "XnorGate",
+    "BufGate",
+    "ConstGate",
+    "optimize_circuit",
+    "OptimizationReport",
 ]
@@ -0,0 +1,97 @@
+"""
+activity.py
+
+Switching-activity statistics collected by the simulator.
+
+With ``Simulator(circuit, activity=True)`` every step adds to:
+
+    - toggles per signal (value differs from the previous step)
+    - time-at-1 per signal (steps the signal was 1)
+    - settle passes, each of which evaluates every gate once
+    - output toggles per gate
+
+These are the inputs of a dynamic power estimate (toggle rate x load) and
+point at the hot nets worth optimizing. Collecting them inline avoids
+shipping and rescanning the full waveforms; ``Simulator.run(...,
+record=False)`` keeps only the statistics.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence
+
+
+class ActivityStats:
+    """Per-signal and per-gate counters for one simulation run.
+
+    :param signals: signal names, in the order values are passed to
+        :meth:`count_step`
+    :param gates: ``(gate name, output signal name)`` pairs
+    """
+
+    def __init__(self, signals: Sequence[str], gates: Sequence[tuple]):
+        self.signals = list(signals)
+        self.gates = list(gates)
+        self.steps = 0
+        self.toggles = [0] * len(self.signals)
+        self.ones = [0] * len(self.signals)
+        # Every settle pass evaluates every gate, so one counter covers all.
+        self.passes = 0
+
+    def count_step(self, values: Sequence[int], changed: Sequence[int], passes: int):
+        """Adds one step: signal ``values`` and the indices that ``changed``."""
+        self.steps += 1
+        self.passes += passes
+        ones, toggles = self.ones, self.toggles
+        for k, value in enumerate(values):
+            if value:
+                ones[k] += 1
+        for k in changed:
+            toggles[k] += 1
+
+    def count_repeated(self, columns: List[List[int]], start: int):
+        """Adds steps ``start..`` of recorded ``columns`` that were copied
+        from a detected cycle rather than simulated (no gate evaluations)."""
+        for k, column in enumerate(columns):
+            tail = column[start:]
+            self.ones[k] += sum(1 for v in tail if v)
+            prev = column[start - 1]
+            for v in tail:
+                if v != prev:
+                    self.toggles[k] += 1
+                    prev = v
+        if columns:
+            self.steps += len(columns[0]) - start
+
+    @property
+    def total_toggles(self) -> int:
+        return sum(self.toggles)
+
+    def hottest(self, n: int = 10) -> List[str]:
+        """Names of the ``n`` signals with the most toggles."""
+        ranked = sorted(range(len(self.signals)), key=lambda k: (-self.toggles[k], self.signals[k]))
+        return [self.signals[k] for k in ranked[:n] if self.toggles[k]]
+
+    def to_dict(self) -> dict:
+        transitions = max(self.steps - 1, 1)
+        steps = max(self.steps, 1)
+        toggles = dict(zip(self.signals, self.toggles))
+        return {
+            "steps": self.steps,
+            # The same for every gate: each pass evaluates all of them.
+            "passes": self.passes,
+            "total_toggles": self.total_toggles,
+            "hottest": self.hottest(),
+            "signals": {
+                name: {
+                    "toggles": t,
+                    "ones": o,
+                    "toggle_rate": t / transitions,
+                    "duty": o / steps,
+                }
+                for name, t, o in zip(self.signals, self.toggles, self.ones)
+            },
+            "gates": {
+                name: {"output_toggles": toggles.get(output, 0)}
+                for name, output in self.gates
+            },
+        }
@@ -0,0 +1,280 @@
+"""
+assertions.py
+
+Assertions and monitors evaluated inside the simulation loop.
+
+Netlist form (one per line, after the signals they use are declared):
+
+    ASSERT <name> <expr>                   must hold after every step
+    ASSERT <name> @<clk> <expr>            must hold at every rising edge of clk
+    ASSERT <name> @<clk> <a> |-> <b>       b must hold at every edge where a holds
+    ASSERT <name> @<clk> <a> |=> <b>       b must hold at the edge after one where a holds
+    MONITOR <name> [@<clk>] <expr>         count (and log) the points where expr holds
+
+Expressions combine signal names and the constants 0/1 with ``!``/``~``
+(not), ``==``, ``!=``, ``&``, ``^`` and ``|`` (binding in that order,
+tightest first) and parentheses. A clocked check is evaluated at the
+steps where its clock signal goes from 0 to 1, on the values shown in the
+waveform at that step.
+
+``Simulator(circuit, max_failures=n)`` stops the run after the n-th
+failure; :class:`CheckReport` summarises what was found. The same checks
+can be built from Python with :class:`Check` and ``circuit.add_check``.
+"""
+
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+ASSERT, MONITOR = "ASSERT", "MONITOR"
+
+# Failures, and hit steps per monitor, listed in a report (all are counted).
+LOG_LIMIT = 100
+
+_TOKEN_RE = re.compile(r"\s*(?:([01])\b|([A-Za-z_][A-Za-z0-9_]*)|(\|->|\|=>|==|!=|[!~&|^()]))")
+
+# Binary operators, loosest first.
+_LEVELS = [("|",), ("^",), ("&",), ("==", "!=")]
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Unexpected character {text[pos:].strip()[:1]!r} in expression {text!r}.")
+        tokens.append(match.group(match.lastindex))
+        pos = match.end()
+    return tokens
+
+
+class _ExprParser:
+    """Recursive-descent translation of a check expression into Python."""
+
+    def __init__(self, tokens: List[str], operand):
+        self.tokens = tokens
+        self.pos = 0
+        self.operand = operand
+        self.names: Set[str] = set()
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Expression ends unexpectedly.")
+        self.pos += 1
+        return token
+
+    def parse(self, level: int = 0) -> str:
+        if level == len(_LEVELS):
+            return self.unary()
+        left = self.parse(level + 1)
+        while self.peek() in _LEVELS[level]:
+            op = self.take()
+            right = self.parse(level + 1)
+            left = f"({left} {op} {right})"
+        return left
+
+    def unary(self) -> str:
+        token = self.take()
+        if token in ("!", "~"):
+            return f"(1 ^ {self.unary()})"
+        if token == "(":
+            inner = self.parse()
+            if self.take() != ")":
+                raise ValueError("Missing ')'.")
+            return inner
+        if token in ("0", "1"):
+            return token
+        if token[0].isalpha() or token[0] == "_":
+            self.names.add(token)
+            return self.operand(token)
+        raise ValueError(f"Unexpected {token!r}.")
+
+
+def translate(text: str, operand=lambda name: name) -> Tuple[str, Set[str]]:
+    """Python source for expression ``text`` and the signal names it reads.
+
+    ``operand(name)`` gives the Python code that reads a signal."""
+    parser = _ExprParser(_tokenize(text), operand)
+    if not parser.tokens:
+        raise ValueError("Empty expression.")
+    source = parser.parse()
+    if parser.peek() is not None:
+        raise ValueError(f"Unexpected {parser.peek()!r} in expression {text!r}.")
+    return source, parser.names
+
+
+class Check:
+    """One ASSERT or MONITOR.
+
+    :param expr: the expression (for implications, the consequent)
+    :param clock: signal whose rising edges trigger the check; None = every step
+    :param antecedent: with ``|->``/``|=>``, the condition that arms the check
+    :param delay: 0 for ``|->``, 1 for ``|=>`` (edges between antecedent and check)
+    """
+
+    def __init__(self, name: str, expr: str, kind: str = ASSERT, clock: Optional[str] = None,
+                 antecedent: Optional[str] = None, delay: int = 0):
+        if kind not in (ASSERT, MONITOR):
+            raise ValueError(f"Unknown check kind {kind!r}.")
+        if antecedent is not None and (kind != ASSERT or clock is None):
+            raise ValueError("Implications need a clocked ASSERT.")
+        self.name = name
+        self.kind = kind
+        self.expr = expr
+        self.clock = clock
+        self.antecedent = antecedent
+        self.delay = delay
+        _, names = translate(expr)
+        if antecedent is not None:
+            names |= translate(antecedent)[1]
+        if clock is not None:
+            names.add(clock)
+        self.signals: Set[str] = names
+
+    @classmethod
+    def parse(cls, kind: str, text: str) -> "Check":
+        """Builds a check from the text after ``ASSERT``/``MONITOR``."""
+        parts = text.split(None, 1)
+        if len(parts) < 2:
+            raise ValueError(f"{kind} form: {kind} <name> [@<clock>] <expr>")
+        name, rest = parts
+        clock = None
+        if rest.startswith("@"):
+            clock_parts = rest[1:].split(None, 1)
+            if len(clock_parts) < 2:
+                raise ValueError(f"{kind} {name}: expected an expression after the clock.")
+            clock, rest = clock_parts
+        for op, delay in (("|=>", 1), ("|->", 0)):
+            if op in rest:
+                antecedent, expr = rest.split(op, 1)
+                return cls(name, expr.strip(), kind, clock, antecedent.strip(), delay)
+        return cls(name, rest.strip(), kind, clock)
+
+    def __repr__(self):
+        return f"Check({self.kind} {self.name})"
+
+
+class CheckReport:
+    """Failures and monitor hits of one run."""
+
+    def __init__(self, checks: List[Check]):
+        self.checks = checks
+        self.failures: List[dict] = []  # the first LOG_LIMIT failures
+        self.total_failures = 0
+        self.failure_counts: Dict[str, int] = {c.name: 0 for c in checks if c.kind == ASSERT}
+        self.hits: Dict[str, List[int]] = {c.name: [] for c in checks if c.kind == MONITOR}
+        self.hit_counts: Dict[str, int] = {c.name: 0 for c in checks if c.kind == MONITOR}
+        self.evaluations = 0
+        self.steps = 0
+        # Step after which the run was stopped, None if it ran to the end.
+        self.stopped_at: Optional[int] = None
+
+    @property
+    def passed(self) -> bool:
+        return not self.total_failures
+
+    def to_dict(self) -> dict:
+        return {
+            "passed": self.passed,
+            "steps": self.steps,
+            "stopped_at": self.stopped_at,
+            "evaluations": self.evaluations,
+            "total_failures": self.total_failures,
+            "failure_counts": self.failure_counts,
+            "failures": self.failures,
+            "monitors": {name: {"count": self.hit_counts[name], "steps": steps}
+                         for name, steps in self.hits.items()},
+        }
+
+
+class CheckRunner:
+    """Evaluates a circuit's checks once per step against its live signals.
+
+    :param max_failures: :meth:`step` returns True (stop) once this many
+        assertion failures were seen; 0 never stops
+    """
+
+    def __init__(self, circuit: Circuit, checks: List[Check], max_failures: int = 1):
+        self.report = CheckReport(checks)
+        self.max_failures = max_failures
+        env = {f"s_{name}": circuit.signals[name] for name in set().union(*(c.signals for c in checks))}
+
+        def compile_expr(text: str):
+            source, _ = translate(text, lambda name: f"s_{name}.value")
+            return eval(f"lambda: {source}", env)
+
+        # (check, expr fn, antecedent fn, clock signal, values shown in a failure)
+        self._checks = []
+        for check in checks:
+            for name in check.signals:
+                if name not in circuit.signals:
+                    raise ValueError(f"{check.kind} {check.name}: unknown signal '{name}'.")
+            clock = circuit.signals[check.clock] if check.clock else None
+            antecedent = compile_expr(check.antecedent) if check.antecedent else None
+            watched = [circuit.signals[n] for n in sorted(check.signals) if n != check.clock]
+            self._checks.append((check, compile_expr(check.expr), antecedent, clock, watched))
+        self._prev_clock = [None] * len(checks)
+        # Per implication: edge counters at which the consequent is due.
+        self._armed: List[List[Tuple[int, int]]] = [[] for _ in checks]
+        self._edges = [0] * len(checks)
+
+    def step(self, t: int) -> bool:
+        """Evaluates the checks after step ``t``; True means stop the run."""
+        report = self.report
+        stop = False
+        for k, (check, expr, antecedent, clock, watched) in enumerate(self._checks):
+            if clock is not None:
+                cur = clock.value
+                rose = self._prev_clock[k] == 0 and cur == 1
+                self._prev_clock[k] = cur
+                if not rose:
+                    continue
+                self._edges[k] += 1
+            report.evaluations += 1
+
+            if check.kind == MONITOR:
+                if expr():
+                    report.hit_counts[check.name] += 1
+                    hits = report.hits[check.name]
+                    if len(hits) < LOG_LIMIT:
+                        hits.append(t)
+                continue
+
+            if antecedent is None:
+                if not expr():
+                    stop |= self._fail(check, t, watched, None)
+                continue
+            # Implication: check consequents that are due, then arm new ones.
+            edge = self._edges[k]
+            armed = self._armed[k]
+            while armed and armed[0][0] == edge:
+                _, since = armed.pop(0)
+                if not expr():
+                    stop |= self._fail(check, t, watched, since)
+            if antecedent():
+                if check.delay == 0:
+                    if not expr():
+                        stop |= self._fail(check, t, watched, t)
+                else:
+                    armed.append((edge + check.delay, t))
+        report.steps = t + 1
+        return stop
+
+    def _fail(self, check: Check, t: int, watched, since: Optional[int]) -> bool:
+        report = self.report
+        report.failure_counts[check.name] += 1
+        report.total_failures += 1
+        if len(report.failures) < LOG_LIMIT:
+            failure = {"check": check.name, "step": t, "values": {s.name: s.value for s in watched}}
+            if since is not None:
+                failure["triggered_at"] = since
+            report.failures.append(failure)
+        return self.max_failures > 0 and report.total_failures >= self.max_failures
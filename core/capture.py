@@ -0,0 +1,172 @@
+"""
+capture.py
+
+Logic-analyzer style trigger capture for long runs.
+
+``Simulator(circuit, recorder=Capture("q3 & !q2", pre=64, post=64))``
+keeps only a ring buffer of the last ``pre`` steps instead of the whole
+waveform. When the trigger expression becomes true (it was false at the
+step before), the buffer plus the trigger step and the following ``post``
+steps are saved as one :class:`CaptureWindow`. Memory is bounded by
+``(pre + 1 + post) x signals x max_captures`` bytes, however many steps run.
+
+Trigger expressions use the ASSERT syntax (core.assertions): signal names,
+0/1, ``!``/``~``, ``==``, ``!=``, ``&``, ``^``, ``|`` and parentheses.
+Triggers that fire while a window is still being filled are counted but
+start no new window.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from core.assertions import translate
+
+# Upper bounds of ``pre``/``post`` and ``max_captures``.
+MAX_WINDOW = 1 << 16
+MAX_CAPTURES = 1024
+
+
+class CaptureWindow:
+    """Steps ``start..start + len - 1`` around the trigger at step ``trigger``."""
+
+    def __init__(self, trigger: int, start: int, names: List[str], rows: bytearray):
+        self.trigger = trigger
+        self.start = start
+        self.names = names
+        self.rows = rows  # one row of len(names) bytes per step
+        self.complete = False
+
+    @property
+    def steps(self) -> int:
+        return len(self.rows) // max(1, len(self.names))
+
+    @property
+    def waveforms(self) -> Dict[str, List[int]]:
+        width = len(self.names)
+        return {name: list(self.rows[k::width]) for k, name in enumerate(self.names)}
+
+    def to_dict(self) -> dict:
+        return {"trigger": self.trigger, "start": self.start, "steps": self.steps,
+                "complete": self.complete, "waveforms": self.waveforms}
+
+
+class Capture:
+    """Recorder that saves windows around trigger events (see module docstring).
+
+    :param signals: names to capture; None = every signal
+    :param max_captures: windows kept; later triggers are only counted
+    :param stop_when_full: end the run once ``max_captures`` windows are complete
+    """
+
+    def __init__(self, trigger: str, pre: int = 32, post: int = 32, signals: Optional[Iterable[str]] = None,
+                 max_captures: int = 16, stop_when_full: bool = False):
+        if not (0 <= pre <= MAX_WINDOW and 0 <= post <= MAX_WINDOW):
+            raise ValueError(f"pre and post must be between 0 and {MAX_WINDOW}.")
+        if not 1 <= max_captures <= MAX_CAPTURES:
+            raise ValueError(f"max_captures must be between 1 and {MAX_CAPTURES}.")
+        self.trigger = trigger
+        _, self.trigger_signals = translate(trigger)
+        self.pre = pre
+        self.post = post
+        self.signals = list(signals) if signals is not None else None
+        self.max_captures = max_captures
+        self.stop_when_full = stop_when_full
+        self.windows: List[CaptureWindow] = []
+        self.triggers = 0
+        self.steps = 0
+
+    def validate(self, names: Iterable[str]):
+        """Raises ValueError if the trigger or captured signals are not in ``names``."""
+        known = set(names)
+        wanted = set(self.trigger_signals) | set(self.signals or ())
+        unknown = sorted(wanted - known)
+        if unknown:
+            raise ValueError(f"Capture: unknown signal(s) {', '.join(unknown)}.")
+
+    def max_bytes(self, names: Sequence[str]) -> int:
+        """Most memory the ring and the windows take when recording ``names``."""
+        width = len(self.signals) if self.signals is not None else len(names)
+        return (self.pre + (self.pre + 1 + self.post) * self.max_captures) * width
+
+    def start(self, names: Sequence[str]):
+        self.validate(names)
+        column = {name: k for k, name in enumerate(names)}
+        self.names = list(names) if self.signals is None else list(self.signals)
+        self._columns = [column[name] for name in self.names]
+        self._all = self._columns == list(range(len(names)))
+        source, _ = translate(self.trigger, lambda name: f"v[{column[name]}]")
+        self._fired = eval(f"lambda v: {source}", {})
+        width = len(self.names)
+        self._width = width
+        self._ring = bytearray(self.pre * width)
+        self._pos = 0  # next ring slot
+        self._filled = 0  # valid rows in the ring
+        self._open: Optional[CaptureWindow] = None
+        self._remaining = 0
+        # A condition that already holds at step 0 counts as a trigger there.
+        self._prev = False
+        self.windows = []
+        self.triggers = 0
+        self.steps = 0
+
+    def append(self, values: Sequence[int]) -> bool:
+        """Records one step; returns True when the run can stop."""
+        t = self.steps
+        self.steps += 1
+        row = bytes(values) if self._all else bytes([values[k] for k in self._columns])
+
+        fired = bool(self._fired(values))
+        rising = fired and not self._prev
+        self._prev = fired
+        window = self._open
+        if window is not None:
+            window.rows += row
+            self._remaining -= 1
+            if self._remaining == 0:
+                window.complete = True
+                self._open = None
+            if rising:
+                self.triggers += 1
+        elif rising:
+            self.triggers += 1
+            if len(self.windows) < self.max_captures:
+                self._open_window(t, row)
+
+        if self.pre:
+            width = self._width
+            self._ring[self._pos * width:(self._pos + 1) * width] = row
+            self._pos = (self._pos + 1) % self.pre
+            self._filled = min(self._filled + 1, self.pre)
+        return (self.stop_when_full and len(self.windows) == self.max_captures
+                and self._open is None)
+
+    def _open_window(self, t: int, row: bytes):
+        width = self._width
+        # The ring holds the last _filled steps, oldest at _pos when full.
+        first = (self._pos - self._filled) % self.pre if self.pre else 0
+        ring = self._ring
+        history = bytearray()
+        for i in range(self._filled):
+            slot = (first + i) % self.pre
+            history += ring[slot * width:(slot + 1) * width]
+        window = CaptureWindow(t, t - self._filled, self.names, history + row)
+        self.windows.append(window)
+        if self.post:
+            self._open = window
+            self._remaining = self.post
+        else:
+            window.complete = True
+
+    def close(self, meta: Optional[dict] = None):
+        """Ends the run; a window still being filled keeps the steps it has."""
+        self._open = None
+
+    def to_dict(self) -> dict:
+        return {
+            "trigger": self.trigger,
+            "pre": self.pre,
+            "post": self.post,
+            "steps": self.steps,
+            "triggers": self.triggers,
+            "windows": [w.to_dict() for w in self.windows],
+        }
@@ -5,6 +5,8 @@ from .signal import Signal
 from .gates import Gate
 from .clock import Clock
 from .flipflop import DFlipFlop
+from .assertions import Check
+from .memory import Memory
 
 
 class Circuit:
@@ -18,6 +20,12 @@ class Circuit:
         self.gates: List[Gate] = []
         self.clocks: List[Clock] = []
         self.flipflops: List[DFlipFlop] = []
+        # Default propagation delay per gate type ("AND", ...), from DELAY directives.
+        self.gate_delays: Dict[str, int] = {}
+        self.checks: List[Check] = []
+        self.memories: List[Memory] = []
+        # Set by core.optimizer, whose rewrites hold for zero-delay 0/1 simulation only.
+        self.optimized = False
 
     # ------------------- Add elements -------------------
 
@@ -42,27 +50,13 @@ class Circuit:
     def add_flipflop(self, ff: DFlipFlop):
         self.flipflops.append(ff)
 
-    def simulate(self, steps: int, inputs_map: Dict[str, str]):
-        for signal in self.signals.values():
-            signal.set_value(0)
-
-        waveforms = {name: [] for name in self.signals}
-
-        for t in range(steps):
-            for signal in self.inputs:
-                if signal.name in inputs_map and t < len(inputs_map[signal.name]):
-                    signal.set_value(int(inputs_map[signal.name][t]))
-            for clock in self.clocks:
-                clock.update(t)
+    def add_check(self, check: Check):
+        self.checks.append(check)
 
-            for ff in self.flipflops:
-                ff.update()
+    def add_memory(self, memory: Memory):
+        self.memories.append(memory)
 
-            for _ in range(len(self.gates) + 1):
-                for gate in self.gates:
-                    gate.update()
-
-            for name, signal in self.signals.items():
-                waveforms[name].append(signal.get_value())
+    def simulate(self, steps: int, inputs_map: Dict[str, str]):
+        from .simulator import Simulator
 
-        return waveforms
+        return Simulator(self).run(steps, inputs_map)
@@ -0,0 +1,203 @@
+"""
+compiled.py
+
+Flat, index-based view of a Circuit used by the fast engines.
+
+Signals are numbered in ``circuit.signals`` order and every gate becomes a
+``(kind, input_ids, output_id)`` triple. The module also levelizes the gate
+graph and generates straight-line Python code that settles the whole
+combinational network in one call. The generated code works on plain ints,
+so the same function evaluates one vector (mask ``1``) or many vectors packed
+into the bits of a word (mask ``(1 << width) - 1``).
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from core.gates import Gate, AndGate, OrGate, NotGate, XorGate, NandGate, NorGate, XnorGate, BufGate, ConstGate
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+_GATE_TYPES = {
+    AndGate: "AND",
+    OrGate: "OR",
+    XorGate: "XOR",
+    NotGate: "NOT",
+    NandGate: "NAND",
+    NorGate: "NOR",
+    XnorGate: "XNOR",
+    BufGate: "BUF",
+    ConstGate: "CONST",
+}
+
+# Word-level expressions; ``m`` is the all-ones mask of the word width.
+EXPRESSIONS = {
+    "AND": "{0} & {1}",
+    "OR": "{0} | {1}",
+    "XOR": "{0} ^ {1}",
+    "NAND": "({0} & {1}) ^ m",
+    "NOR": "({0} | {1}) ^ m",
+    "XNOR": "{0} ^ {1} ^ m",
+    "NOT": "{0} ^ m",
+    "BUF": "{0}",
+}
+
+
+def gate_type(gate: Gate) -> str:
+    """Returns the netlist type name of a gate (e.g. 'AND', 'NOT')."""
+    try:
+        return _GATE_TYPES[type(gate)]
+    except KeyError:
+        raise ValueError(f"Unsupported gate class {type(gate).__name__}") from None
+
+
+def topological_order(gates: List[Gate]) -> Tuple[List[Gate], bool]:
+    """Orders gates so that drivers come before readers.
+
+    Returns ``(order, acyclic)``. Gates on combinational loops keep their
+    original relative order and are placed at the end.
+    """
+    driver: Dict[str, List[Gate]] = {}
+    for g in gates:
+        driver.setdefault(g.output_name, []).append(g)
+    indegree = {id(g): 0 for g in gates}
+    readers: Dict[int, List[Gate]] = {id(g): [] for g in gates}
+    for g in gates:
+        for name in set(g.input_names):
+            for d in driver.get(name, ()):
+                indegree[id(g)] += 1
+                readers[id(d)].append(g)
+    queue = deque(g for g in gates if indegree[id(g)] == 0)
+    order = []
+    while queue:
+        g = queue.popleft()
+        order.append(g)
+        for r in readers[id(g)]:
+            indegree[id(r)] -= 1
+            if indegree[id(r)] == 0:
+                queue.append(r)
+    acyclic = len(order) == len(gates)
+    if not acyclic:
+        placed = {id(g) for g in order}
+        order.extend(g for g in gates if id(g) not in placed)
+    return order, acyclic
+
+
+class CompiledCircuit:
+    """Index-based form of a Circuit.
+
+    Attributes:
+        names:   signal names, position == signal id
+        index:   signal name -> id
+        gates:   list of (kind, input ids, output id) in evaluation order
+        levels:  logic level of each gate in ``gates`` (acyclic circuits only)
+        acyclic: True when one pass in ``gates`` order settles the network
+        fanout:  signal id -> indices into ``gates`` reading it
+        instances: the Gate object behind each entry of ``gates``
+    """
+
+    def __init__(self, circuit: Circuit):
+        if circuit.memories:
+            raise ValueError("RAM/ROM blocks are only supported by the step simulator (core.simulator).")
+        self.circuit = circuit
+        self.names: List[str] = list(circuit.signals)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        order, acyclic = topological_order(circuit.gates)
+        drivers = [g.output_name for g in circuit.gates]
+        if len(set(drivers)) != len(drivers):
+            # Several drivers on one net: last writer wins, so keep netlist order.
+            acyclic = False
+        if not acyclic:
+            order = list(circuit.gates)
+        self.acyclic = acyclic
+
+        self.gates: List[Tuple[str, Tuple[int, ...], int]] = []
+        self.const_values: Dict[int, int] = {}
+        self.instances: List[Gate] = list(order)
+        for g in order:
+            kind = gate_type(g)
+            if kind == "CONST":
+                self.const_values[len(self.gates)] = g.value
+            self.gates.append((kind, tuple(self.index[n] for n in g.input_names), self.index[g.output_name]))
+
+        self.fanout: List[List[int]] = [[] for _ in self.names]
+        for gi, (_, ins, _) in enumerate(self.gates):
+            for i in set(ins):
+                self.fanout[i].append(gi)
+
+        self.levels: List[int] = []
+        if acyclic:
+            signal_level = [0] * len(self.names)
+            for _, ins, out in self.gates:
+                lvl = 1 + max((signal_level[i] for i in ins), default=0)
+                signal_level[out] = lvl
+                self.levels.append(lvl)
+
+        self.input_ids = [self.index[s.name] for s in circuit.inputs]
+        self.output_ids = [self.index[s.name] for s in circuit.outputs]
+        self.clock_ids = [self.index[c.name] for c in circuit.clocks]
+        self.flipflops = [
+            (self.index[ff.d.name], self.index[ff.clk.name], self.index[ff.q.name])
+            for ff in circuit.flipflops
+        ]
+
+    @property
+    def is_combinational(self) -> bool:
+        return not self.circuit.clocks and not self.circuit.flipflops
+
+    def expression(self, gi: int, operand: Callable[[int], str]) -> str:
+        """Python expression computing gate ``gi`` from ``operand(signal_id)``."""
+        kind, ins, _ = self.gates[gi]
+        if kind == "CONST":
+            return "m" if self.const_values[gi] else "0"
+        return EXPRESSIONS[kind].format(*(operand(i) for i in ins))
+
+    def settle_source(self, inject: Optional[Iterable[int]] = None) -> str:
+        """Source of ``settle(v, m[, keep, force])`` which settles list ``v`` in place.
+
+        Nets listed in ``inject`` are passed through ``(x & keep[i]) | force[i]``
+        after being computed, which is how fault simulation overrides them.
+        """
+        inject = set(inject or ())
+        used = sorted({i for _, ins, _ in self.gates for i in ins} | {out for _, _, out in self.gates})
+        args = "v, m, keep=None, force=None" if inject else "v, m"
+        lines = [f"def settle({args}):"]
+        lines += [f"    s{i} = v[{i}]" for i in used]
+
+        def assign(gi: int, indent: str) -> List[str]:
+            out = self.gates[gi][2]
+            expr = self.expression(gi, lambda i: f"s{i}")
+            if out in inject:
+                expr = f"(({expr}) & keep[{out}]) | force[{out}]"
+            return [f"{indent}s{out} = {expr}"]
+
+        if self.acyclic:
+            for gi in range(len(self.gates)):
+                lines += assign(gi, "    ")
+        else:
+            outs = sorted({out for _, _, out in self.gates})
+            state = ", ".join(f"s{i}" for i in outs) + ","
+            lines.append(f"    for _ in range({len(self.gates) + 1}):")
+            lines.append(f"        before = ({state})")
+            for gi in range(len(self.gates)):
+                lines += assign(gi, "        ")
+            lines.append(f"        if ({state}) == before:")
+            lines.append("            break")
+        lines += [f"    v[{i}] = s{i}" for i in used]
+        if len(lines) == 1:
+            lines.append("    pass")
+        return "\n".join(lines) + "\n"
+
+    def make_settle(self, inject: Optional[Iterable[int]] = None) -> Callable:
+        """Compiles :meth:`settle_source` into a function."""
+        namespace: dict = {}
+        exec(compile(self.settle_source(inject), f"<settle {self.circuit.name}>", "exec"), namespace)
+        return namespace["settle"]
+
+    def make_gate_functions(self, mask: int = 1) -> List[Callable[[list], int]]:
+        """One ``f(v) -> value`` function per gate, for event-driven evaluation."""
+        env = {"m": mask}
+        return [eval(f"lambda v: {self.expression(gi, lambda i: f'v[{i}]')}", env) for gi in range(len(self.gates))]
@@ -0,0 +1,240 @@
+"""
+equivalence.py
+
+Simulation-based equivalence checking of two netlists.
+
+Both circuits must declare the same INPUT and OUTPUT names. They are
+evaluated side by side on bit-parallel words, so each bit lane is one
+input vector:
+
+    - combinational circuits with few inputs are checked exhaustively
+    - otherwise lanes are filled with random vectors (random sequences for
+      circuits with clocks or flip-flops)
+
+Checking stops at the first mismatch and returns a counterexample: the
+lowest failing assignment for exhaustive runs, or the shortest failing input
+sequence for sequential runs.
+
+Usage:
+    python -m core.equivalence old.net new.net [--vectors N] [--seed S]
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+from core.compiled import CompiledCircuit
+from core.parser import NetlistParser, NetlistParseError
+
+
+class EquivalenceResult:
+    """Outcome of :func:`check_equivalence`."""
+
+    def __init__(self, equivalent: bool, vectors: int, exhaustive: bool, elapsed: float,
+                 counterexample: Optional[List[Dict[str, int]]] = None,
+                 mismatch: Optional[dict] = None):
+        self.equivalent = equivalent
+        self.vectors = vectors
+        self.exhaustive = exhaustive
+        self.elapsed = elapsed
+        # One {input: value} dict per step, ending at the failing step.
+        self.counterexample = counterexample
+        # {"output": name, "step": t, "a": value, "b": value}
+        self.mismatch = mismatch
+
+    @property
+    def vectors_per_second(self) -> float:
+        return self.vectors / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "equivalent": self.equivalent,
+            "exhaustive": self.exhaustive,
+            "vectors": self.vectors,
+            "elapsed": self.elapsed,
+            "counterexample": self.counterexample,
+            "mismatch": self.mismatch,
+        }
+
+    def __repr__(self):
+        verdict = "equivalent" if self.equivalent else "different"
+        return f"EquivalenceResult({verdict}, vectors={self.vectors})"
+
+
+class _WordMachine:
+    """Steps one compiled circuit on bit-parallel words."""
+
+    def __init__(self, compiled: CompiledCircuit, input_order: List[str], mask: int):
+        self.compiled = compiled
+        self.mask = mask
+        self.settle = compiled.make_settle()
+        self.v = [0] * len(compiled.names)
+        self.input_ids = [compiled.index[name] for name in input_order]
+        self.clocks = [(compiled.index[c.name], c) for c in compiled.circuit.clocks]
+        self.prev_clk: List[Optional[int]] = [None] * len(compiled.flipflops)
+
+    def reset(self):
+        self.v = [0] * len(self.compiled.names)
+        self.prev_clk = [None] * len(self.compiled.flipflops)
+
+    def step(self, t: int, words: List[int]):
+        v, mask = self.v, self.mask
+        for i, word in zip(self.input_ids, words):
+            v[i] = word
+        for i, clock in self.clocks:
+            clock.update(t)
+            v[i] = mask if clock.get_value() else 0
+        for k, (d, clk, q) in enumerate(self.compiled.flipflops):
+            cur = v[clk]
+            prev = self.prev_clk[k]
+            if prev is not None:
+                edge = ~prev & cur & mask
+                v[q] = (v[q] & ~edge) | (v[d] & edge)
+            self.prev_clk[k] = cur
+        self.settle(v, mask)
+
+    def outputs(self, names: List[str]) -> List[int]:
+        index = self.compiled.index
+        return [self.v[index[name]] for name in names]
+
+
+def _lane(word: int, lane: int) -> int:
+    return (word >> lane) & 1
+
+
+def _first_mismatch(names: List[str], outs_a: List[int], outs_b: List[int]):
+    diff = 0
+    for wa, wb in zip(outs_a, outs_b):
+        diff |= wa ^ wb
+    if not diff:
+        return None
+    lane = (diff & -diff).bit_length() - 1
+    for name, wa, wb in zip(names, outs_a, outs_b):
+        if _lane(wa ^ wb, lane):
+            return lane, name, _lane(wa, lane), _lane(wb, lane)
+
+
+def check_equivalence(
+    netlist_a: str,
+    netlist_b: str,
+    vectors: int = 1 << 20,
+    width: int = 4096,
+    seed: Optional[int] = None,
+    exhaustive_limit: int = 20,
+    sequence_length: int = 32,
+    allow_files: bool = True,
+) -> EquivalenceResult:
+    """Compares two netlists by simulation.
+
+    :param vectors: random vectors (input assignments) to try
+    :param width: vectors evaluated per bit-parallel word
+    :param exhaustive_limit: combinational circuits with at most this many
+        inputs are checked exhaustively instead of randomly
+    :param sequence_length: steps per random sequence for sequential circuits
+    :param allow_files: let RAM/ROM lines load their contents from files;
+        False for netlists from untrusted clients
+    """
+    a = CompiledCircuit(NetlistParser(netlist_a, allow_files=allow_files).parse())
+    b = CompiledCircuit(NetlistParser(netlist_b, allow_files=allow_files).parse())
+
+    inputs = [s.name for s in a.circuit.inputs]
+    outputs = [s.name for s in a.circuit.outputs]
+    if set(inputs) != {s.name for s in b.circuit.inputs}:
+        raise ValueError("Netlists must declare the same INPUT names.")
+    if set(outputs) != {s.name for s in b.circuit.outputs}:
+        raise ValueError("Netlists must declare the same OUTPUT names.")
+
+    start = time.perf_counter()
+    combinational = a.is_combinational and b.is_combinational
+    exhaustive = combinational and len(inputs) <= exhaustive_limit
+    if exhaustive:
+        # A power of two, so every word holds whole cycles of the low input patterns.
+        width = 1 << min(width.bit_length() - 1, len(inputs))
+    mask = (1 << width) - 1
+    ma = _WordMachine(a, inputs, mask)
+    mb = _WordMachine(b, inputs, mask)
+
+    def result(checked: int, counterexample=None, mismatch=None) -> EquivalenceResult:
+        return EquivalenceResult(counterexample is None, checked, exhaustive,
+                                 time.perf_counter() - start, counterexample, mismatch)
+
+    if exhaustive:
+        # Inputs below log2(width) cycle inside the word; the rest are constant per batch.
+        low = width.bit_length() - 1
+        patterns = []
+        for i in range(low):
+            bits = bytearray((width + 7) // 8)
+            for j in range(width):
+                if (j >> i) & 1:
+                    bits[j >> 3] |= 1 << (j & 7)
+            patterns.append(int.from_bytes(bits, "little"))
+        total = 1 << len(inputs)
+        for base in range(0, total, width):
+            words = [patterns[i] if i < low else (mask if (base >> i) & 1 else 0) for i in range(len(inputs))]
+            ma.step(0, words)
+            mb.step(0, words)
+            hit = _first_mismatch(outputs, ma.outputs(outputs), mb.outputs(outputs))
+            if hit:
+                lane, name, va, vb = hit
+                row = base + lane
+                cex = [{n: (row >> i) & 1 for i, n in enumerate(inputs)}]
+                return result(base + width, cex, {"output": name, "step": 0, "a": va, "b": vb})
+        return result(total)
+
+    rng = random.Random(seed)
+    steps = 1 if combinational else sequence_length
+    checked = 0
+    while checked < vectors:
+        ma.reset()
+        mb.reset()
+        history = []
+        for t in range(steps):
+            words = [rng.getrandbits(width) for _ in inputs]
+            history.append(words)
+            ma.step(t, words)
+            mb.step(t, words)
+            checked += width
+            hit = _first_mismatch(outputs, ma.outputs(outputs), mb.outputs(outputs))
+            if hit:
+                lane, name, va, vb = hit
+                cex = [{n: _lane(w, lane) for n, w in zip(inputs, row)} for row in history]
+                return result(checked, cex, {"output": name, "step": t, "a": va, "b": vb})
+    return result(checked)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m core.equivalence", description=__doc__.split("\n\n")[0])
+    ap.add_argument("netlist_a")
+    ap.add_argument("netlist_b")
+    ap.add_argument("--vectors", type=int, default=1 << 20, help="random vectors to try")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--steps", type=int, default=32, help="sequence length for sequential circuits")
+    ap.add_argument("--exhaustive-limit", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    try:
+        with open(args.netlist_a) as fa, open(args.netlist_b) as fb:
+            res = check_equivalence(fa.read(), fb.read(), vectors=args.vectors, seed=args.seed,
+                                    exhaustive_limit=args.exhaustive_limit,
+                                    sequence_length=args.steps)
+    except (OSError, NetlistParseError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    mode = "exhaustive" if res.exhaustive else "random"
+    print(f"{res.vectors} vectors ({mode}) in {res.elapsed:.3f}s, {res.vectors_per_second:,.0f} vectors/s")
+    if res.equivalent:
+        print("EQUIVALENT")
+        return 0
+    m = res.mismatch
+    print(f"MISMATCH on '{m['output']}' at step {m['step']}: a={m['a']} b={m['b']}")
+    for t, row in enumerate(res.counterexample):
+        print(f"  step {t}: " + " ".join(f"{k}={v}" for k, v in row.items()))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 from core.circuit import Circuit
 from core.simulator import Simulator
+from core.compiled import gate_type
+from core.instrumentation import Instrumentation, phase
 
 def _compress_waveform(values: list[int]) -> list[dict]:
     if not values:
@@ -17,8 +19,14 @@ def _compress_waveform(values: list[int]) -> list[dict]:
     return compressed
 
 
-def export_to_json(circuit: Circuit, simulator: Simulator, steps: int) -> dict:
+def export_to_json(circuit: Circuit, simulator: Simulator, steps: int,
+                   instrumentation: Instrumentation | None = None) -> dict:
     """Export circuit structure + simulation results as Python dict (not string)."""
+    with phase(instrumentation, "export"):
+        return _export(circuit, simulator, steps)
+
+
+def _export(circuit: Circuit, simulator: Simulator, steps: int) -> dict:
 
     input_names = {s.name for s in circuit.inputs}
     output_names = {s.name for s in circuit.outputs}
@@ -62,15 +70,28 @@ def export_to_json(circuit: Circuit, simulator: Simulator, steps: int) -> dict:
                 }
                 for i, ff in enumerate(circuit.flipflops, start=1)
             ],
+            "memories": [
+                {
+                    "id": f"mem{i}",
+                    "name": m.name,
+                    "type": m.kind,
+                    "depth": m.depth,
+                    "width": m.width,
+                    "addr": [s.name for s in m.addr],
+                    "din": [s.name for s in m.din],
+                    "dout": [s.name for s in m.dout],
+                    "we": m.we.name if m.we is not None else None,
+                    "clk": m.clk.name,
+                }
+                for i, m in enumerate(circuit.memories, start=1)
+            ],
             "gates": [
                 {
                     "id": f"g{i}",
                     "name": g.name,
-                    "type": g.__class__.__name__.replace("Gate", "").upper(),
-                    "inputs": [
-                        i if isinstance(i, str) else i.name for i in g.inputs
-                    ],
-                    "output": g.output if isinstance(g.output, str) else g.output.name,
+                    "type": gate_type(g),
+                    "inputs": list(g.input_names),
+                    "output": g.output_name,
                 }
                 for i, g in enumerate(circuit.gates, start=1)
             ],
@@ -0,0 +1,202 @@
+"""
+faultsim.py
+
+Bit-parallel stuck-at fault simulation.
+
+Every net in ``circuit.signals`` gets a stuck-at-0 and a stuck-at-1 fault.
+Faults are simulated in groups: bit 0 of every signal word carries the
+good machine and bit ``j`` carries faulty machine ``j``, so one pass of the
+generated settle code evaluates the whole group. A fault is detected when
+any OUTPUT differs from the good machine; detected faults are dropped and a
+group stops as soon as all of its faults are detected. Groups are spread
+over a process pool.
+
+Stimulus uses the same rules as :class:`core.simulator.Simulator`: inputs
+take their value from ``inputs_map`` (value strings or core.stimulus specs)
+and hold once a string ends, and the DFF/settle order per step is identical.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.compiled import CompiledCircuit
+from core.parser import NetlistParser
+from core.stimulus import Spec, compile_inputs
+
+# (net name, stuck value)
+Fault = Tuple[str, int]
+
+# Compiled circuits of the current process by netlist hash, most recently used last.
+_compiled_cache: "OrderedDict[str, CompiledCircuit]" = OrderedDict()
+CACHE_SIZE = 8
+
+
+class FaultReport:
+    """Coverage of a stuck-at fault simulation run."""
+
+    def __init__(self, steps: int, detections: Dict[Fault, Optional[int]]):
+        self.steps = steps
+        # fault -> first step at which an OUTPUT differed, or None
+        self.detections = detections
+
+    @property
+    def total(self) -> int:
+        return len(self.detections)
+
+    @property
+    def detected(self) -> int:
+        return sum(1 for step in self.detections.values() if step is not None)
+
+    @property
+    def coverage(self) -> float:
+        return self.detected / self.total if self.total else 1.0
+
+    @property
+    def undetected(self) -> List[Fault]:
+        return [fault for fault, step in self.detections.items() if step is None]
+
+    def to_dict(self) -> dict:
+        return {
+            "steps": self.steps,
+            "total": self.total,
+            "detected": self.detected,
+            "coverage": self.coverage,
+            "faults": [
+                {"net": net, "stuck_at": value, "detected_at": step}
+                for (net, value), step in self.detections.items()
+            ],
+        }
+
+    def __repr__(self):
+        return f"FaultReport({self.detected}/{self.total} detected, coverage={self.coverage:.1%})"
+
+
+def all_faults(circuit) -> List[Fault]:
+    """Stuck-at-0 and stuck-at-1 on every net of the circuit."""
+    return [(name, value) for name in circuit.signals for value in (0, 1)]
+
+
+def _compile(netlist: str) -> CompiledCircuit:
+    key = hashlib.sha1(netlist.encode("utf-8")).hexdigest()
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        compiled = CompiledCircuit(NetlistParser(netlist).parse())
+        _compiled_cache[key] = compiled
+        if len(_compiled_cache) > CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+    else:
+        _compiled_cache.move_to_end(key)
+    return compiled
+
+
+def simulate_fault_group(
+    compiled: CompiledCircuit,
+    faults: List[Fault],
+    inputs_map: Dict[str, Spec],
+    steps: int,
+) -> List[Optional[int]]:
+    """Simulates one group of faults; returns the detection step of each."""
+    width = len(faults) + 1
+    mask = (1 << width) - 1
+    n = len(compiled.names)
+    keep = [mask] * n
+    force = [0] * n
+    for lane, (net, value) in enumerate(faults, start=1):
+        i = compiled.index[net]
+        if value:
+            force[i] |= 1 << lane
+        else:
+            keep[i] &= ~(1 << lane)
+    injected = {i for i in range(n) if keep[i] != mask or force[i]}
+    settle = compiled.make_settle(inject=injected)
+
+    v = [force[i] for i in range(n)]
+    stimuli = compile_inputs(inputs_map)
+    inputs = [(i, stimuli[compiled.names[i]].value) for i in compiled.input_ids if compiled.names[i] in stimuli]
+    clocks = [(compiled.index[c.name], c) for c in compiled.circuit.clocks]
+    flipflops = compiled.flipflops
+    prev_clk: List[Optional[int]] = [None] * len(flipflops)
+    outputs = compiled.output_ids
+
+    detected: List[Optional[int]] = [None] * len(faults)
+    alive = mask & ~1
+
+    for t in range(steps):
+        for i, value_at in inputs:
+            bit = value_at(t)
+            if bit is not None:
+                v[i] = ((mask if bit else 0) & keep[i]) | force[i]
+        for i, clock in clocks:
+            clock.update(t)
+            v[i] = ((mask if clock.get_value() else 0) & keep[i]) | force[i]
+        for k, (d, clk, q) in enumerate(flipflops):
+            cur = v[clk]
+            if prev_clk[k] is not None:
+                edge = ~prev_clk[k] & cur & mask
+                if edge:
+                    v[q] = (((v[q] & ~edge) | (v[d] & edge)) & keep[q]) | force[q]
+            prev_clk[k] = cur
+        settle(v, mask, keep, force)
+
+        diff = 0
+        for o in outputs:
+            word = v[o]
+            diff |= word ^ (mask if word & 1 else 0)
+        hits = diff & alive
+        if hits:
+            alive &= ~hits
+            while hits:
+                low = hits & -hits
+                detected[low.bit_length() - 2] = t
+                hits ^= low
+            if not alive:
+                break
+    return detected
+
+
+def _run_group(args) -> List[Optional[int]]:
+    netlist, faults, inputs_map, steps = args
+    return simulate_fault_group(_compile(netlist), faults, inputs_map, steps)
+
+
+def simulate_faults(
+    netlist: str,
+    inputs_map: Dict[str, Spec],
+    steps: int,
+    faults: Optional[List[Fault]] = None,
+    group_size: int = 128,
+    processes: Optional[int] = None,
+) -> FaultReport:
+    """Grades a test sequence against stuck-at faults.
+
+    :param netlist: circuit in the netlist language
+    :param inputs_map: input name -> value string or stimulus spec, as for Simulator.run
+    :param faults: faults to simulate; defaults to :func:`all_faults`
+    :param group_size: faulty machines packed into one word
+    :param processes: worker processes; ``1`` runs in the calling process,
+        ``None`` uses one per CPU
+    """
+    compiled = _compile(netlist)
+    if faults is None:
+        faults = all_faults(compiled.circuit)
+    for net, value in faults:
+        if net not in compiled.index or value not in (0, 1):
+            raise ValueError(f"Invalid fault {net}/SA{value}.")
+
+    groups = [faults[i:i + group_size] for i in range(0, len(faults), group_size)]
+    jobs = [(netlist, group, inputs_map, steps) for group in groups]
+    workers = processes or os.cpu_count() or 1
+    if workers == 1 or len(groups) <= 1:
+        results = [_run_group(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            results = list(pool.map(_run_group, jobs))
+
+    detections: Dict[Fault, Optional[int]] = {}
+    for group, steps_found in zip(groups, results):
+        detections.update(zip(group, steps_found))
+    return FaultReport(steps, detections)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .circuit import Circuit
@@ -8,6 +8,10 @@ if TYPE_CHECKING:
 class Gate:
     """Base class for all logic gates."""
 
+    # Propagation delay in time steps (``GATE ... DELAY n``); None uses the
+    # circuit's default for the gate type. Only core.timing reads it.
+    delay: Optional[int] = None
+
     def __init__(self, name: str, inputs: List[str], output: str, circuit: Circuit):
         self.name = name
         self.input_names = inputs
@@ -68,3 +72,18 @@ class XnorGate(Gate):
         in1 = self.circuit.signals[self.input_names[0]].get_value() or 0
         in2 = self.circuit.signals[self.input_names[1]].get_value() or 0
         self.circuit.signals[self.output_name].set_value(int(not (in1 ^ in2)))
+
+class BufGate(Gate):
+    def update(self):
+        in_val = self.circuit.signals[self.input_names[0]].get_value() or 0
+        self.circuit.signals[self.output_name].set_value(int(in_val))
+
+class ConstGate(Gate):
+    """Drives its output with a fixed value (produced by the optimizer for tied-off nets)."""
+
+    def __init__(self, name: str, inputs: List[str], output: str, circuit: Circuit, value: int = 0):
+        super().__init__(name, inputs, output, circuit)
+        self.value = int(value)
+
+    def update(self):
+        self.circuit.signals[self.output_name].set_value(self.value)
@@ -0,0 +1,86 @@
+"""
+instrumentation.py
+
+Lightweight per-phase profiling for the simulation pipeline.
+
+An :class:`Instrumentation` object is passed to ``NetlistParser``,
+``Simulator`` and ``export_to_json``. Each of them records its wall-clock
+and CPU time as a named phase. The simulator also counts gate evaluations,
+signal toggles and settle iterations. Components skip all bookkeeping when
+no instrumentation is given.
+"""
+
+from __future__ import annotations
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional
+
+
+class PhaseTiming:
+    """Accumulated wall/CPU time of one named phase."""
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+
+    def to_dict(self) -> dict:
+        return {"wall_ms": self.wall * 1000, "cpu_ms": self.cpu * 1000, "calls": self.calls}
+
+
+class Instrumentation:
+    """Collects phase timings and simulation counters for one request.
+
+    :param counters: also count gate evaluations, toggles and settle
+        iterations inside the simulator loop (costs a little per step)
+    """
+
+    def __init__(self, counters: bool = True):
+        self.counters = counters
+        self.phases: Dict[str, PhaseTiming] = {}
+        self.steps = 0
+        self.gate_evaluations = 0
+        self.signal_toggles = 0
+        self.settle_iterations = 0
+        self.max_settle_iterations = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing = self.phases.setdefault(name, PhaseTiming())
+            timing.wall += time.perf_counter() - wall0
+            timing.cpu += time.process_time() - cpu0
+            timing.calls += 1
+
+    def record_step(self, settle_iterations: int, gate_evaluations: int, toggles: int):
+        self.steps += 1
+        self.settle_iterations += settle_iterations
+        self.gate_evaluations += gate_evaluations
+        self.signal_toggles += toggles
+        if settle_iterations > self.max_settle_iterations:
+            self.max_settle_iterations = settle_iterations
+
+    def to_dict(self) -> dict:
+        data = {"phases": {name: t.to_dict() for name, t in self.phases.items()}}
+        if self.counters:
+            data["counters"] = {
+                "steps": self.steps,
+                "gate_evaluations": self.gate_evaluations,
+                "signal_toggles": self.signal_toggles,
+                "settle_iterations": self.settle_iterations,
+                "settle_iterations_per_step": self.settle_iterations / self.steps if self.steps else 0.0,
+                "max_settle_iterations": self.max_settle_iterations,
+            }
+        return data
+
+    def server_timing(self) -> str:
+        """Value for an HTTP ``Server-Timing`` header."""
+        return ", ".join(f"{name};dur={t.wall * 1000:.3f}" for name, t in self.phases.items())
+
+
+def phase(instrumentation: Optional[Instrumentation], name: str):
+    """``instrumentation.phase(name)``, or a no-op context when it is None."""
+    return instrumentation.phase(name) if instrumentation is not None else nullcontext()
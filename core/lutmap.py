@@ -0,0 +1,224 @@
+"""
+lutmap.py
+
+Technology mapping of the gate graph onto k-input lookup tables.
+
+Every gate-driven signal gets a set of *cuts*: sets of at most ``k``
+signals (k <= 6) such that every path from a primary input, clock or
+flip-flop to the signal passes through one of them. Cuts are enumerated
+bottom-up by merging the cuts of a gate's inputs, keeping the few best
+per signal (priority cuts) ranked by area flow, i.e. how many LUTs the
+cone costs once shared logic is split among its readers.
+
+The mapping then covers the graph starting from the signals that must
+stay visible (outputs, flip-flop D inputs and any ``keep`` names). Each
+chosen cut becomes one LUT whose truth table is computed once as an
+integer, by evaluating the cone bit-parallel on all ``2**len(cut)``
+leaf combinations. Simulating a LUT is then a single lookup:
+
+    s_root = (TABLE >> (s_l0 | s_l1 << 1 | s_l2 << 2 ...)) & 1
+
+so a cone of many 2-input gates costs one evaluation. Internal signals
+swallowed by a LUT are not computed and have no waveform.
+
+Only acyclic netlists with one driver per net can be mapped.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from core.compiled import CompiledCircuit
+from core.stimulus import Spec, compile_inputs
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+MAX_K = 6
+# Cuts kept per signal during enumeration.
+CUTS_PER_SIGNAL = 8
+
+
+class Lut:
+    """One lookup table: ``root = table[leaves as a binary number, leaf 0 = LSB]``."""
+
+    def __init__(self, root: int, leaves: Tuple[int, ...], table: int):
+        self.root = root
+        self.leaves = leaves
+        self.table = table
+
+    def __repr__(self):
+        return f"Lut({self.root} <- {self.leaves}, {self.table:#x})"
+
+
+class LutMapping:
+    """Result of :func:`map_luts`.
+
+    Attributes:
+        luts:    LUTs in evaluation order
+        visible: signal ids whose values the mapped network computes
+        gates:   gate count of the original network
+    """
+
+    def __init__(self, compiled: CompiledCircuit, luts: List[Lut], visible: List[int]):
+        self.compiled = compiled
+        self.luts = luts
+        self.visible = visible
+        self.gates = len(compiled.gates)
+
+    def to_dict(self) -> dict:
+        sizes = [len(lut.leaves) for lut in self.luts]
+        return {
+            "gates": self.gates,
+            "luts": len(self.luts),
+            "max_leaves": max(sizes, default=0),
+            "evaluation_ratio": self.gates / len(self.luts) if self.luts else None,
+        }
+
+    def settle_source(self) -> str:
+        """Source of ``settle(v)``, which computes every LUT root in list ``v``."""
+        used = sorted({i for lut in self.luts for i in lut.leaves} | {lut.root for lut in self.luts})
+        lines = ["def settle(v):"]
+        lines += [f"    s{i} = v[{i}]" for i in used]
+        for lut in self.luts:
+            index = " | ".join(f"s{leaf}" if k == 0 else f"s{leaf} << {k}" for k, leaf in enumerate(lut.leaves))
+            lines.append(f"    s{lut.root} = ({lut.table:#x} >> ({index or '0'})) & 1")
+        lines += [f"    v[{lut.root}] = s{lut.root}" for lut in self.luts]
+        if len(lines) == 1:
+            lines.append("    pass")
+        return "\n".join(lines) + "\n"
+
+    def make_settle(self):
+        namespace: dict = {}
+        exec(compile(self.settle_source(), f"<luts {self.compiled.circuit.name}>", "exec"), namespace)
+        return namespace["settle"]
+
+
+def _cone_table(compiled: CompiledCircuit, driver: Dict[int, int], root: int, leaves: Sequence[int]) -> int:
+    """Truth table of ``root`` over ``leaves``, evaluated on all rows at once."""
+    rows = 1 << len(leaves)
+    mask = (1 << rows) - 1
+    values: Dict[int, int] = {}
+    for k, leaf in enumerate(leaves):
+        # Bit r of the pattern is bit k of row number r.
+        values[leaf] = sum(1 << r for r in range(rows) if r >> k & 1)
+
+    cone = []
+    stack = [root]
+    seen = set(leaves)
+    while stack:
+        s = stack.pop()
+        if s in seen:
+            continue
+        seen.add(s)
+        gi = driver[s]
+        cone.append(gi)
+        stack.extend(compiled.gates[gi][1])
+    env = {"m": mask}
+    for gi in sorted(cone):  # gates are in topological order
+        out = compiled.gates[gi][2]
+        values[out] = eval(compiled.expression(gi, lambda i: f"({values[i]})"), env) & mask
+    return values[root]
+
+
+def map_luts(compiled: CompiledCircuit, k: int = MAX_K, keep: Iterable[str] = ()) -> LutMapping:
+    """Covers an acyclic compiled circuit with LUTs of at most ``k`` inputs.
+
+    :param keep: extra signal names that must keep their values
+    """
+    if not compiled.acyclic:
+        raise ValueError("LUT mapping needs an acyclic netlist with one driver per net.")
+    # A two-input gate needs a cut of two leaves.
+    if not 2 <= k <= MAX_K:
+        raise ValueError(f"k must be between 2 and {MAX_K}.")
+    circuit = compiled.circuit
+    driver = {out: gi for gi, (_, _, out) in enumerate(compiled.gates)}
+    fanout = [len(readers) for readers in compiled.fanout]
+
+    # Priority cuts in topological order, each with its area flow.
+    cuts: Dict[int, List[Tuple[int, ...]]] = {}
+    flow: Dict[int, float] = {}
+
+    def leaf_cuts(s: int) -> List[Tuple[int, ...]]:
+        return [(s,)] + cuts.get(s, [])
+
+    def cut_flow(cut: Tuple[int, ...]) -> float:
+        return 1.0 + sum(flow.get(leaf, 0.0) / max(1, fanout[leaf]) for leaf in cut)
+
+    for kind, ins, out in compiled.gates:
+        candidates = {()}
+        for i in ins:
+            candidates = {tuple(sorted(set(c) | set(d))) for c in candidates for d in leaf_cuts(i)}
+            candidates = {c for c in candidates if len(c) <= k}
+        ranked = sorted(candidates, key=lambda c: (cut_flow(c), len(c), c))[:CUTS_PER_SIGNAL]
+        cuts[out] = ranked
+        flow[out] = cut_flow(ranked[0])
+
+    visible = {compiled.index[s.name] for s in circuit.outputs}
+    visible.update(d for d, _, _ in compiled.flipflops)
+    visible.update(compiled.index[name] for name in keep)
+    for check in getattr(circuit, "checks", ()):
+        visible.update(compiled.index[name] for name in check.signals)
+
+    chosen: Dict[int, Tuple[int, ...]] = {}
+    pending = [s for s in visible if s in driver]
+    while pending:
+        s = pending.pop()
+        if s in chosen:
+            continue
+        cut = cuts[s][0]
+        chosen[s] = cut
+        pending.extend(leaf for leaf in cut if leaf in driver and leaf not in chosen)
+
+    luts = [Lut(root, cut, _cone_table(compiled, driver, root, cut))
+            for root, cut in sorted(chosen.items(), key=lambda item: driver[item[0]])]
+    computed = set(chosen) | {i for i in range(len(compiled.names)) if i not in driver}
+    return LutMapping(compiled, luts, sorted(computed))
+
+
+class LutSimulator:
+    """Simulates the LUT-mapped network of an acyclic circuit.
+
+    Waveforms of inputs, clocks, flip-flops, outputs and ``keep`` signals
+    match ``Simulator(circuit, detect_cycles=False)``; internal signals
+    absorbed into LUTs are left out.
+    """
+
+    def __init__(self, circuit: Circuit, k: int = MAX_K, keep: Iterable[str] = ()):
+        self.circuit = circuit
+        self.compiled = CompiledCircuit(circuit)
+        self.mapping = map_luts(self.compiled, k, keep)
+        self.settle = self.mapping.make_settle()
+        self.history: Dict[str, List[int]] = {}
+
+    def run(self, steps: int, inputs_map: Dict[str, Spec]) -> Dict[str, List[int]]:
+        compiled = self.compiled
+        v = [0] * len(compiled.names)
+        settle = self.settle
+
+        stimuli = compile_inputs(inputs_map)
+        inputs = [(compiled.index[s.name], stimuli[s.name].value) for s in self.circuit.inputs if s.name in stimuli]
+        clocks = [(compiled.index[c.name], c) for c in self.circuit.clocks]
+        flipflops = compiled.flipflops
+        prev_clk: List[Optional[int]] = [None] * len(flipflops)
+        visible = self.mapping.visible
+        columns: List[List[int]] = [[] for _ in visible]
+
+        for t in range(steps):
+            for i, value_at in inputs:
+                value = value_at(t)
+                if value is not None:
+                    v[i] = 1 if value else 0
+            for i, clock in clocks:
+                clock.update(t)
+                v[i] = clock.get_value()
+            for k, (d, clk, q) in enumerate(flipflops):
+                cur = v[clk]
+                if prev_clk[k] == 0 and cur == 1:
+                    v[q] = v[d]
+                prev_clk[k] = cur
+            settle(v)
+            for column, i in zip(columns, visible):
+                column.append(v[i])
+
+        self.history = {compiled.names[i]: column for i, column in zip(visible, columns)}
+        return self.history
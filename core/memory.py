@@ -0,0 +1,182 @@
+"""
+memory.py
+
+Word-addressed RAM and ROM blocks.
+
+A memory is one array of ``2 ** len(addr)`` words of ``len(dout)`` bits
+(at most 64) instead of thousands of flip-flops and gates. It is
+synchronous, like an FPGA block RAM: at every rising edge of its clock it
+reads the word at the address bus onto the data-out bus, and a RAM with
+its write enable at 1 then stores the data-in bus at that address (read
+first, so DOUT shows the old word). Each edge costs one array access.
+
+Netlist form (buses are listed LSB first):
+
+    RAM <name> ADDR a0 a1 .. DIN d0 d1 .. DOUT q0 q1 .. WE <we> CLK <clk> [INIT <file> | DATA w0 w1 ..]
+    ROM <name> ADDR a0 a1 .. DOUT q0 q1 .. CLK <clk> (FILE <file> | DATA w0 w1 ..)
+
+``DATA`` lists words in hex. A ``FILE``/``INIT`` ending in ``.hex``,
+``.mem`` or ``.txt`` holds hex words separated by whitespace (``//``
+comments allowed); any other file is raw little-endian words of 1, 2, 4
+or 8 bytes. A raw ROM file is memory-mapped, not read into memory.
+"""
+
+from __future__ import annotations
+import mmap
+import os
+import re
+from array import array
+from typing import List, Optional, Sequence
+
+from core.clock import Clock
+from core.signal import Signal
+
+RAM, ROM = "RAM", "ROM"
+
+MAX_WIDTH = 64
+# Largest address bus: 2**24 words.
+MAX_ADDRESS_BITS = 24
+TEXT_SUFFIXES = (".hex", ".mem", ".txt")
+
+
+def typecode(width: int) -> str:
+    """``array`` type code holding ``width``-bit words."""
+    for code in ("B", "H", "I", "Q"):
+        if width <= array(code).itemsize * 8:
+            return code
+    raise ValueError(f"Memory words are at most {MAX_WIDTH} bits wide, got {width}.")
+
+
+def parse_words(words: Sequence[str]) -> List[int]:
+    """Hex word strings (an optional ``0x`` prefix is allowed) to ints."""
+    try:
+        return [int(w[2:] if w.lower().startswith("0x") else w, 16) for w in words]
+    except ValueError as e:
+        raise ValueError(f"Invalid hex word: {e}") from None
+
+
+def _read_text(path: str) -> List[int]:
+    with open(path, encoding="utf-8") as f:
+        text = re.sub(r"//[^\n]*", " ", f.read())
+    return parse_words(text.split())
+
+
+def load_words(path: str, depth: int, width: int, writable: bool):
+    """Contents of ``path`` as an indexable sequence of ``depth`` words.
+
+    A raw file is memory-mapped and viewed in place when ``writable`` is
+    False; otherwise the words are copied into an ``array``.
+    """
+    code = typecode(width)
+    if path.lower().endswith(TEXT_SUFFIXES):
+        return init_words(_read_text(path), depth, width)
+    size = depth * array(code).itemsize
+    with open(path, "rb") as f:
+        actual = os.fstat(f.fileno()).st_size
+        if actual < size:
+            raise ValueError(f"{path} holds {actual} bytes, {size} are needed for {depth} words.")
+        if writable:
+            words = array(code)
+            words.frombytes(f.read(size))
+            return words
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)[:size].cast(code)
+
+
+def init_words(values: Sequence[int], depth: int, width: int) -> array:
+    """An ``array`` of ``depth`` words starting with ``values``, zero-filled."""
+    if len(values) > depth:
+        raise ValueError(f"{len(values)} initial words do not fit in {depth}.")
+    limit = 1 << width
+    for v in values:
+        if v >= limit:
+            raise ValueError(f"Word {v:#x} does not fit in {width} bits.")
+    words = array(typecode(width), values)
+    words.extend([0] * (depth - len(values)))
+    return words
+
+
+class Memory:
+    """A synchronous RAM or ROM (see the module docstring).
+
+    :param words: indexable contents, ``2 ** len(addr)`` words
+    :param din, we: data-in bus and write enable; None for a ROM
+    """
+
+    def __init__(self, name: str, kind: str, addr: List[Signal], dout: List[Signal], clk: Clock,
+                 words, din: Optional[List[Signal]] = None, we: Optional[Signal] = None):
+        if kind not in (RAM, ROM):
+            raise ValueError(f"Unknown memory kind {kind!r}.")
+        if kind == RAM and (din is None or we is None or len(din) != len(dout)):
+            raise ValueError("A RAM needs DIN and WE, and DIN as wide as DOUT.")
+        if not 1 <= len(addr) <= MAX_ADDRESS_BITS:
+            raise ValueError(f"ADDR must have 1 to {MAX_ADDRESS_BITS} bits.")
+        if not 1 <= len(dout) <= MAX_WIDTH:
+            raise ValueError(f"DOUT must have 1 to {MAX_WIDTH} bits.")
+        self.name = name
+        self.kind = kind
+        self.addr = addr
+        self.dout = dout
+        self.din = din or []
+        self.we = we
+        self.clk = clk
+        self.words = words
+        self.depth = 1 << len(addr)
+        self.width = len(dout)
+        if len(words) < self.depth:
+            raise ValueError(f"{name}: {len(words)} words given, {self.depth} needed.")
+        # Contents a RAM returns to when a run starts.
+        self._initial = array(typecode(self.width), words[:self.depth]) if kind == RAM else None
+        self.prev_clk_state = None
+        self.reads = 0
+        self.writes = 0
+        self._edge = False
+
+    def reset(self):
+        """Restores the initial contents and clears the edge state and counters."""
+        if self._initial is not None:
+            self.words[:self.depth] = self._initial
+        self.prev_clk_state = None
+        self.reads = self.writes = 0
+        self._edge = False
+
+    @property
+    def inputs(self) -> List[Signal]:
+        """Signals the memory samples at a clock edge."""
+        return self.addr + self.din + ([self.we] if self.we is not None else [])
+
+    def sample(self):
+        """Detects a rising edge and latches the read; called before the flip-flops update."""
+        cur = self.clk.get_value()
+        self._edge = self.prev_clk_state == 0 and cur == 1
+        self.prev_clk_state = cur
+        if not self._edge:
+            return
+        address = 0
+        for k, s in enumerate(self.addr):
+            if s.value:
+                address |= 1 << k
+        self._address = address
+        self._read = self.words[address]
+        self._write = None
+        if self.we is not None and self.we.value:
+            value = 0
+            for k, s in enumerate(self.din):
+                if s.value:
+                    value |= 1 << k
+            self._write = value
+
+    def apply(self):
+        """Drives DOUT and stores the write latched by :meth:`sample`."""
+        if not self._edge:
+            return
+        word = self._read
+        for k, s in enumerate(self.dout):
+            s.value = (word >> k) & 1
+        self.reads += 1
+        if self._write is not None:
+            self.words[self._address] = self._write
+            self.writes += 1
+
+    def __repr__(self):
+        return f"{self.kind}({self.name}, {self.depth}x{self.width})"
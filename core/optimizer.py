@@ -0,0 +1,264 @@
+"""
+optimizer.py
+
+Logic simplification pass over a parsed Circuit.
+
+The pass rewrites ``circuit.gates`` in place and performs:
+    - constant folding (undriven nets are tied to 0, constants propagate
+      through gates, e.g. AND x 0 -> 0, XOR x 1 -> NOT x)
+    - NOT-NOT elimination (NOT(NOT(x)) -> x)
+    - structural hashing (two gates of the same type over the same inputs
+      are merged into one)
+    - dead-gate removal (gates that no visible signal depends on)
+
+Visible signals (inputs, outputs, clocks and flip-flop D/Q nets) keep their
+names and their waveforms. Internal nets that become redundant are removed
+from ``circuit.signals``.
+
+Nets with more than one driver, or driven by a gate while also being an
+input/clock/flip-flop output, are left untouched.
+
+The rewrites assume two-state values: an undriven net reads 0, not Z, and
+XOR x x is 0, not X, and they ignore gate DELAYs. The result is marked
+``circuit.optimized`` and is refused by the four-state and timing
+simulators.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+
+from core.gates import Gate, BufGate, ConstGate, NotGate
+from core.compiled import gate_type, topological_order
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+# A literal is either ("c", 0|1) for a constant or ("s", name) for a net.
+Literal = Tuple[str, object]
+
+
+class OptimizationReport:
+    """Summary of what :func:`optimize_circuit` changed."""
+
+    def __init__(self, gates_before: int):
+        self.gates_before = gates_before
+        self.gates_after = gates_before
+        self.constants_folded = 0
+        self.double_inversions = 0
+        self.merged = 0
+        self.dead = 0
+        self.removed_signals: List[str] = []
+
+    @property
+    def gates_removed(self) -> int:
+        return self.gates_before - self.gates_after
+
+    def to_dict(self) -> dict:
+        return {
+            "gates_before": self.gates_before,
+            "gates_after": self.gates_after,
+            "gates_removed": self.gates_removed,
+            "constants_folded": self.constants_folded,
+            "double_inversions": self.double_inversions,
+            "merged": self.merged,
+            "dead": self.dead,
+            "removed_signals": list(self.removed_signals),
+        }
+
+    def __repr__(self):
+        return f"OptimizationReport(removed={self.gates_removed}, {self.gates_before} -> {self.gates_after})"
+
+
+def _simplify(kind: str, ins: List[Literal]):
+    """Folds constants and repeated inputs.
+
+    Returns ("c", v), ("s", x), ("not", x) or ("gate", kind, [x, y]).
+    """
+    if kind == "CONST":
+        return ins[0]
+    if kind == "BUF":
+        return ins[0]
+    if kind == "NOT":
+        (a,) = ins
+        return ("c", 1 - a[1]) if a[0] == "c" else ("not", a[1])
+
+    a, b = ins
+    inverted = kind in ("NAND", "NOR", "XNOR")
+    base = {"NAND": "AND", "NOR": "OR", "XNOR": "XOR"}.get(kind, kind)
+
+    if a[0] == "c" and b[0] == "c":
+        va, vb = a[1], b[1]
+        v = {"AND": va & vb, "OR": va | vb, "XOR": va ^ vb}[base]
+        return ("c", v ^ inverted)
+    if a[0] == "c" or b[0] == "c":
+        const, sig = (a[1], b[1]) if a[0] == "c" else (b[1], a[1])
+        if base == "AND":
+            res = ("c", 0) if const == 0 else ("s", sig)
+        elif base == "OR":
+            res = ("s", sig) if const == 0 else ("c", 1)
+        else:
+            res = ("s", sig) if const == 0 else ("not", sig)
+        return _invert(res) if inverted else res
+    if a[1] == b[1]:
+        res = ("c", 0) if base == "XOR" else ("s", a[1])
+        return _invert(res) if inverted else res
+    return ("gate", kind, sorted([a[1], b[1]]))
+
+
+def _invert(res):
+    if res[0] == "c":
+        return ("c", 1 - res[1])
+    if res[0] == "s":
+        return ("not", res[1])
+    return ("s", res[1])  # ("not", x)
+
+
+def _visible_signals(circuit: Circuit) -> Set[str]:
+    names = {s.name for s in circuit.inputs}
+    names |= {s.name for s in circuit.outputs}
+    names |= {c.name for c in circuit.clocks}
+    for ff in circuit.flipflops:
+        names.add(ff.d.name)
+        names.add(ff.q.name)
+    for check in circuit.checks:
+        names |= check.signals
+    for memory in circuit.memories:
+        names |= {s.name for s in memory.inputs + memory.dout}
+    return names
+
+
+def _run_pass(circuit: Circuit, visible: Set[str], report: OptimizationReport) -> bool:
+    sources = {s.name for s in circuit.inputs} | {c.name for c in circuit.clocks}
+    sources |= {ff.q.name for ff in circuit.flipflops}
+    sources |= {s.name for memory in circuit.memories for s in memory.dout}
+
+    drive_count: Dict[str, int] = {}
+    for g in circuit.gates:
+        drive_count[g.output_name] = drive_count.get(g.output_name, 0) + 1
+    opaque = {n for n, c in drive_count.items() if c > 1 or n in sources}
+
+    def resolve(name: str) -> Literal:
+        if name in rep:
+            return rep[name]
+        if name not in drive_count and name not in sources:
+            return ("c", 0)  # undriven nets are tied off to 0
+        if name not in processed:
+            back_edges.add(name)
+        return ("s", name)
+
+    rep: Dict[str, Literal] = {}
+    processed: Set[str] = set(sources)
+    back_edges: Set[str] = set()
+    not_of: Dict[str, str] = {}
+    table: Dict[tuple, str] = {}
+    new_gates: List[Gate] = []
+    changed = False
+
+    for gate in topological_order(circuit.gates)[0]:
+        out = gate.output_name
+        if out in opaque:
+            processed.add(out)
+            new_gates.append(gate)
+            continue
+
+        kind = gate_type(gate)
+        ins = [("c", gate.value)] if kind == "CONST" else [resolve(n) for n in gate.input_names]
+        processed.add(out)
+        res = _simplify(kind, ins)
+        category = "constants_folded"
+
+        if res[0] == "not" and res[1] in not_of:
+            res = ("s", not_of[res[1]])
+            category = "double_inversions"
+        if res[0] in ("not", "gate"):
+            key = ("NOT", (res[1],)) if res[0] == "not" else (res[1], tuple(res[2]))
+            if key in table:
+                res = ("s", table[key])
+                category = "merged"
+
+        if res[0] in ("c", "s"):
+            rep[out] = res
+            # Nets already read through a loop back edge must keep a driver.
+            if out not in visible and out not in back_edges:
+                setattr(report, category, getattr(report, category) + 1)
+                changed = True
+                continue
+            if res[0] == "c" and res[1] == 0:
+                # An undriven visible net already reads as 0.
+                setattr(report, category, getattr(report, category) + 1)
+                changed = True
+                continue
+            if res[0] == "c":
+                if kind != "CONST":
+                    changed = True
+                new_gates.append(ConstGate(gate.name, [], out, circuit=circuit, value=1))
+            else:
+                if kind != "BUF" or gate.input_names != [res[1]]:
+                    changed = True
+                new_gates.append(BufGate(gate.name, [res[1]], out, circuit=circuit))
+            continue
+
+        if res[0] == "not":
+            not_of[out] = res[1]
+            table[("NOT", (res[1],))] = out
+            if kind != "NOT" or gate.input_names != [res[1]]:
+                changed = True
+                gate = NotGate(gate.name, [res[1]], out, circuit=circuit)
+        else:
+            table[(res[1], tuple(res[2]))] = out
+            if sorted(gate.input_names) != res[2]:
+                changed = True
+                gate.input_names = list(res[2])
+        new_gates.append(gate)
+
+    circuit.gates = new_gates
+    return changed
+
+
+def _remove_dead(circuit: Circuit, visible: Set[str], report: OptimizationReport):
+    drivers: Dict[str, List[Gate]] = {}
+    for g in circuit.gates:
+        drivers.setdefault(g.output_name, []).append(g)
+    live_gates: Set[int] = set()
+    stack = list(visible)
+    seen = set(stack)
+    while stack:
+        name = stack.pop()
+        for g in drivers.get(name, ()):
+            if id(g) in live_gates:
+                continue
+            live_gates.add(id(g))
+            for n in g.input_names:
+                if n not in seen:
+                    seen.add(n)
+                    stack.append(n)
+    kept = [g for g in circuit.gates if id(g) in live_gates]
+    report.dead += len(circuit.gates) - len(kept)
+    circuit.gates = kept
+
+
+def optimize_circuit(circuit: Circuit, max_passes: int = 16) -> OptimizationReport:
+    """Simplifies ``circuit`` in place and returns an :class:`OptimizationReport`.
+
+    Waveforms of inputs, outputs, clocks and flip-flop nets are preserved.
+    """
+    report = OptimizationReport(len(circuit.gates))
+    visible = _visible_signals(circuit)
+
+    for _ in range(max_passes):
+        if not _run_pass(circuit, visible, report):
+            break
+    _remove_dead(circuit, visible, report)
+
+    referenced = set(visible)
+    for g in circuit.gates:
+        referenced.add(g.output_name)
+        referenced.update(g.input_names)
+    for name in list(circuit.signals):
+        if name not in referenced:
+            del circuit.signals[name]
+            report.removed_signals.append(name)
+
+    report.gates_after = len(circuit.gates)
+    circuit.optimized = True
+    return report
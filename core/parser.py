@@ -10,6 +10,13 @@ Language (case-insensitive keywords, names are case-sensitive):
     SIGNAL  internal1, internal2, ...        # optional internal wires
     GATE <gateName> <TYPE> <IN1> <IN2> <OUT> # for 2-input gates
     GATE <gateName> NOT <IN> <OUT>           # for NOT (1-input)
+    GATE <gateName> BUF <IN> <OUT>           # for BUF (1-input)
+    GATE ... DELAY <n>                       # optional propagation delay
+    DELAY <TYPE> <n>                         # default delay for a gate type
+    ASSERT  <name> [@<clk>] <expr>           # checked while simulating (core.assertions)
+    MONITOR <name> [@<clk>] <expr>
+    RAM <name> ADDR a0 .. DIN d0 .. DOUT q0 .. WE <we> CLK <clk> [INIT <file> | DATA w0 ..]
+    ROM <name> ADDR a0 .. DOUT q0 .. CLK <clk> (FILE <file> | DATA w0 ..)   # core.memory
 
 Comments:
     - Lines starting with '#' or '//' are ignored.
@@ -17,7 +24,7 @@ Comments:
     - Commas between names are optional (INPUT a b c  or  INPUT a, b, c)
 
 Supported gate types:
-    AND, OR, XOR, NOT   (easy to add more later)
+    AND, OR, XOR, NOT, NAND, NOR, XNOR, BUF
 
 Parsing strategy:
     - Read line-by-line (no heavy tokenizer).
@@ -38,7 +45,10 @@ from core.circuit import Circuit
 from core.signal import Signal
 from core.clock import Clock
 from core.flipflop import DFlipFlop
-from core.gates import AndGate, OrGate, NotGate, XorGate, NandGate, NorGate, XnorGate
+from core.assertions import Check
+from core.memory import MAX_ADDRESS_BITS, MAX_WIDTH, RAM, ROM, Memory, init_words, load_words, parse_words
+from core.instrumentation import Instrumentation, phase
+from core.gates import AndGate, OrGate, NotGate, XorGate, NandGate, NorGate, XnorGate, BufGate
 
 _NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
@@ -46,13 +56,27 @@ class NetlistParseError(Exception):
     """Raised for any netlist parsing error with a helpful message."""
 
 class NetlistParser:
-    GATE_MAP = {"AND": AndGate, "OR": OrGate, "XOR": XorGate, "NOT": NotGate, "NAND": NandGate, "NOR": NorGate, "XNOR": XnorGate}
-
-    def __init__(self, text: str):
+    GATE_MAP = {"AND": AndGate, "OR": OrGate, "XOR": XorGate, "NOT": NotGate, "NAND": NandGate, "NOR": NorGate, "XNOR": XnorGate, "BUF": BufGate}
+    UNARY_GATES = {"NOT", "BUF"}
+    # Longest DELAY in steps; the timing simulator keeps a bucket per step of delay.
+    MAX_DELAY = 4096
+    # Sections of a RAM/ROM line; the single-valued ones take exactly one token.
+    MEMORY_BUSES = {"ADDR", "DIN", "DOUT", "DATA"}
+    MEMORY_SINGLE = {"WE", "CLK", "INIT", "FILE"}
+
+    def __init__(self, text: str, instrumentation: Instrumentation | None = None, allow_files: bool = True):
+        """:param allow_files: whether RAM/ROM contents may be read from files
+        (off for netlists from untrusted clients)"""
         self.text = text
         self.circuit: Circuit | None = None
+        self.instrumentation = instrumentation
+        self.allow_files = allow_files
 
     def parse(self) -> Circuit:
+        with phase(self.instrumentation, "parse"):
+            return self._parse()
+
+    def _parse(self) -> Circuit:
         lines = self._preprocess(self.text)
         for lineno, line in lines:
             if not line: continue
@@ -71,6 +95,9 @@ class NetlistParser:
             elif head_u == "GATE": self._require_circuit(lineno); self._parse_gate(lineno, rest)
             elif head_u == "CLOCK": self._require_circuit(lineno); self._parse_clock(lineno, rest)
             elif head_u == "DFF": self._require_circuit(lineno); self._parse_dff(lineno, rest)
+            elif head_u == "DELAY": self._require_circuit(lineno); self._parse_delay(lineno, rest)
+            elif head_u in ("ASSERT", "MONITOR"): self._require_circuit(lineno); self._parse_check(lineno, head_u, line)
+            elif head_u in (RAM, ROM): self._require_circuit(lineno); self._parse_memory(lineno, head_u, rest)
             else: raise NetlistParseError(f"[line {lineno}] Unknown directive '{head}'")
         if self.circuit is None: raise NetlistParseError("No CIRCUIT defined.")
         return self.circuit
@@ -104,20 +131,43 @@ class NetlistParser:
             self.circuit.signals[name] = Signal(name=name, value=0)
 
     def _parse_gate(self, lineno: int, parts: List[str]):
+        delay = None
+        if len(parts) >= 2 and parts[-2].upper() == "DELAY" and parts[-1].isdigit():
+            delay = self._parse_delay_value(lineno, parts[-1]); parts = parts[:-2]
         if len(parts) < 4: raise NetlistParseError(f"[line {lineno}] GATE requires at least 4 tokens.")
         gate_name, gate_type = parts[0], parts[1].upper(); self._assert_name(gate_name, lineno)
         gate_cls = self.GATE_MAP.get(gate_type)
         if gate_cls is None: raise NetlistParseError(f"[line {lineno}] Unsupported gate type '{gate_type}'")
-        if gate_type == "NOT":
-            if len(parts) != 4: raise NetlistParseError(f"[line {lineno}] NOT form: GATE <name> NOT <IN> <OUT>")
+        if gate_type in self.UNARY_GATES:
+            if len(parts) != 4: raise NetlistParseError(f"[line {lineno}] {gate_type} form: GATE <name> {gate_type} <IN> <OUT>")
             in1, out = parts[2], parts[3]; self._ensure_signal(in1); self._ensure_signal(out)
             gate = gate_cls(gate_name, [in1], out, circuit=self.circuit)
         else:
             if len(parts) != 5: raise NetlistParseError(f"[line {lineno}] {gate_type} form: GATE <name> {gate_type} <IN1> <IN2> <OUT>")
             in1, in2, out = parts[2], parts[3], parts[4]; self._ensure_signal(in1); self._ensure_signal(in2); self._ensure_signal(out)
             gate = gate_cls(gate_name, [in1, in2], out, circuit=self.circuit)
+        if delay is not None: gate.delay = delay
         self.circuit.add_gate(gate)
 
+    def _parse_delay_value(self, lineno: int, text: str) -> int:
+        if not text.isdigit() or int(text) < 1: raise NetlistParseError(f"[line {lineno}] DELAY must be a positive integer, got '{text}'.")
+        if int(text) > self.MAX_DELAY: raise NetlistParseError(f"[line {lineno}] DELAY must be at most {self.MAX_DELAY}, got {text}.")
+        return int(text)
+
+    def _parse_check(self, lineno: int, kind: str, line: str):
+        # Expressions have their own syntax, so take the raw text after the keyword.
+        try: check = Check.parse(kind, "".join(line.split(None, 1)[1:]))
+        except ValueError as e: raise NetlistParseError(f"[line {lineno}] {e}") from None
+        for name in sorted(check.signals):
+            if name not in self.circuit.signals: raise NetlistParseError(f"[line {lineno}] Signal '{name}' is used but not declared.")
+        self.circuit.add_check(check)
+
+    def _parse_delay(self, lineno: int, parts: List[str]):
+        if len(parts) != 2: raise NetlistParseError(f"[line {lineno}] DELAY form: DELAY <TYPE> <n>")
+        gate_type = parts[0].upper()
+        if gate_type not in self.GATE_MAP: raise NetlistParseError(f"[line {lineno}] Unsupported gate type '{parts[0]}'")
+        self.circuit.gate_delays[gate_type] = self._parse_delay_value(lineno, parts[1])
+
     def _parse_clock(self, lineno: int, parts: List[str]):
         if not parts: raise NetlistParseError(f"[line {lineno}] CLOCK requires a name.")
         name = parts.pop(0)
@@ -139,6 +189,57 @@ class NetlistParser:
         # 3. CRITICAL: Put the clock object itself into the main signals dictionary
         self.circuit.signals[name] = clock_obj
 
+    def _parse_memory(self, lineno: int, kind: str, parts: List[str]):
+        form = (f"{kind} form: RAM <name> ADDR <bits> DIN <bits> DOUT <bits> WE <we> CLK <clk> [INIT <file> | DATA <words>]"
+                if kind == RAM else f"{kind} form: ROM <name> ADDR <bits> DOUT <bits> CLK <clk> (FILE <file> | DATA <words>)")
+        if not parts: raise NetlistParseError(f"[line {lineno}] {form}")
+        name = parts[0]; self._assert_name(name, lineno)
+        fields: dict = {}
+        key = None
+        tokens = iter(parts[1:])
+        for token in tokens:
+            upper = token.upper()
+            if upper in self.MEMORY_SINGLE:
+                value = next(tokens, None)
+                if value is None: raise NetlistParseError(f"[line {lineno}] Expected a value after {upper}.")
+                fields[upper] = value; key = None
+            elif upper in self.MEMORY_BUSES:
+                key = upper; fields[key] = []
+            elif key is not None: fields[key].append(token)
+            else: raise NetlistParseError(f"[line {lineno}] Unexpected '{token}'. {form}")
+        allowed = {"ADDR", "DIN", "DOUT", "WE", "CLK", "INIT", "DATA"} if kind == RAM else {"ADDR", "DOUT", "CLK", "FILE", "DATA"}
+        required = {"ADDR", "DIN", "DOUT", "WE", "CLK"} if kind == RAM else {"ADDR", "DOUT", "CLK"}
+        extra, missing = set(fields) - allowed, required - set(fields)
+        if extra or missing or ("INIT" in fields or "FILE" in fields) and "DATA" in fields:
+            raise NetlistParseError(f"[line {lineno}] {form}")
+        if kind == ROM and "FILE" not in fields and "DATA" not in fields:
+            raise NetlistParseError(f"[line {lineno}] ROM {name} needs FILE or DATA contents.")
+
+        clock_obj = next((c for c in self.circuit.clocks if c.name == fields["CLK"]), None)
+        if clock_obj is None: raise NetlistParseError(f"[line {lineno}] {kind} references unknown CLOCK '{fields['CLK']}'.")
+        buses = {}
+        for bus in ("ADDR", "DIN", "DOUT"):
+            for n in fields.get(bus, ()): self._assert_name(n, lineno); self._ensure_signal(n)
+            buses[bus] = [self.circuit.signals[n] for n in fields.get(bus, ())]
+        we = None
+        if "WE" in fields:
+            self._assert_name(fields["WE"], lineno); self._ensure_signal(fields["WE"]); we = self.circuit.signals[fields["WE"]]
+        depth, width = 1 << len(buses["ADDR"]), len(buses["DOUT"])
+        try:
+            if not 1 <= len(buses["ADDR"]) <= MAX_ADDRESS_BITS or not 1 <= width <= MAX_WIDTH:
+                raise ValueError(f"ADDR needs 1 to {MAX_ADDRESS_BITS} bits and DOUT 1 to {MAX_WIDTH} bits.")
+            path = fields.get("INIT", fields.get("FILE"))
+            if path is not None:
+                if not self.allow_files: raise ValueError("Reading memory contents from files is not allowed here; use DATA.")
+                words = load_words(path, depth, width, writable=kind == RAM)
+            else:
+                words = init_words(parse_words(fields.get("DATA", [])), depth, width)
+            memory = Memory(name, kind, buses["ADDR"], buses["DOUT"], clock_obj, words,
+                            din=buses["DIN"] if kind == RAM else None, we=we)
+        except (OSError, ValueError) as e:
+            raise NetlistParseError(f"[line {lineno}] {kind} {name}: {e}") from None
+        self.circuit.add_memory(memory)
+
     def _parse_dff(self, lineno: int, parts: List[str]):
         if len(parts) != 4: raise NetlistParseError(f"[line {lineno}] DFF requires 4 tokens: <name> <d> <clk> <q>")
         ff_name, d_name, clk_name, q_name = parts
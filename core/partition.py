@@ -0,0 +1,299 @@
+"""
+partition.py
+
+Multi-process simulation of large acyclic netlists.
+
+The levelized gate graph (see core.compiled) is split into ``parts``
+chunks. Within every logic level gates are assigned greedily to the part
+that already drives most of their inputs, subject to a balance limit, so
+logic cones stay together and few signals cross between parts.
+
+Signal values live in one ``multiprocessing.shared_memory`` byte array
+(one byte per signal). The main process is part 0 and handles inputs,
+clocks, flip-flops and recording; worker processes evaluate the other
+parts. Evaluation is cut into *segments*: consecutive levels are merged
+into one segment as long as no gate reads a value that another part
+wrote in the same segment, and all processes meet at a barrier after each
+segment. A good partition therefore needs far fewer barriers per step than
+there are levels.
+
+Throughput only scales when every segment holds enough gates per part to
+amortise a barrier (roughly 10-50 us), i.e. for wide netlists of tens of
+thousands of gates and more. Smaller circuits are faster with
+``Simulator`` or ``workers=0``, which runs the same partitioned code in
+the calling process.
+"""
+
+from __future__ import annotations
+import math
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from core.compiled import CompiledCircuit
+from core.stimulus import Spec, compile_inputs
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+
+class PartitionPlan:
+    """Assignment of gates to parts and the resulting segments.
+
+    Attributes:
+        parts:     number of parts
+        owner:     part of each gate (indices into ``compiled.gates``)
+        segments:  per segment, per part, the gate indices to evaluate
+        cut_signals: signals read by a part other than their driver's
+    """
+
+    def __init__(self, parts: int, owner: List[int], segments: List[List[List[int]]], cut_signals: int):
+        self.parts = parts
+        self.owner = owner
+        self.segments = segments
+        self.cut_signals = cut_signals
+
+    @property
+    def barriers_per_step(self) -> int:
+        return len(self.segments)
+
+    def load(self) -> List[int]:
+        """Gates per part."""
+        counts = [0] * self.parts
+        for p in self.owner:
+            counts[p] += 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "parts": self.parts,
+            "segments": len(self.segments),
+            "cut_signals": self.cut_signals,
+            "load": self.load(),
+        }
+
+
+def partition(compiled: CompiledCircuit, parts: int, slack: float = 0.1) -> PartitionPlan:
+    """Splits an acyclic compiled circuit into ``parts`` chunks.
+
+    :param slack: how far a part may exceed an even share of a level
+    """
+    if not compiled.acyclic:
+        raise ValueError("Partitioned simulation needs an acyclic netlist with one driver per net.")
+    parts = max(1, parts)
+    by_level: Dict[int, List[int]] = {}
+    for gi, lvl in enumerate(compiled.levels):
+        by_level.setdefault(lvl, []).append(gi)
+
+    driver_part: Dict[int, int] = {}
+    owner = [0] * len(compiled.gates)
+    for lvl in sorted(by_level):
+        gates = by_level[lvl]
+        capacity = max(1, math.ceil(len(gates) / parts * (1 + slack)))
+        load = [0] * parts
+        for gi in gates:
+            _, ins, out = compiled.gates[gi]
+            affinity = [0] * parts
+            for i in ins:
+                p = driver_part.get(i)
+                if p is not None:
+                    affinity[p] += 1
+            best = min((p for p in range(parts) if load[p] < capacity),
+                       key=lambda p: (-affinity[p], load[p]))
+            owner[gi] = best
+            load[best] += 1
+            driver_part[out] = best
+
+    cut = set()
+    for gi, (_, ins, _) in enumerate(compiled.gates):
+        for i in ins:
+            p = driver_part.get(i)
+            if p is not None and p != owner[gi]:
+                cut.add(i)
+
+    # Merge levels into segments until a gate would read another part's
+    # output from the current segment.
+    segments: List[List[List[int]]] = []
+    current: List[List[int]] = [[] for _ in range(parts)]
+    fresh: Dict[int, int] = {}
+    for lvl in sorted(by_level):
+        gates = by_level[lvl]
+        if any(fresh.get(i, owner[gi]) != owner[gi] for gi in gates for i in compiled.gates[gi][1]):
+            segments.append(current)
+            current = [[] for _ in range(parts)]
+            fresh = {}
+        for gi in gates:
+            current[owner[gi]].append(gi)
+            fresh[compiled.gates[gi][2]] = owner[gi]
+    if any(current):
+        segments.append(current)
+    return PartitionPlan(parts, owner, segments, len(cut))
+
+
+def _segment_source(compiled: CompiledCircuit, gates: List[int], name: str) -> str:
+    lines = [f"def {name}(b):"]
+    for gi in gates:
+        out = compiled.gates[gi][2]
+        lines.append(f"    b[{out}] = {compiled.expression(gi, lambda i: f'b[{i}]')}")
+    if len(lines) == 1:
+        lines.append("    pass")
+    return "\n".join(lines) + "\n"
+
+
+def _part_source(compiled: CompiledCircuit, plan: PartitionPlan, part: int) -> str:
+    return "".join(_segment_source(compiled, seg[part], f"seg{k}") for k, seg in enumerate(plan.segments))
+
+
+def _load_functions(source: str, count: int) -> list:
+    namespace = {"m": 1}
+    exec(compile(source, "<partition>", "exec"), namespace)
+    return [namespace[f"seg{k}"] for k in range(count)]
+
+
+def _worker(shm_name: str, stop_index: int, source: str, count: int, barrier):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        functions = _load_functions(source, count)
+        b = shm.buf
+        try:
+            while True:
+                barrier.wait()
+                if b[stop_index]:
+                    break
+                for f in functions:
+                    f(b)
+                    barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        except BaseException:
+            # Fail the main process at its next barrier instead of letting it time out.
+            barrier.abort()
+            raise
+        finally:
+            del b
+    finally:
+        shm.close()
+
+
+class PartitionedSimulator:
+    """Simulates an acyclic circuit across ``workers + 1`` processes.
+
+    Produces the same waveforms as ``Simulator(circuit, detect_cycles=False)``.
+    Call :meth:`close` (or use it as a context manager) to stop the workers.
+
+    :param timeout: seconds the main process waits at a barrier; if a worker
+        crashed or hangs, :meth:`run` stops the workers, frees the shared
+        memory and raises RuntimeError
+    """
+
+    def __init__(self, circuit: Circuit, workers: Optional[int] = None, slack: float = 0.1,
+                 timeout: float = 60.0):
+        if workers is None:
+            workers = max(0, (multiprocessing.cpu_count() or 1) - 1)
+        self.circuit = circuit
+        self.compiled = CompiledCircuit(circuit)
+        self.plan = partition(self.compiled, workers + 1, slack)
+        self.history: Dict[str, List[int]] = {}
+        self.timeout = timeout
+
+        n = len(self.compiled.names)
+        self._stop_index = n
+        self._shm = shared_memory.SharedMemory(create=True, size=n + 1)
+        self._shm.buf[:n + 1] = bytes(n + 1)
+        count = len(self.plan.segments)
+        self._functions = _load_functions(_part_source(self.compiled, self.plan, 0), count)
+        self._barrier = None
+        self._processes = []
+        if workers:
+            ctx = multiprocessing.get_context()
+            self._barrier = ctx.Barrier(workers + 1)
+            for part in range(1, workers + 1):
+                source = _part_source(self.compiled, self.plan, part)
+                proc = ctx.Process(target=_worker, daemon=True,
+                                   args=(self._shm.name, self._stop_index, source, count, self._barrier))
+                proc.start()
+                self._processes.append(proc)
+
+    def run(self, steps: int, inputs_map: Dict[str, Spec]) -> Dict[str, List[int]]:
+        compiled = self.compiled
+        n = len(compiled.names)
+        b = self._shm.buf
+        b[:n] = bytes(n)
+        barrier = self._barrier
+        functions = self._functions
+
+        stimuli = compile_inputs(inputs_map)
+        inputs = [(compiled.index[s.name], stimuli[s.name].value) for s in self.circuit.inputs if s.name in stimuli]
+        clocks = [(compiled.index[c.name], c) for c in self.circuit.clocks]
+        flipflops = compiled.flipflops
+        prev_clk: List[Optional[int]] = [None] * len(flipflops)
+        trace = bytearray()
+
+        for t in range(steps):
+            for i, value_at in inputs:
+                value = value_at(t)
+                if value is not None:
+                    b[i] = 1 if value else 0
+            for i, clock in clocks:
+                clock.update(t)
+                b[i] = clock.get_value()
+            for k, (d, clk, q) in enumerate(flipflops):
+                cur = b[clk]
+                if prev_clk[k] == 0 and cur == 1:
+                    b[q] = b[d]
+                prev_clk[k] = cur
+
+            if barrier is None:
+                for f in functions:
+                    f(b)
+            else:
+                try:
+                    barrier.wait(self.timeout)
+                    for f in functions:
+                        f(b)
+                        barrier.wait(self.timeout)
+                except threading.BrokenBarrierError:
+                    self._abort()
+                    raise RuntimeError(f"A partition worker failed or did not reach the barrier "
+                                       f"within {self.timeout}s at step {t}.") from None
+            trace += b[:n]
+
+        self.history = {name: list(trace[i::n]) for i, name in enumerate(compiled.names)}
+        return self.history
+
+    def close(self):
+        if self._shm is None:
+            return
+        if self._processes:
+            self._shm.buf[self._stop_index] = 1
+            try:
+                self._barrier.wait(self.timeout)
+            except threading.BrokenBarrierError:
+                self._abort()
+                return
+            for proc in self._processes:
+                proc.join()
+        self._release()
+
+    def _abort(self):
+        """Stops the workers after a broken barrier and frees the shared memory."""
+        self._barrier.abort()
+        for proc in self._processes:
+            proc.join(1.0)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        self._processes = []
+        self._release()
+
+    def _release(self):
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,13 @@
 from __future__ import annotations
-from typing import Dict, List, TYPE_CHECKING
+import math
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .activity import ActivityStats
+from .assertions import Check, CheckReport, CheckRunner
+from .compiled import topological_order
+from .instrumentation import Instrumentation, phase
+from .memory import RAM
+from .stimulus import Spec, compile_inputs, settle_point
 
 if TYPE_CHECKING:
     from .circuit import Circuit
@@ -8,48 +16,256 @@ if TYPE_CHECKING:
 class Simulator:
     """
     Handles the step-by-step simulation of a circuit.
-    This class was the source of the error.
+
+    Once the input vectors are exhausted (or only repeat periodically) the
+    circuit is autonomous: its future depends only on the current signal
+    values and the clock and stimulus phase.
+    With ``detect_cycles`` enabled the simulator hashes the state at every
+    clock-period boundary from then on, and as soon as a state repeats the
+    rest of the waveform is copied from the detected cycle instead of being
+    simulated.
+
+    Combinational logic is settled in topological order when the gate graph
+    is acyclic (one pass per step). Otherwise gates are evaluated in netlist
+    order until a pass changes nothing, at most ``len(gates) + 1`` passes.
+
+    With ``activity`` enabled each run also fills :attr:`activity` with
+    toggle, time-at-1 and gate evaluation counts (see core.activity).
+
+    ``progress`` is called as ``progress(step, steps)`` every
+    ``progress_interval`` steps and once more when the run finishes.
+
+    The circuit's ASSERT/MONITOR checks, plus any passed in ``checks``, are
+    evaluated after every step (see core.assertions) and summarised in
+    :attr:`check_report`. The run stops after ``max_failures`` assertion
+    failures (0 = never), and the waveforms then end at the failing step.
+    Cycle detection is off while there are checks to evaluate, and in
+    circuits with RAMs, whose contents are state outside the signals.
+    RAM/ROM blocks (core.memory) sample their inputs at a clock edge
+    together with the flip-flops.
+
+    With a ``recorder`` (such as core.wavestore.WaveStoreWriter) the
+    waveforms are handed to it step by step instead of being kept in
+    :attr:`history`, which stays empty; memory use no longer grows with
+    the run. The recorder is closed at the end of each run, and the run
+    ends early when its ``append`` returns True (core.capture does so
+    once it has all the windows it wants).
     """
 
-    def __init__(self, circuit: Circuit):
+    def __init__(self, circuit: Circuit, detect_cycles: bool = True,
+                 instrumentation: Optional[Instrumentation] = None,
+                 activity: bool = False,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 progress_interval: int = 1024,
+                 checks: Optional[List[Check]] = None,
+                 max_failures: int = 1,
+                 recorder=None):
         self.circuit = circuit
-        # This is a placeholder for any setup logic.
-        # The original bug was likely in a method within this class.
+        self.recorder = recorder
+        self.checks = list(circuit.checks) + list(checks or ())
+        self.max_failures = max_failures
+        self.check_report: Optional[CheckReport] = None
+        self.progress = progress
+        self.progress_interval = max(1, progress_interval)
+        self.detect_cycles = detect_cycles
+        self.instrumentation = instrumentation
+        self.collect_activity = activity
+        self.history: Dict[str, List[int]] = {}
+        self.activity: Optional[ActivityStats] = None
+        # (first step of the cycle, cycle length) when the last run short-circuited.
+        self.cycle: Optional[Tuple[int, int]] = None
+
+    def _state_period(self) -> int:
+        """Number of steps after which every clock is back in the same phase."""
+        period = 1
+        for clock in self.circuit.clocks:
+            period = period * clock.period // math.gcd(period, clock.period)
+        return period
+
+    def _settle_plan(self):
+        """Returns (gates in evaluation order, whether one pass settles them)."""
+        gates = self.circuit.gates
+        order, acyclic = topological_order(gates)
+        drivers = [g.output_name for g in gates]
+        if acyclic and len(set(drivers)) == len(drivers):
+            return order, True
+        return list(gates), False
 
-    def run(self, steps: int, inputs_map: Dict[str, str]) -> Dict[str, list[int]]:
-        """Runs the simulation and returns the waveforms."""
+    def run(self, steps: int, inputs_map: Dict[str, Spec], record: bool = True) -> Dict[str, list[int]]:
+        """Runs the simulation and returns the waveforms.
 
+        ``inputs_map`` values are value strings or lazy stimulus specs
+        (see core.stimulus).
+
+        With ``record=False`` no waveforms are kept (an empty dict is
+        returned); use it together with ``activity`` when only the
+        statistics are needed. Cycle detection needs the recorded
+        waveforms and is skipped in that mode.
+        """
+        with phase(self.instrumentation, "simulate"):
+            waveforms = self._run(steps, inputs_map, record)
+        if self.progress is not None:
+            self.progress(steps, steps)
+        return waveforms
+
+    def _run(self, steps: int, inputs_map: Dict[str, Spec], record: bool) -> Dict[str, list[int]]:
         # Initialize all signals to a known state (0)
         for signal in self.circuit.signals.values():
             signal.set_value(0)
+        for ff in self.circuit.flipflops:
+            ff.prev_clk_state = None
+        memories = self.circuit.memories
+        for memory in memories:
+            memory.reset()
+
+        recorder = self.recorder if record else None
+        waveforms = {name: [] for name in self.circuit.signals} if record and recorder is None else {}
+        self.history = waveforms
+        self.cycle = None
+        # RAM contents are state that the signal values do not show.
+        detect_cycles = (self.detect_cycles and record and not self.checks
+                         and not any(m.kind == RAM for m in memories))
+        if recorder is not None:
+            recorder.start(list(self.circuit.signals))
+            # Cycles are replayed by recorders that can (``repeat``); doing so
+            # does not update the statistics.
+            detect_cycles = detect_cycles and not self.collect_activity and hasattr(recorder, "repeat")
+        runner = CheckRunner(self.circuit, self.checks, self.max_failures) if self.checks else None
+        self.check_report = runner.report if runner is not None else None
+
+        columns = list(waveforms.values())
+        stimuli = compile_inputs(inputs_map)
+        drive = [(s, stimuli[s.name].value) for s in self.circuit.inputs if s.name in stimuli]
+        input_end, input_period = settle_point({s.name: stimuli[s.name] for s, _ in drive})
+        if input_end is None:
+            detect_cycles = False
+        period = self._state_period()
+        period = period * input_period // math.gcd(period, input_period)
+        seen: Dict[int, int] = {}
 
-        waveforms = {name: [] for name in self.circuit.signals}
+        gates, single_pass = self._settle_plan()
+        driven = list({id(s): s for s in (self.circuit.signals[g.output_name] for g in gates)}.values())
+        max_passes = len(gates) + 1
+        instr = self.instrumentation
+        counting = instr is not None and instr.counters
+        signal_list = list(self.circuit.signals.values())
+        stats = None
+        if self.collect_activity:
+            stats = ActivityStats(list(self.circuit.signals),
+                                  [(g.name, g.output_name) for g in self.circuit.gates])
+        self.activity = stats
+        fast_record = record and recorder is None and stats is None and not counting
+        plain_recorder = recorder is not None and stats is None and not counting
+        recorder_done = False
+        last: List[int] = []
+
+        progress, interval = self.progress, self.progress_interval
 
         for t in range(steps):
+            if progress is not None and t % interval == 0:
+                progress(t, steps)
+
+            # 0. Once inputs are constant, look for a repeated state at period boundaries.
+            if detect_cycles and recorder is not None and t > 0 and t >= input_end and t % period == 0:
+                # The signals still hold the values recorded at step t - 1.
+                state = [signal.get_value() for signal in signal_list]
+                key = hash(tuple(state))
+                start = seen.get(key)
+                if start is not None and recorder.row(start - 1) == state:
+                    recorder.repeat(start, t, steps)
+                    self.cycle = (start, t - start)
+                    self._restore_state(recorder.row(steps - 1))
+                    break
+                seen[key] = t
+            elif detect_cycles and t > 0 and t >= input_end and t % period == 0:
+                key = hash(tuple(column[t - 1] for column in columns))
+                start = seen.get(key)
+                if start is not None and all(column[start - 1] == column[t - 1] for column in columns):
+                    self._repeat_cycle(columns, start, t, steps)
+                    break
+                seen[key] = t
+
             # 1. Set inputs and update clocks for the current time step
-            for signal in self.circuit.inputs:
-                if signal.name in inputs_map and t < len(inputs_map[signal.name]):
-                    try:
-                        value = int(inputs_map[signal.name][t])
-                        signal.set_value(value)
-                    except (ValueError, TypeError):
-                        signal.set_value(0)  # Default to 0 on bad input
+            for signal, value_at in drive:
+                value = value_at(t)
+                if value is not None:
+                    signal.set_value(value)
 
             for clock in self.circuit.clocks:
                 clock.update(t)
 
-            # 2. Update stateful components (DFFs)
+            # 2. Update stateful components (DFFs, then memories on the values they sampled)
+            for memory in memories:
+                memory.sample()
             for ff in self.circuit.flipflops:
                 ff.update()
+            for memory in memories:
+                memory.apply()
 
             # 3. Propagate changes through combinational logic (Gates)
-            # The loop ensures signals stabilize.
-            for _ in range(len(self.circuit.gates) + 1):
-                for gate in self.circuit.gates:
+            if single_pass:
+                for gate in gates:
                     gate.update()
+                passes = 1
+            else:
+                # Repeat until a full pass leaves every driven signal unchanged.
+                passes = 0
+                while passes < max_passes:
+                    before = [s.value for s in driven]
+                    for gate in gates:
+                        gate.update()
+                    passes += 1
+                    if [s.value for s in driven] == before:
+                        break
 
             # 4. Record the final, stable state of all signals
-            for name, signal in self.circuit.signals.items():
-                waveforms[name].append(signal.get_value())
+            if fast_record:
+                for column, signal in zip(columns, signal_list):
+                    column.append(signal.get_value())
+            elif plain_recorder:
+                recorder_done = recorder.append([signal.value for signal in signal_list])
+            else:
+                values = [signal.get_value() for signal in signal_list]
+                changed = [k for k, (v, p) in enumerate(zip(values, last)) if v != p] if t else []
+                last = values
+                if recorder is not None:
+                    recorder_done = recorder.append(values)
+                elif record:
+                    for column, value in zip(columns, values):
+                        column.append(value)
+                if stats is not None:
+                    stats.count_step(values, changed, passes)
+                if counting:
+                    instr.record_step(passes, passes * len(gates), len(changed))
+
+            # 5. Evaluate assertions and monitors on the settled values
+            if runner is not None and runner.step(t):
+                runner.report.stopped_at = t
+                break
+            if recorder_done:
+                break
 
+        if recorder is not None:
+            recorder.close({"cycle": {"start": self.cycle[0], "length": self.cycle[1]}} if self.cycle else None)
         return waveforms
+
+    def _repeat_cycle(self, columns: List[List[int]], start: int, t: int, steps: int):
+        """Fills steps ``t..steps-1`` from the cycle ``start..t-1``."""
+        length = t - start
+        reps, rest = divmod(steps - t, length)
+        for column in columns:
+            cycle = column[start:t]
+            column.extend(cycle * reps)
+            column.extend(cycle[:rest])
+        if self.activity is not None:
+            self.activity.count_repeated(columns, t)
+
+        self._restore_state([column[-1] for column in columns])
+        self.cycle = (start, length)
+
+    def _restore_state(self, values: List[int]):
+        """Leaves the circuit in the state it would have after the last step."""
+        for signal, value in zip(self.circuit.signals.values(), values):
+            signal.set_value(value)
+        for element in self.circuit.flipflops + self.circuit.memories:
+            element.prev_clk_state = element.clk.get_value()
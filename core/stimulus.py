@@ -0,0 +1,219 @@
+"""
+stimulus.py
+
+Lazily evaluated input stimulus.
+
+Besides the classic '0'/'1' string, an entry of ``inputs_map`` may be a
+spec that is expanded step by step, so long testbenches cost a few bytes:
+
+    "0110"                                    value string, then hold
+    {"repeat": "0110"}                        the pattern over and over
+    {"random": 7, "p": 0.5}                   seeded random bits, P(1) = p
+    {"piecewise": [[1, 100], [0, 250]]}       1 until step 100, 0 until 250, then hold
+    {"counter": {"start": 0, "every": 4}}     binary counter advancing every 4 steps
+    {"file": "vec.txt", "offset": 0, "stride": 1}
+                                              '0'/'1' characters read through mmap
+
+A counter drives a group of inputs: its key lists them LSB first,
+separated by commas (``"a0,a1,a2": {"counter": {}}``). Files use one
+character per step; with several inputs in one file, use
+``stride = width + 1`` for newline-separated rows and ``offset`` for the
+column.
+
+Every stimulus reports when it stops changing (``end``) and its period
+after that, which is what the simulator's cycle detection needs.
+"""
+
+from __future__ import annotations
+import bisect
+import math
+import mmap
+import os
+import random
+from typing import Dict, List, Mapping, Optional, Union
+
+Spec = Union[str, dict, "Stimulus"]
+
+_RANDOM_BLOCK = 4096
+
+
+class Stimulus:
+    """Value source for one input.
+
+    Attributes:
+        end:    from this step on ``value(t)`` repeats with ``period``;
+                None if it never does (e.g. random)
+        period: repeat length once ``end`` is reached (1 = constant)
+    """
+
+    end: Optional[int] = 0
+    period: int = 1
+
+    def value(self, t: int) -> Optional[int]:
+        """Value at step ``t``, or None to keep the previous value."""
+        raise NotImplementedError
+
+
+class Pattern(Stimulus):
+    """A value string; the input holds its last value after the string ends."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.end = len(text)
+
+    def value(self, t: int) -> Optional[int]:
+        if t >= self.end:
+            return None
+        try:
+            return int(self.text[t])
+        except (ValueError, TypeError):
+            return 0  # Default to 0 on bad input
+
+
+class Repeat(Stimulus):
+    """A 0/1 pattern repeated for as long as the simulation runs."""
+
+    def __init__(self, pattern: str):
+        if not pattern or pattern.strip("01"):
+            raise ValueError("'repeat' needs a non-empty string of 0s and 1s.")
+        self.bits = [int(c) for c in pattern]
+        self.period = len(self.bits)
+
+    def value(self, t: int) -> int:
+        return self.bits[t % self.period]
+
+
+class RandomBits(Stimulus):
+    """Seeded random bits; any step can be evaluated independently."""
+
+    end = None
+
+    def __init__(self, seed: int, p: float = 0.5):
+        if not 0.0 <= p <= 1.0:
+            raise ValueError("'p' must be between 0 and 1.")
+        self.seed = seed
+        self.p = p
+        self._block = -1
+        self._bits: List[int] = []
+
+    def value(self, t: int) -> int:
+        block, offset = divmod(t, _RANDOM_BLOCK)
+        if block != self._block:
+            rng = random.Random(f"{self.seed}:{block}")
+            p = self.p
+            self._bits = [1 if rng.random() < p else 0 for _ in range(_RANDOM_BLOCK)]
+            self._block = block
+        return self._bits[offset]
+
+
+class CounterBit(Stimulus):
+    """Bit ``bit`` of a ``width``-bit counter that advances every ``every`` steps."""
+
+    def __init__(self, bit: int, width: int, start: int = 0, every: int = 1):
+        if every < 1:
+            raise ValueError("'every' must be at least 1.")
+        self.bit = bit
+        self.start = start
+        self.every = every
+        self.period = (1 << width) * every
+
+    def value(self, t: int) -> int:
+        return ((self.start + t // self.every) >> self.bit) & 1
+
+
+class Piecewise(Stimulus):
+    """``[[value, until], ...]``: each value holds until the given step."""
+
+    def __init__(self, segments: List[List[int]]):
+        if not segments:
+            raise ValueError("'piecewise' needs at least one [value, until] pair.")
+        self.values = [int(v) for v, _ in segments]
+        self.untils = [int(u) for _, u in segments]
+        if any(v not in (0, 1) for v in self.values):
+            raise ValueError("'piecewise' values must be 0 or 1.")
+        if self.untils != sorted(self.untils):
+            raise ValueError("'piecewise' steps must be increasing.")
+        self.end = self.untils[-1]
+
+    def value(self, t: int) -> int:
+        k = bisect.bisect_right(self.untils, t)
+        return self.values[min(k, len(self.values) - 1)]
+
+
+class FileVector(Stimulus):
+    """'0'/'1' characters at ``offset + t * stride`` of a memory-mapped file."""
+
+    def __init__(self, path: str, offset: int = 0, stride: int = 1):
+        if stride < 1 or offset < 0:
+            raise ValueError("'stride' must be positive and 'offset' non-negative.")
+        self.path = path
+        self.offset = offset
+        self.stride = stride
+        size = os.path.getsize(path)
+        self.end = max(0, (size - offset + stride - 1) // stride)
+        self._map = None
+        if size:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def value(self, t: int) -> Optional[int]:
+        if t >= self.end:
+            return None
+        return 1 if self._map[self.offset + t * self.stride] == 0x31 else 0
+
+    def __getstate__(self):
+        # Re-open the mapping in the receiving process.
+        return {"path": self.path, "offset": self.offset, "stride": self.stride}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def from_spec(spec: Spec, allow_files: bool = True) -> Stimulus:
+    """Builds the stimulus for one input from a string or spec dict."""
+    if isinstance(spec, Stimulus):
+        return spec
+    if isinstance(spec, str):
+        return Pattern(spec)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid stimulus {spec!r}.")
+    if "repeat" in spec:
+        return Repeat(str(spec["repeat"]))
+    if "random" in spec:
+        return RandomBits(int(spec["random"]), float(spec.get("p", 0.5)))
+    if "piecewise" in spec:
+        return Piecewise(spec["piecewise"])
+    if "file" in spec:
+        if not allow_files:
+            raise ValueError("File-backed stimulus is not allowed here.")
+        return FileVector(spec["file"], int(spec.get("offset", 0)), int(spec.get("stride", 1)))
+    raise ValueError(f"Unknown stimulus spec {sorted(spec)}.")
+
+
+def compile_inputs(inputs_map: Mapping[str, Spec], allow_files: bool = True) -> Dict[str, Stimulus]:
+    """Turns an ``inputs_map`` into ``{input name: Stimulus}``, expanding
+    counter groups into one stimulus per bit."""
+    stimuli: Dict[str, Stimulus] = {}
+    for key, spec in inputs_map.items():
+        if isinstance(spec, dict) and "counter" in spec:
+            names = [n.strip() for n in key.split(",") if n.strip()]
+            options = spec["counter"] or {}
+            start, every = int(options.get("start", 0)), int(options.get("every", 1))
+            for bit, name in enumerate(names):
+                stimuli[name] = CounterBit(bit, len(names), start, every)
+        else:
+            stimuli[key] = from_spec(spec, allow_files)
+    return stimuli
+
+
+def settle_point(stimuli: Mapping[str, Stimulus]):
+    """``(end, period)`` for a set of stimuli: from step ``end`` on, all of
+    them repeat with ``period``. ``end`` is None if that never happens."""
+    end, period = 0, 1
+    for stimulus in stimuli.values():
+        if stimulus.end is None:
+            return None, period
+        end = max(end, stimulus.end)
+        period = period * stimulus.period // math.gcd(period, stimulus.period)
+    return end, period
+
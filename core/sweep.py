@@ -0,0 +1,265 @@
+"""
+sweep.py
+
+Runs many independent (netlist, stimulus) scenarios in parallel.
+
+A manifest is a JSON list or a JSONL file of scenarios:
+
+    {"id": "adder-carry", "netlist_file": "adder.net", "steps": 64,
+     "inputs": {"a": "0101", "b": "0011"},
+     "expect": {"s": "0110"}}
+
+``netlist`` may be given inline instead of ``netlist_file`` (paths are
+relative to the manifest). ``expect`` maps signals to the value strings
+they must show from step 0. ASSERTs in the netlist are checked too and
+stop the scenario after ``max_failures`` failures (default 1). A scenario
+with neither only records outputs.
+
+Scenarios are handed out one at a time from a shared queue, so an idle
+worker always takes the next one and long scenarios do not hold up a
+fixed shard. They are started longest first. Each worker keeps
+its parsed circuits, so a netlist shared by many scenarios is parsed
+once per worker. Every result is appended to a JSONL file and flushed as
+soon as it arrives; rerunning a sweep skips the ids already in the file.
+
+Usage:
+    python -m core.sweep manifest.jsonl -o results.jsonl [-j 8]
+"""
+
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from core.circuit import Circuit
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+PASS, FAIL, DONE, ERROR = "pass", "fail", "done", "error"
+
+# Parsed circuits of the current process, most recently used last.
+_circuit_cache: "OrderedDict[tuple, Circuit]" = OrderedDict()
+CACHE_SIZE = 64
+
+
+class SweepSummary:
+    """Counts of one :func:`run_sweep` call."""
+
+    def __init__(self, total: int, skipped: int, counts: Dict[str, int], elapsed: float):
+        self.total = total
+        self.skipped = skipped
+        self.counts = counts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return not self.counts.get(FAIL) and not self.counts.get(ERROR)
+
+    def to_dict(self) -> dict:
+        return {"total": self.total, "skipped": self.skipped, "elapsed": self.elapsed, **self.counts}
+
+    def __repr__(self):
+        parts = ", ".join(f"{k}={v}" for k, v in sorted(self.counts.items()))
+        return f"SweepSummary(total={self.total}, skipped={self.skipped}, {parts})"
+
+
+def load_manifest(path: str) -> List[dict]:
+    """Reads a JSON list or JSONL manifest; gives every scenario an ``id``
+    and makes ``netlist_file`` paths absolute."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        scenarios = json.loads(text)
+    else:
+        scenarios = [json.loads(line) for line in text.splitlines() if line.strip()]
+    base = os.path.dirname(os.path.abspath(path))
+    for k, scenario in enumerate(scenarios):
+        scenario.setdefault("id", str(k))
+        if "netlist_file" in scenario:
+            scenario["netlist_file"] = os.path.join(base, scenario["netlist_file"])
+    return scenarios
+
+
+def iter_results(path: str) -> Iterator[dict]:
+    """Yields the records of a results file, ignoring a truncated last line."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _drop_partial_line(path: str):
+    """Cuts an unfinished last record (from a crash) off a results file."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 65536)
+            f.seek(start)
+            block = f.read(pos - start)
+            if pos == end and block.endswith(b"\n"):
+                return
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+
+def _circuit(scenario: dict) -> Circuit:
+    if "netlist_file" in scenario:
+        path = scenario["netlist_file"]
+        key = ("file", path, os.path.getmtime(path))
+    else:
+        key = ("text", hashlib.sha1(scenario["netlist"].encode("utf-8")).hexdigest())
+    circuit = _circuit_cache.get(key)
+    if circuit is None:
+        if key[0] == "file":
+            with open(key[1], encoding="utf-8") as f:
+                text = f.read()
+        else:
+            text = scenario["netlist"]
+        circuit = NetlistParser(text).parse()
+        _circuit_cache[key] = circuit
+        if len(_circuit_cache) > CACHE_SIZE:
+            _circuit_cache.popitem(last=False)
+    else:
+        _circuit_cache.move_to_end(key)
+    return circuit
+
+
+def run_scenario(scenario: dict, record: str = "outputs") -> dict:
+    """Simulates one scenario and returns its result record.
+
+    :param record: waveforms to include: ``"outputs"``, ``"all"`` or ``"none"``
+    """
+    start = time.perf_counter()
+    result = {"id": scenario["id"], "pid": os.getpid()}
+    try:
+        circuit = _circuit(scenario)
+        steps = scenario["steps"]
+        sim = Simulator(circuit, max_failures=scenario.get("max_failures", 1))
+        waveforms = sim.run(steps, scenario.get("inputs", {}))
+        checks = sim.check_report
+
+        mismatches = []
+        for name, expected in scenario.get("expect", {}).items():
+            if name not in waveforms:
+                mismatches.append({"signal": name, "step": None, "expected": expected, "actual": None})
+                continue
+            actual = "".join(map(str, waveforms[name][:len(expected)]))
+            if actual != expected:
+                step = next((t for t, (a, e) in enumerate(zip(actual, expected)) if a != e), len(actual))
+                mismatches.append({"signal": name, "step": step, "expected": expected, "actual": actual})
+
+        failed = bool(mismatches) or (checks is not None and not checks.passed)
+        if "expect" in scenario or checks is not None:
+            result["status"] = FAIL if failed else PASS
+        else:
+            result["status"] = DONE
+        if mismatches:
+            result["mismatches"] = mismatches
+        if checks is not None:
+            result["checks"] = checks.to_dict()
+        if sim.cycle is not None:
+            result["cycle"] = {"start": sim.cycle[0], "length": sim.cycle[1]}
+        if record != "none":
+            names = [s.name for s in circuit.outputs] if record == "outputs" else list(waveforms)
+            result["waveforms"] = {name: "".join(map(str, waveforms[name])) for name in names}
+    except Exception as e:
+        result["status"] = ERROR
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def _run_task(task) -> dict:
+    scenario, record = task
+    return run_scenario(scenario, record)
+
+
+def run_sweep(
+    scenarios: Iterable[dict],
+    results_path: str,
+    processes: Optional[int] = None,
+    resume: bool = True,
+    record: str = "outputs",
+) -> SweepSummary:
+    """Runs scenarios across a process pool, appending results to ``results_path``.
+
+    :param processes: worker processes; ``1`` runs in the calling process,
+        ``None`` uses one per CPU
+    :param resume: skip scenarios whose id is already in ``results_path``
+    """
+    start = time.perf_counter()
+    scenarios = list(scenarios)
+    for k, scenario in enumerate(scenarios):
+        scenario.setdefault("id", str(k))
+    finished = set()
+    if resume:
+        _drop_partial_line(results_path)
+        finished = {r.get("id") for r in iter_results(results_path)}
+    pending = [s for s in scenarios if s["id"] not in finished]
+    # Longest first, so the slowest scenarios do not start last.
+    pending.sort(key=lambda s: s.get("steps", 0), reverse=True)
+    tasks = [(s, record) for s in pending]
+
+    counts: Dict[str, int] = {}
+    workers = processes or os.cpu_count() or 1
+    with open(results_path, "a" if resume else "w", encoding="utf-8") as out:
+        if workers == 1 or len(tasks) <= 1:
+            results = map(_run_task, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(min(workers, len(tasks)))
+            results = pool.imap_unordered(_run_task, tasks, chunksize=1)
+        try:
+            for result in results:
+                out.write(json.dumps(result, separators=(",", ":")) + "\n")
+                out.flush()
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+    return SweepSummary(len(scenarios), len(scenarios) - len(pending), counts, time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m core.sweep", description=__doc__.split("\n\n")[0])
+    ap.add_argument("manifest", help="JSON or JSONL list of scenarios")
+    ap.add_argument("-o", "--output", default="results.jsonl", help="results file (JSONL, appended)")
+    ap.add_argument("-j", "--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--no-resume", action="store_true", help="overwrite results instead of skipping finished ids")
+    ap.add_argument("--record", choices=("outputs", "all", "none"), default="outputs",
+                    help="waveforms to store per scenario")
+    args = ap.parse_args(argv)
+
+    try:
+        scenarios = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    summary = run_sweep(scenarios, args.output, processes=args.processes,
+                        resume=not args.no_resume, record=args.record)
+    counts = ", ".join(f"{v} {k}" for k, v in sorted(summary.counts.items())) or "nothing to run"
+    print(f"{summary.total} scenarios ({summary.skipped} already done): {counts} in {summary.elapsed:.2f}s")
+    return 0 if summary.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
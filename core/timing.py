@@ -0,0 +1,156 @@
+"""
+timing.py
+
+Gate-delay (timing) simulation.
+
+``Simulator`` is zero-delay: every gate settles within the step. Here each
+gate has a propagation delay in steps, so a change on a gate input shows
+up on its output ``delay`` steps later and glitches and path delays become
+visible in the waveforms. A gate's delay is, in order of preference:
+
+    GATE g1 AND a b y DELAY 2     the instance delay
+    DELAY AND 3                   the default for its type
+    1                             (``default_delay``)
+
+Delays are transport delays: every scheduled output change happens, even
+a pulse shorter than the gate delay.
+
+All signals start at 0 and every gate is evaluated at step 0, so outputs
+that should be 1 (an inverter on a 0 input, say) get there after their
+delay; the first few steps show this start-up transient.
+
+Pending changes live in a timing wheel: a ring of ``2**k`` buckets with
+``2**k`` larger than the longest delay, so an event for step ``t + d``
+always goes into bucket ``(t + d) mod 2**k`` and scheduling and dispatch
+are O(1) per event with no heap and no overflow list. Events that would
+fall after the last step are never observed and are not scheduled, so a
+run shorter than the longest delay needs a wheel of only its own length. Each step only the
+gates reading a changed signal are evaluated (once per step, however many
+of their inputs changed).
+
+Within a step the order matches ``Simulator``: due gate outputs, then
+inputs, clocks and flip-flops (which sample D as it is at that point);
+gate outputs are never applied in the step that computed them.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from core.compiled import CompiledCircuit
+from core.stimulus import Spec, compile_inputs
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+
+def gate_delays(compiled: CompiledCircuit, default_delay: int = 1) -> List[int]:
+    """Delay of each gate in ``compiled.gates``."""
+    defaults = compiled.circuit.gate_delays
+    delays = []
+    for (kind, _, _), gate in zip(compiled.gates, compiled.instances):
+        delay = gate.delay if gate.delay is not None else defaults.get(kind, default_delay)
+        delays.append(max(1, delay))
+    return delays
+
+
+class TimingSimulator:
+    """Event-driven simulator with per-gate delays.
+
+    After :meth:`run`, :attr:`events` holds the number of signal changes
+    that were scheduled, and :attr:`evaluations` the number of gate
+    evaluations.
+    """
+
+    def __init__(self, circuit: Circuit, default_delay: int = 1):
+        if default_delay < 1:
+            raise ValueError("default_delay must be at least 1.")
+        if circuit.optimized:
+            raise ValueError("Optimized circuits cannot be timing-simulated: "
+                             "the optimizer removes and merges gates regardless of their delays.")
+        self.circuit = circuit
+        self.compiled = CompiledCircuit(circuit)
+        self.delays = gate_delays(self.compiled, default_delay)
+        self.functions = self.compiled.make_gate_functions()
+        self.history: Dict[str, List[int]] = {}
+        self.events = 0
+        self.evaluations = 0
+        # No cycle detection: pending events are part of the state.
+        self.cycle = None
+
+    def run(self, steps: int, inputs_map: Dict[str, Spec]) -> Dict[str, List[int]]:
+        compiled = self.compiled
+        n = len(compiled.names)
+        v = [0] * n
+        # Value each signal will have once its pending events are applied.
+        projected = [0] * n
+
+        # Events due after the last step are dropped, so the run length also bounds the wheel.
+        horizon = min(max(self.delays, default=1), steps)
+        size = 1
+        while size <= horizon:
+            size <<= 1
+        wrap = size - 1
+        wheel: List[list] = [[] for _ in range(size)]
+
+        stimuli = compile_inputs(inputs_map)
+        inputs = [(compiled.index[s.name], stimuli[s.name].value) for s in self.circuit.inputs if s.name in stimuli]
+        clocks = [(compiled.index[c.name], c) for c in self.circuit.clocks]
+        flipflops = compiled.flipflops
+        prev_clk: List[Optional[int]] = [None] * len(flipflops)
+        fanout = compiled.fanout
+        gates = compiled.gates
+        functions = self.functions
+        delays = self.delays
+        columns: List[List[int]] = [[] for _ in range(n)]
+        events = evaluations = 0
+
+        # Every gate is evaluated once at step 0 so the network starts consistent.
+        dirty = set(range(len(gates)))
+        for t in range(steps):
+            changed = []
+
+            slot = t & wrap
+            due, wheel[slot] = wheel[slot], []
+            for i, value in due:
+                if v[i] != value:
+                    v[i] = value
+                    changed.append(i)
+
+            for i, value_at in inputs:
+                value = value_at(t)
+                if value is not None and v[i] != value:
+                    v[i] = projected[i] = value
+                    changed.append(i)
+            for i, clock in clocks:
+                clock.update(t)
+                value = clock.get_value()
+                if v[i] != value:
+                    v[i] = projected[i] = value
+                    changed.append(i)
+            for k, (d, clk, q) in enumerate(flipflops):
+                cur = v[clk]
+                if prev_clk[k] == 0 and cur == 1 and v[q] != v[d]:
+                    v[q] = projected[q] = v[d]
+                    changed.append(q)
+                prev_clk[k] = cur
+
+            for i in changed:
+                dirty.update(fanout[i])
+            for gi in dirty:
+                out = gates[gi][2]
+                value = functions[gi](v)
+                if value != projected[out]:
+                    projected[out] = value
+                    due_at = t + delays[gi]
+                    if due_at < steps:
+                        wheel[due_at & wrap].append((out, value))
+                        events += 1
+            evaluations += len(dirty)
+            dirty = set()
+
+            for column, value in zip(columns, v):
+                column.append(value)
+
+        self.events, self.evaluations = events, evaluations
+        self.history = dict(zip(compiled.names, columns))
+        return self.history
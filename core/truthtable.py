@@ -0,0 +1,226 @@
+"""
+truthtable.py
+
+Exhaustive truth-table generation for combinational circuits.
+
+All 2^n assignments of ``circuit.inputs`` are visited in Gray-code order,
+so exactly one input flips between consecutive rows. Each flip is pushed
+through the gate graph by a change-driven engine: only gates in the fan-out
+of a net that actually changed are re-evaluated.
+
+Tables are packed: every output column is an int whose bit ``k`` is the
+output value for the assignment ``k``, where input ``i`` (in declaration
+order) is bit ``i`` of ``k``.
+
+For large n use :func:`iter_truth_table`, which yields the table in
+aligned blocks of rows and never holds more than one block in memory.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from core.compiled import CompiledCircuit
+
+if TYPE_CHECKING:
+    from core.circuit import Circuit
+
+MAX_INPUTS = 24
+
+
+class TruthTableChunk:
+    """Rows ``base .. base + size - 1`` of a truth table."""
+
+    def __init__(self, base: int, size: int, columns: Dict[str, int]):
+        self.base = base
+        self.size = size
+        self.columns = columns
+
+    def to_dict(self) -> dict:
+        return {
+            "base": self.base,
+            "size": self.size,
+            "table": {name: format(col, "x") for name, col in self.columns.items()},
+        }
+
+
+class TruthTable:
+    """A complete packed truth table."""
+
+    def __init__(self, inputs: List[str], outputs: List[str], columns: Dict[str, int]):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.columns = columns
+
+    @property
+    def rows(self) -> int:
+        return 1 << len(self.inputs)
+
+    def value(self, output: str, assignment: Dict[str, int]) -> int:
+        """Looks up one output for a ``{input_name: 0|1}`` assignment."""
+        row = sum(int(assignment[name]) << i for i, name in enumerate(self.inputs))
+        return (self.columns[output] >> row) & 1
+
+    def to_dict(self) -> dict:
+        return {
+            "inputs": self.inputs,
+            "outputs": self.outputs,
+            "rows": self.rows,
+            "table": {name: format(col, "x") for name, col in self.columns.items()},
+        }
+
+
+class _ChangeDrivenEngine:
+    """Incremental evaluator: re-evaluates only gates whose inputs changed."""
+
+    def __init__(self, compiled: CompiledCircuit):
+        self.compiled = compiled
+        self.values = [0] * len(compiled.names)
+        self.functions = compiled.make_gate_functions()
+        self.outputs = [out for _, _, out in compiled.gates]
+        self.fanout = compiled.fanout
+        self.levels = compiled.levels
+        self.buckets: List[List[int]] = [[] for _ in range(max(compiled.levels, default=0) + 1)]
+        self.queued = bytearray(len(compiled.gates))
+        self.evaluations = 0
+        compiled.make_settle()(self.values, 1)
+
+    def set_input(self, signal: int, value: int):
+        values = self.values
+        if values[signal] == value:
+            return
+        values[signal] = value
+        if self.compiled.acyclic:
+            self._propagate_levelized(signal)
+        else:
+            self._propagate_worklist(signal)
+
+    def _propagate_levelized(self, signal: int):
+        buckets, queued, levels, fanout = self.buckets, self.queued, self.levels, self.fanout
+        values, functions, outputs = self.values, self.functions, self.outputs
+        lowest = len(buckets)
+        for gi in fanout[signal]:
+            queued[gi] = 1
+            buckets[levels[gi]].append(gi)
+            lowest = min(lowest, levels[gi])
+        for lvl in range(lowest, len(buckets)):
+            bucket = buckets[lvl]
+            if not bucket:
+                continue
+            for gi in bucket:
+                queued[gi] = 0
+                self.evaluations += 1
+                new = functions[gi](values)
+                out = outputs[gi]
+                if new != values[out]:
+                    values[out] = new
+                    for r in fanout[out]:
+                        if not queued[r]:
+                            queued[r] = 1
+                            buckets[levels[r]].append(r)
+            bucket.clear()
+
+    def _propagate_worklist(self, signal: int):
+        # Combinational loops: FIFO until nothing changes, bounded like Simulator.
+        values, functions, outputs, fanout, queued = self.values, self.functions, self.outputs, self.fanout, self.queued
+        work = list(fanout[signal])
+        for gi in work:
+            queued[gi] = 1
+        budget = (len(self.functions) + 1) * max(len(self.functions), 1)
+        pos = 0
+        while pos < len(work) and budget:
+            gi = work[pos]
+            pos += 1
+            budget -= 1
+            queued[gi] = 0
+            self.evaluations += 1
+            new = functions[gi](values)
+            out = outputs[gi]
+            if new != values[out]:
+                values[out] = new
+                for r in fanout[out]:
+                    if not queued[r]:
+                        queued[r] = 1
+                        work.append(r)
+        for gi in work[pos:]:
+            queued[gi] = 0
+
+
+def _check_inputs(n: int, max_inputs: int):
+    if n > max_inputs:
+        raise ValueError(f"Truth-table mode supports at most {max_inputs} inputs, circuit has {n}.")
+
+
+def _prepare(circuit: Circuit, outputs: Optional[List[str]], max_inputs: int):
+    compiled = CompiledCircuit(circuit)
+    if not compiled.is_combinational:
+        raise ValueError("Truth-table mode requires a combinational circuit (no CLOCK or DFF).")
+    _check_inputs(len(compiled.input_ids), max_inputs)
+    names = outputs if outputs is not None else [s.name for s in circuit.outputs]
+    for name in names:
+        if name not in compiled.index:
+            raise ValueError(f"Unknown signal '{name}'.")
+    return compiled, names
+
+
+def iter_truth_table(
+    circuit: Circuit,
+    outputs: Optional[List[str]] = None,
+    chunk_bits: int = 16,
+    max_inputs: int = MAX_INPUTS,
+) -> Iterator[TruthTableChunk]:
+    """Yields the truth table in blocks of ``2 ** chunk_bits`` rows.
+
+    Blocks are aligned ranges of rows but arrive in Gray-code order of
+    their base index, not in ascending order.
+    """
+    compiled, names = _prepare(circuit, outputs, max_inputs)
+    engine = _ChangeDrivenEngine(compiled)
+    values = engine.values
+    input_ids = compiled.input_ids
+    watch = [compiled.index[name] for name in names]
+
+    n = len(input_ids)
+    k = min(chunk_bits, n)
+    size = 1 << k
+    low_mask = size - 1
+
+    for block in range(1 << (n - k)):
+        buffers = [bytearray((size + 7) // 8) for _ in watch]
+        first = block << k
+        for i in range(first, first + size):
+            if i:
+                bit = (i & -i).bit_length() - 1
+                sig = input_ids[bit]
+                engine.set_input(sig, values[sig] ^ 1)
+            offset = (i ^ (i >> 1)) & low_mask
+            for buf, sig in zip(buffers, watch):
+                if values[sig]:
+                    buf[offset >> 3] |= 1 << (offset & 7)
+        base = (first ^ (first >> 1)) & ~low_mask
+        yield TruthTableChunk(
+            base, size, {name: int.from_bytes(buf, "little") for name, buf in zip(names, buffers)}
+        )
+
+
+def truth_table(
+    circuit: Circuit,
+    outputs: Optional[List[str]] = None,
+    max_inputs: int = MAX_INPUTS,
+) -> TruthTable:
+    """Builds the complete packed truth table of a combinational circuit."""
+    # Checked before the 2**n-bit columns are allocated.
+    _check_inputs(len(circuit.inputs), max_inputs)
+    names = outputs if outputs is not None else [s.name for s in circuit.outputs]
+    rows = 1 << len(circuit.inputs)
+    buffers = {name: bytearray((rows + 7) // 8) for name in names}
+    columns = {name: 0 for name in names}
+    for chunk in iter_truth_table(circuit, outputs=names, max_inputs=max_inputs):
+        for name, col in chunk.columns.items():
+            if chunk.size % 8:
+                columns[name] |= col << chunk.base
+            else:
+                start = chunk.base // 8
+                buffers[name][start:start + chunk.size // 8] = col.to_bytes(chunk.size // 8, "little")
+    for name, buf in buffers.items():
+        columns[name] |= int.from_bytes(buf, "little")
+    return TruthTable([s.name for s in circuit.inputs], names, columns)
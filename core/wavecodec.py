@@ -0,0 +1,245 @@
+"""
+wavecodec.py
+
+Compact binary transport for simulation waveforms.
+
+Layout (all integers are unsigned LEB128 varints):
+
+    magic           b"VWF1"
+    steps
+    signal count
+    per signal:
+        name length, UTF-8 name
+        encoding        one byte, see below
+        payload
+    meta length, UTF-8 JSON object (cycle, activity, ... ; may be empty)
+
+Encodings:
+
+    TRANSITIONS  0/1 signals: initial value byte, transition count, then the
+                 gaps between successive transition steps (first gap from 0)
+    BITPACKED    0/1 signals: ceil(steps / 8) bytes, step k is bit k % 8 of
+                 byte k // 8
+    BYTES        any values below 256: one byte per step
+
+The encoder picks TRANSITIONS or BITPACKED per signal, whichever is
+smaller, so clocks pack to steps/8 bytes and quiet nets to a few bytes.
+frontend/src/waveCodec.js is the matching decoder.
+"""
+
+from __future__ import annotations
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"VWF1"
+MEDIA_TYPE = "application/vnd.vhdlsim.waveforms"
+
+TRANSITIONS = 0
+BITPACKED = 1
+BYTES = 2
+
+_ASCII_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _put_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def transitions(raw: bytes) -> List[int]:
+    """Steps at which a 0/1 byte string changes value."""
+    changes = []
+    find = raw.find
+    current = raw[0] if raw else 0
+    pos = 1
+    while True:
+        pos = find(b"\x00" if current else b"\x01", pos)
+        if pos < 0:
+            return changes
+        changes.append(pos)
+        current ^= 1
+        pos += 1
+
+
+def _bitpack(raw: bytes) -> bytes:
+    nbytes = (len(raw) + 7) // 8
+    if not raw:
+        return b""
+    return int(raw.translate(_ASCII_BITS)[::-1], 2).to_bytes(nbytes, "little")
+
+
+def _unpack_bits(payload: bytes, steps: int) -> bytes:
+    if not steps:
+        return b""
+    bits = bin(int.from_bytes(payload, "little"))[2:].zfill(len(payload) * 8)
+    return bits[::-1][:steps].encode("ascii").translate(bytes.maketrans(b"01", b"\x00\x01"))
+
+
+def encode_signal(out: bytearray, values: Sequence[int], steps: int):
+    """Appends the encoding byte and payload of one signal to ``out``."""
+    raw = bytes(values)
+    if raw.strip(b"\x00\x01"):
+        out.append(BYTES)
+        out += raw
+        return
+    changes = transitions(raw)
+    delta = bytearray()
+    if raw:
+        delta.append(raw[0])
+    _put_varint(delta, len(changes))
+    prev = 0
+    for t in changes:
+        _put_varint(delta, t - prev)
+        prev = t
+    packed_size = (steps + 7) // 8
+    if len(delta) <= packed_size:
+        out.append(TRANSITIONS)
+        out += delta
+    else:
+        out.append(BITPACKED)
+        out += _bitpack(raw)
+
+
+def encode_waveforms(waveforms: Dict[str, Sequence[int]], steps: int,
+                     meta: Optional[dict] = None) -> bytes:
+    """Encodes ``{name: values}`` (each ``steps`` long) plus an optional
+    JSON-serialisable ``meta`` object."""
+    out = bytearray(MAGIC)
+    _put_varint(out, steps)
+    _put_varint(out, len(waveforms))
+    for name, values in waveforms.items():
+        if len(values) != steps:
+            raise ValueError(f"Waveform '{name}' has {len(values)} values, expected {steps}.")
+        encoded = name.encode("utf-8")
+        _put_varint(out, len(encoded))
+        out += encoded
+        encode_signal(out, values, steps)
+    trailer = json.dumps(meta, separators=(",", ":")).encode("utf-8") if meta else b""
+    _put_varint(out, len(trailer))
+    out += trailer
+    return bytes(out)
+
+
+def read_signal(data, pos: int, steps: int):
+    """Reads one encoded signal of ``steps`` values starting at ``data[pos]``
+    (the encoding byte). Returns ``(encoding, payload, next pos)``; the
+    payload is ``(initial value, transition steps)`` for TRANSITIONS and the
+    raw bytes (a slice of ``data``) otherwise."""
+    encoding = data[pos]
+    pos += 1
+    if encoding == BYTES:
+        return encoding, data[pos:pos + steps], pos + steps
+    if encoding == BITPACKED:
+        size = (steps + 7) // 8
+        return encoding, data[pos:pos + size], pos + size
+    if encoding != TRANSITIONS:
+        raise ValueError(f"Unknown waveform encoding {encoding}.")
+    value = 0
+    if steps:
+        value = data[pos]
+        pos += 1
+    n, pos = _get_varint(data, pos)
+    changes = []
+    t = 0
+    for _ in range(n):
+        gap, pos = _get_varint(data, pos)
+        t += gap
+        changes.append(t)
+    return encoding, (value, changes), pos
+
+
+def signal_values(encoding: int, payload, steps: int) -> bytes:
+    """The ``steps`` values of a signal read by :func:`read_signal`, one byte each."""
+    if encoding == BYTES:
+        return bytes(payload)
+    if encoding == BITPACKED:
+        return _unpack_bits(payload, steps)
+    value, changes = payload
+    raw = bytearray()
+    prev = 0
+    for t in changes:
+        raw += bytes([value]) * (t - prev)
+        prev = t
+        value ^= 1
+    raw += bytes([value]) * (steps - prev)
+    return bytes(raw)
+
+
+def signal_segments(encoding: int, payload, steps: int) -> List[Tuple[int, int]]:
+    """``(start step, value)`` runs of a signal read by :func:`read_signal`.
+
+    TRANSITIONS signals are converted without visiting every step, so the
+    cost follows the number of transitions (core.wavediff relies on this).
+    """
+    if encoding == BYTES:
+        return value_segments(payload)
+    if encoding == BITPACKED:
+        raw = _unpack_bits(payload, steps)
+        value, changes = (raw[0] if raw else 0), transitions(raw)
+    else:
+        value, changes = payload
+    runs = [(0, value)] if steps else []
+    for t in changes:
+        value ^= 1
+        runs.append((t, value))
+    return runs
+
+
+def _scan(data: bytes):
+    """Parses a stream without expanding it: returns ``(steps, signals, meta)``
+    with ``signals`` a list of ``(name, encoding, payload)`` as read by
+    :func:`read_signal`."""
+    if data[:4] != MAGIC:
+        raise ValueError("Not a waveform stream (bad magic).")
+    steps, pos = _get_varint(data, 4)
+    count, pos = _get_varint(data, pos)
+    signals = []
+    for _ in range(count):
+        length, pos = _get_varint(data, pos)
+        name = data[pos:pos + length].decode("utf-8")
+        pos += length
+        encoding, payload, pos = read_signal(data, pos, steps)
+        signals.append((name, encoding, payload))
+    length, pos = _get_varint(data, pos)
+    meta = json.loads(data[pos:pos + length]) if length else {}
+    return steps, signals, meta
+
+
+def decode_waveforms(data: bytes) -> Tuple[Dict[str, List[int]], int, dict]:
+    """Inverse of :func:`encode_waveforms`: returns (waveforms, steps, meta)."""
+    steps, signals, meta = _scan(data)
+    waveforms = {name: list(signal_values(encoding, payload, steps)) for name, encoding, payload in signals}
+    return waveforms, steps, meta
+
+
+def decode_segments(data: bytes) -> Tuple[Dict[str, List[Tuple[int, int]]], int, dict]:
+    """Like :func:`decode_waveforms`, but each waveform is a list of
+    ``(start step, value)`` segments, one per run of equal values, built
+    without expanding TRANSITIONS signals."""
+    steps, signals, meta = _scan(data)
+    segments = {name: signal_segments(encoding, payload, steps) for name, encoding, payload in signals}
+    return segments, steps, meta
+
+
+def value_segments(values: Sequence[int]) -> List[Tuple[int, int]]:
+    """``(start step, value)`` per run of equal values."""
+    runs = []
+    last = None
+    for t, value in enumerate(values):
+        if value != last:
+            runs.append((t, value))
+            last = value
+    return runs
@@ -0,0 +1,151 @@
+"""
+wavediff.py
+
+Compares two simulation results without expanding their waveforms.
+
+Each waveform is handled as a list of ``(start step, value)`` segments,
+one per run of equal values: what ``core.wavecodec.decode_segments``
+reads from a binary result, or what the exporter's
+``[{"value", "duration"}]`` runs describe. Two such lists are merged in
+one pass over their change points, so the work per signal is proportional
+to the number of transitions, not to the number of steps, and only the
+intervals where the runs disagree are reported:
+
+    {"signals": {"y": [[12, 40, 1, 0]]}, ...}    # steps 12..39: a=1, b=0
+
+:func:`diff_stores` does the same for two on-disk stores (core.wavestore),
+reading one signal at a time. Signals present in only one result are
+listed separately. When the runs
+have different lengths, only the common prefix is compared.
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.wavecodec import decode_segments, value_segments
+from core.wavestore import WaveStore
+
+Segments = List[Tuple[int, int]]
+# (first step, end step (exclusive), value in a, value in b)
+Interval = Tuple[int, int, int, int]
+
+
+def segments_from_runs(runs: Iterable[dict]) -> Segments:
+    """Segments from the exporter's ``[{"value": v, "duration": n}, ...]``."""
+    segments = []
+    t = 0
+    for run in runs:
+        if not segments or segments[-1][1] != run["value"]:
+            segments.append((t, run["value"]))
+        t += run["duration"]
+    return segments
+
+
+def diff_segments(a: Sequence[Tuple[int, int]], b: Sequence[Tuple[int, int]], steps: int) -> List[Interval]:
+    """Intervals of steps ``0..steps-1`` where the two segment lists differ."""
+    out: List[Interval] = []
+    i = j = 0
+    na, nb = len(a), len(b)
+    t = 0
+    while t < steps and i < na and j < nb:
+        va, vb = a[i][1], b[j][1]
+        end_a = a[i + 1][0] if i + 1 < na else steps
+        end_b = b[j + 1][0] if j + 1 < nb else steps
+        end = min(end_a, end_b, steps)
+        if va != vb:
+            if out and out[-1][1] == t and out[-1][2] == va and out[-1][3] == vb:
+                out[-1] = (out[-1][0], end, va, vb)
+            else:
+                out.append((t, end, va, vb))
+        t = end
+        if end == end_a:
+            i += 1
+        if end == end_b:
+            j += 1
+    return out
+
+
+class WaveDiff:
+    """Result of comparing run ``a`` with run ``b``.
+
+    Attributes:
+        signals:  name -> mismatching intervals, for signals that differ
+        compared: number of signals present in both runs
+        only_a, only_b: signals present in one run only
+    """
+
+    def __init__(self, steps_a: int, steps_b: int, signals: Dict[str, List[Interval]],
+                 compared: int, only_a: List[str], only_b: List[str]):
+        self.steps_a = steps_a
+        self.steps_b = steps_b
+        self.signals = signals
+        self.compared = compared
+        self.only_a = only_a
+        self.only_b = only_b
+
+    @property
+    def identical(self) -> bool:
+        return not self.signals and not self.only_a and not self.only_b and self.steps_a == self.steps_b
+
+    def first_mismatch(self) -> Optional[Tuple[int, str]]:
+        """``(step, signal)`` of the earliest difference, or None."""
+        firsts = [(intervals[0][0], name) for name, intervals in self.signals.items()]
+        return min(firsts) if firsts else None
+
+    def to_dict(self) -> dict:
+        first = self.first_mismatch()
+        return {
+            "identical": self.identical,
+            "steps": {"a": self.steps_a, "b": self.steps_b},
+            "compared": self.compared,
+            "first_mismatch": {"step": first[0], "signal": first[1]} if first else None,
+            "signals": {name: [list(iv) for iv in intervals] for name, intervals in self.signals.items()},
+            "only_a": self.only_a,
+            "only_b": self.only_b,
+        }
+
+
+def _diff(names_a: Iterable[str], names_b: Iterable[str], segments_a: Callable[[str], Segments],
+          segments_b: Callable[[str], Segments], steps_a: int, steps_b: int,
+          signals: Optional[Iterable[str]]) -> WaveDiff:
+    names_a, names_b = set(names_a), set(names_b)
+    if signals is not None:
+        wanted = set(signals)
+        names_a &= wanted
+        names_b &= wanted
+    steps = min(steps_a, steps_b)
+    common = sorted(names_a & names_b)
+    differing = {}
+    for name in common:
+        intervals = diff_segments(segments_a(name), segments_b(name), steps)
+        if intervals:
+            differing[name] = intervals
+    return WaveDiff(steps_a, steps_b, differing, len(common),
+                    sorted(names_a - names_b), sorted(names_b - names_a))
+
+
+def diff_waveforms(a: Dict[str, Segments], b: Dict[str, Segments], steps_a: int, steps_b: int,
+                   signals: Optional[Iterable[str]] = None) -> WaveDiff:
+    """Compares two ``{name: segments}`` runs, optionally restricted to ``signals``."""
+    return _diff(a, b, a.__getitem__, b.__getitem__, steps_a, steps_b, signals)
+
+
+def diff_stores(a: WaveStore, b: WaveStore, signals: Optional[Iterable[str]] = None) -> WaveDiff:
+    """Compares two on-disk stores (core.wavestore), one signal at a time."""
+    return _diff(a.signals, b.signals, a.segments, b.segments, a.steps, b.steps, signals)
+
+
+def diff_streams(data_a: bytes, data_b: bytes, signals: Optional[Iterable[str]] = None) -> WaveDiff:
+    """Compares two results in the binary waveform format (core.wavecodec)."""
+    a, steps_a, _ = decode_segments(data_a)
+    b, steps_b, _ = decode_segments(data_b)
+    return diff_waveforms(a, b, steps_a, steps_b, signals)
+
+
+def diff_values(a: Dict[str, Sequence[int]], b: Dict[str, Sequence[int]],
+                signals: Optional[Iterable[str]] = None) -> WaveDiff:
+    """Compares two plain ``{name: values}`` results (e.g. from ``Simulator.run``)."""
+    steps_a = len(next(iter(a.values()), ()))
+    steps_b = len(next(iter(b.values()), ()))
+    return diff_waveforms({n: value_segments(v) for n, v in a.items()},
+                          {n: value_segments(v) for n, v in b.items()}, steps_a, steps_b, signals)
@@ -0,0 +1,308 @@
+"""
+wavestore.py
+
+On-disk columnar waveform store for results larger than memory.
+
+``Simulator(circuit, recorder=WaveStoreWriter(path))`` appends every step
+to a store directory instead of keeping ``history`` lists, so a run is
+bounded by disk space: the writer only holds the current chunk. Layout:
+
+    meta.json    signal names, chunk size, run metadata, "complete" flag
+    columns.bin  chunk after chunk; in each chunk one column per signal,
+                 encoded like a core.wavecodec signal (transitions,
+                 bit-packed or bytes, whichever is smallest)
+    index.bin    the time index, one row of uint64 per chunk:
+                 steps in the chunk, start offset of each column, end offset
+
+:class:`WaveStore` memory-maps both files. A window query decodes only
+the chunks it overlaps and reads the columns straight from the mapping;
+``segments`` follows the transitions without expanding quiet signals, so
+diffing (core.wavediff.diff_stores) and VCD export stream through a run of
+any length. A finished store reopens as it is, after a restart too.
+"""
+
+from __future__ import annotations
+import bisect
+import json
+import mmap
+import os
+import shutil
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from core.wavecodec import encode_signal, read_signal, signal_segments, signal_values
+
+# Steps per chunk: the writer's buffer is CHUNK_STEPS x signals bytes.
+CHUNK_STEPS = 1 << 16
+
+META_FILE = "meta.json"
+COLUMNS_FILE = "columns.bin"
+INDEX_FILE = "index.bin"
+
+# VCD characters of the 0/1/X/Z value codes (core.fourstate).
+_VCD_VALUES = "01xz"
+
+
+class WaveStoreWriter:
+    """Recorder that writes a run into the store directory ``path``.
+
+    The simulator calls :meth:`start` with the signal names, :meth:`append`
+    once per step and :meth:`close` at the end. :meth:`row` and
+    :meth:`repeat` let it detect and replay cycles without a history.
+    An existing store at ``path`` is replaced. ``meta`` is stored with the
+    run, merged with what the simulator adds on closing.
+    """
+
+    def __init__(self, path: str, chunk_steps: int = CHUNK_STEPS, meta: Optional[dict] = None):
+        if chunk_steps < 1:
+            raise ValueError("chunk_steps must be positive.")
+        self.path = path
+        self.chunk_steps = chunk_steps
+        self.meta = dict(meta or {})
+        self.names: List[str] = []
+        self.steps = 0
+        self._rows = bytearray()  # the current chunk, one row of len(names) bytes per step
+        self._pending = 0
+        self._flushed = 0
+        self._size = 0
+        self._columns = None
+        self._index = None
+
+    def start(self, names: Sequence[str]):
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(self.path)
+        self.names = list(names)
+        self.steps = self._pending = self._flushed = self._size = 0
+        self._rows = bytearray()
+        self._write_meta({}, complete=False)
+        self._columns = open(os.path.join(self.path, COLUMNS_FILE), "wb")
+        self._index = open(os.path.join(self.path, INDEX_FILE), "wb")
+
+    def append(self, values: Sequence[int]):
+        """Records the values of all signals at the next step."""
+        self._rows += bytes(values)
+        self._pending += 1
+        self.steps += 1
+        if self._pending == self.chunk_steps:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered steps as one chunk."""
+        n = self._pending
+        if not n:
+            return
+        width = len(self.names)
+        rows = self._rows
+        row = array("Q", [n])
+        for k in range(width):
+            row.append(self._size)
+            out = bytearray()
+            encode_signal(out, rows[k::width], n)
+            self._columns.write(out)
+            self._size += len(out)
+        row.append(self._size)
+        self._columns.flush()
+        self._index.write(row.tobytes())
+        self._index.flush()
+        self._flushed += n
+        self._rows = bytearray()
+        self._pending = 0
+
+    def row(self, t: int) -> List[int]:
+        """Values recorded at step ``t``."""
+        if t >= self._flushed:
+            width = len(self.names)
+            k = (t - self._flushed) * width
+            return list(self._rows[k:k + width])
+        with WaveStore(self.path) as store:
+            return store.row(t)
+
+    def repeat(self, start: int, end: int, total: int):
+        """Appends copies of steps ``start..end-1`` until ``total`` steps are recorded."""
+        self.flush()
+        width = len(self.names)
+        with WaveStore(self.path) as store:
+            t = start
+            while self.steps < total:
+                n = min(end - t, total - self.steps, self.chunk_steps - self._pending)
+                block = bytearray(n * width)
+                for k in range(width):
+                    block[k::width] = store.window_bytes(k, t, t + n)
+                self._rows += block
+                self._pending += n
+                self.steps += n
+                if self._pending == self.chunk_steps:
+                    self.flush()
+                t = start if t + n == end else t + n
+
+    def close(self, meta: Optional[dict] = None):
+        """Flushes the last chunk and marks the store complete."""
+        self.flush()
+        for f in (self._columns, self._index):
+            if f is not None:
+                f.close()
+        self._columns = self._index = None
+        self._write_meta({**self.meta, **(meta or {})}, complete=True)
+
+    def _write_meta(self, meta: dict, complete: bool):
+        blob = {"signals": self.names, "chunk_steps": self.chunk_steps, "steps": self.steps,
+                "complete": complete, "meta": meta}
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(blob, f)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+
+def _map(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class WaveStore:
+    """Read-only, memory-mapped view of a store written by :class:`WaveStoreWriter`.
+
+    Attributes:
+        signals: signal names, in column order
+        steps:   recorded steps (from the index, so a store whose run was
+                 interrupted opens up to its last flushed chunk)
+        meta:    run metadata passed to ``close`` (cycle, ...)
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            info = json.load(f)
+        self.path = path
+        self.signals: List[str] = info["signals"]
+        self.meta: dict = info.get("meta", {})
+        self.complete: bool = info.get("complete", False)
+        self._column_of = {name: k for k, name in enumerate(self.signals)}
+        self._data_map = _map(os.path.join(path, COLUMNS_FILE))
+        self._index_map = _map(os.path.join(path, INDEX_FILE))
+        self._data = memoryview(self._data_map) if self._data_map is not None else memoryview(b"")
+        width = len(self.signals) + 2
+        index = memoryview(self._index_map).cast("Q") if self._index_map is not None else memoryview(b"").cast("Q")
+        self._index = index
+        self._width = width
+        chunks = len(index) // width
+        # First step of every chunk, plus the total.
+        self._starts = [0]
+        for c in range(chunks):
+            self._starts.append(self._starts[-1] + index[c * width])
+        self.steps = self._starts[-1]
+
+    def close(self):
+        self._index.release()
+        self._data.release()
+        for m in (self._data_map, self._index_map):
+            if m is not None:
+                m.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, name: str) -> int:
+        k = self._column_of.get(name)
+        if k is None:
+            raise KeyError(f"Unknown signal '{name}'.")
+        return k
+
+    def _chunks(self, start: int, end: int) -> range:
+        first = bisect.bisect_right(self._starts, start) - 1
+        last = bisect.bisect_left(self._starts, end)
+        return range(max(first, 0), min(last, len(self._starts) - 1))
+
+    def _read(self, chunk: int, k: int):
+        """``(encoding, payload, steps)`` of column ``k`` in ``chunk``."""
+        row = chunk * self._width
+        n = self._index[row]
+        encoding, payload, _ = read_signal(self._data, self._index[row + 1 + k], n)
+        return encoding, payload, n
+
+    def window_bytes(self, k: int, start: int, end: int) -> bytes:
+        """Values of column ``k`` at steps ``start..end-1``, one byte each."""
+        start, end = max(start, 0), min(end, self.steps)
+        out = bytearray()
+        for c in self._chunks(start, end):
+            encoding, payload, n = self._read(c, k)
+            base = self._starts[c]
+            values = signal_values(encoding, payload, n)
+            out += values[max(start - base, 0):end - base]
+        return bytes(out)
+
+    def window(self, name: str, start: int = 0, end: Optional[int] = None) -> List[int]:
+        """Values of signal ``name`` at steps ``start..end-1``."""
+        return list(self.window_bytes(self.column(name), start, self.steps if end is None else end))
+
+    def waveforms(self, names: Optional[Iterable[str]] = None, start: int = 0,
+                  end: Optional[int] = None) -> Dict[str, List[int]]:
+        """``{name: values}`` for a window, like ``Simulator.history``."""
+        return {name: self.window(name, start, end) for name in (self.signals if names is None else names)}
+
+    def row(self, t: int) -> List[int]:
+        """Values of all signals at step ``t``."""
+        return [self.window_bytes(k, t, t + 1)[0] for k in range(len(self.signals))]
+
+    def segments(self, name: str, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+        """``(start step, value)`` runs of ``name`` within the window, by absolute step."""
+        k = self.column(name)
+        end = self.steps if end is None else min(end, self.steps)
+        runs: List[Tuple[int, int]] = []
+        for c in self._chunks(start, end):
+            encoding, payload, n = self._read(c, k)
+            base = self._starts[c]
+            for t, value in signal_segments(encoding, payload, n):
+                t += base
+                if t >= end:
+                    break
+                t = max(t, start)
+                if runs and runs[-1][0] == t:
+                    runs[-1] = (t, value)
+                elif not runs or runs[-1][1] != value:
+                    runs.append((t, value))
+        return runs
+
+    def write_vcd(self, out: TextIO, names: Optional[Iterable[str]] = None, scope: str = "top",
+                  timescale: str = "1ns"):
+        """Writes the run as a Value Change Dump, one chunk at a time."""
+        names = list(self.signals if names is None else names)
+        columns = [self.column(name) for name in names]
+        codes = [_vcd_code(i) for i in range(len(names))]
+        out.write(f"$timescale {timescale} $end\n$scope module {scope} $end\n")
+        for name, code in zip(names, codes):
+            out.write(f"$var wire 1 {code} {name} $end\n")
+        out.write("$upscope $end\n$enddefinitions $end\n")
+        last: List[Optional[int]] = [None] * len(names)
+        for c in range(len(self._starts) - 1):
+            base = self._starts[c]
+            changes = []
+            for i, k in enumerate(columns):
+                encoding, payload, n = self._read(c, k)
+                for t, value in signal_segments(encoding, payload, n):
+                    if value != last[i]:
+                        changes.append((base + t, i, value))
+                        last[i] = value
+            changes.sort()
+            time = None
+            for t, i, value in changes:
+                if t != time:
+                    out.write(f"#{t}\n")
+                    time = t
+                out.write(f"{_VCD_VALUES[value] if value < 4 else 'x'}{codes[i]}\n")
+        out.write(f"#{self.steps}\n")
+
+
+def _vcd_code(i: int) -> str:
+    """Short VCD identifier from the printable characters ``!`` to ``~``."""
+    code = ""
+    while True:
+        i, r = divmod(i, 94)
+        code += chr(33 + r)
+        if not i:
+            return code
+        i -= 1
@@ -13,6 +13,7 @@ import { StreamLanguage } from '@codemirror/language';
 import { vhdl } from '@codemirror/legacy-modes/mode/vhdl';
 import { autocompletion } from '@codemirror/autocomplete';
 import { CIRCUIT_TEMPLATES } from './CircuitTemplates';
+import { decodeWaveforms, WAVEFORM_MEDIA_TYPE } from './waveCodec';
 
 const API_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
 
@@ -61,7 +62,7 @@ const validateNetlist = (text) => {
         if (args.length < 4) errors.push({ lineno, message: "Incomplete GATE definition." });
         else {
           const gateType = args[1]?.toUpperCase();
-          const expectedLen = gateType === "NOT" ? 4 : 5;
+          const expectedLen = gateType === "NOT" || gateType === "BUF" ? 4 : 5;
           if (args.length !== expectedLen) errors.push({ lineno, message: `Incorrect number of arguments for a ${gateType} gate.` });
           // Check if signals are declared (simple check)
           args.slice(2).forEach(name => {
@@ -83,7 +84,7 @@ const validateNetlist = (text) => {
 
 // Basic VHDL-like syntax highlighting for the netlist
 languages.netlist = {
-  keyword: /\b(CIRCUIT|INPUT|OUTPUT|SIGNAL|CLOCK|GATE|PERIOD|DUTY|NAND|NOR|XOR|XNOR|AND|OR|NOT)\b/i,
+  keyword: /\b(CIRCUIT|INPUT|OUTPUT|SIGNAL|CLOCK|GATE|PERIOD|DUTY|NAND|NOR|XOR|XNOR|AND|OR|NOT|BUF)\b/i,
   number: /\b\d+(\.\d+)?\b/,
   comment: /--.*/,
   "string-literal": {
@@ -94,7 +95,7 @@ languages.netlist = {
 
 // --- Suggestion Engine ---
 const KEYWORDS = ["CIRCUIT", "INPUT", "OUTPUT", "SIGNAL", "CLOCK", "GATE", "PERIOD", "DUTY", "DFF"];
-const GATE_TYPES = ["NAND", "NOR", "XOR", "XNOR", "AND", "OR", "NOT"];
+const GATE_TYPES = ["NAND", "NOR", "XOR", "XNOR", "AND", "OR", "NOT", "BUF"];
 
 const getSuggestions = (line, word, declaredSignals) => {
   const upperLine = line.toUpperCase();
@@ -118,7 +119,7 @@ const customVHDL = {
 };
 const completionKeywords = [
   "CIRCUIT", "INPUT", "OUTPUT", "SIGNAL", "GATE", "CLOCK", "DFF",
-   "PERIOD", "DUTY", "NAND", "NOR", "XNOR" , "AND", "OR", "NOT", "XOR"
+   "PERIOD", "DUTY", "NAND", "NOR", "XNOR" , "AND", "OR", "NOT", "XOR", "BUF"
 ].map(label => ({ label, type: "keyword" }));
 const myCompletions = (context) => {
   let word = context.matchBefore(/\w*/);
@@ -304,10 +305,13 @@ export default function App() {
     try {
       const res = await fetch(`${API_URL}/simulate`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', 'Accept': `${WAVEFORM_MEDIA_TYPE}, application/json` },
         body: JSON.stringify(requestBody),
       });
-      const data = await res.json();
+      // Waveforms arrive as a compact binary stream; errors are still JSON.
+      const data = (res.headers.get('Content-Type') || '').startsWith(WAVEFORM_MEDIA_TYPE)
+        ? decodeWaveforms(await res.arrayBuffer())
+        : await res.json();
       if (!res.ok) throw new Error(data.detail || `HTTP error! status: ${res.status}`);
       if (!data || !data.waveforms || Object.keys(data.waveforms).length === 0) throw new Error('No waveform data received');
       setWaveforms(data.waveforms);
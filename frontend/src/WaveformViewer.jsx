@@ -1,5 +1,10 @@
 import React, { useRef, useState, useEffect } from 'react';
 
+// Four-state values (core/fourstate.py): 2 = X, 3 = Z, drawn at mid level.
+const LABELS = ['0', '1', 'X', 'Z'];
+const level = (value) => (value > 1 ? 0.5 : value);
+const label = (value) => LABELS[value] ?? value.toString();
+
 const WaveformViewer = ({ waveforms, steps, stepWidth = 40, showGrid = true, compressed = false }) => {
   const canvasRef = useRef(null);
   const containerRef = useRef(null);
@@ -106,7 +111,7 @@ const WaveformViewer = ({ waveforms, steps, stepWidth = 40, showGrid = true, com
       ctx.fillStyle = '#ffffff';
       ctx.font = '12px monospace';
       ctx.textAlign = 'center';
-      ctx.fillText(currentValue.toString(), padding - 30, y - 10);
+      ctx.fillText(label(currentValue), padding - 30, y - 10);
 
       // Draw waveform
       ctx.beginPath();
@@ -114,19 +119,19 @@ const WaveformViewer = ({ waveforms, steps, stepWidth = 40, showGrid = true, com
       ctx.lineWidth = 2;
 
       let lastValue = values[0];
-      ctx.moveTo(padding, y - (lastValue * 20));
+      ctx.moveTo(padding, y - (level(lastValue) * 20));
 
       values.forEach((value, i) => {
         const x = padding + (i * stepWidth);
         
         // Draw vertical transition if value changed
         if (value !== lastValue) {
-          ctx.lineTo(x, y - (lastValue * 20));
-          ctx.lineTo(x, y - (value * 20));
+          ctx.lineTo(x, y - (level(lastValue) * 20));
+          ctx.lineTo(x, y - (level(value) * 20));
         }
         
         // Draw horizontal line
-        ctx.lineTo(x + stepWidth, y - (value * 20));
+        ctx.lineTo(x + stepWidth, y - (level(value) * 20));
         lastValue = value;
       });
       ctx.stroke();
@@ -158,7 +163,7 @@ const WaveformViewer = ({ waveforms, steps, stepWidth = 40, showGrid = true, com
           ctx.fillStyle = '#ffffff';
           ctx.font = '12px monospace';
           ctx.textAlign = 'center';
-          ctx.fillText(value.toString(), padding - 30, y - 10);
+          ctx.fillText(label(value), padding - 30, y - 10);
         });
       }
     }
@@ -0,0 +1,79 @@
+/**
+ * Decoder for the binary waveform stream produced by core/wavecodec.py.
+ * See that module for the layout; integers are unsigned LEB128 varints.
+ */
+
+export const WAVEFORM_MEDIA_TYPE = 'application/vnd.vhdlsim.waveforms';
+
+const TRANSITIONS = 0;
+const BITPACKED = 1;
+const BYTES = 2;
+
+const utf8 = new TextDecoder();
+
+/**
+ * Decodes a waveform stream.
+ * @param {ArrayBuffer} buffer - The response body.
+ * @returns {{steps: number, waveforms: Object<string, Uint8Array>, meta: object}}
+ */
+export function decodeWaveforms(buffer) {
+  const bytes = new Uint8Array(buffer);
+  if (utf8.decode(bytes.subarray(0, 4)) !== 'VWF1') {
+    throw new Error('Not a waveform stream');
+  }
+  let pos = 4;
+
+  const varint = () => {
+    let n = 0;
+    let scale = 1;
+    for (;;) {
+      const b = bytes[pos++];
+      // Multiplication instead of shifts keeps values above 2^31 exact.
+      n += (b & 0x7f) * scale;
+      if (b < 0x80) return n;
+      scale *= 128;
+    }
+  };
+
+  const steps = varint();
+  const count = varint();
+  const waveforms = {};
+
+  for (let s = 0; s < count; s++) {
+    const nameLength = varint();
+    const name = utf8.decode(bytes.subarray(pos, pos + nameLength));
+    pos += nameLength;
+    const encoding = bytes[pos++];
+    let values;
+
+    if (encoding === BYTES) {
+      values = bytes.slice(pos, pos + steps);
+      pos += steps;
+    } else if (encoding === BITPACKED) {
+      values = new Uint8Array(steps);
+      for (let t = 0; t < steps; t++) {
+        values[t] = (bytes[pos + (t >> 3)] >> (t & 7)) & 1;
+      }
+      pos += (steps + 7) >> 3;
+    } else if (encoding === TRANSITIONS) {
+      values = new Uint8Array(steps);
+      let value = steps ? bytes[pos++] : 0;
+      const n = varint();
+      let t = 0;
+      for (let k = 0; k < n; k++) {
+        const next = t + varint();
+        values.fill(value, t, next);
+        t = next;
+        value ^= 1;
+      }
+      values.fill(value, t, steps);
+    } else {
+      throw new Error(`Unknown waveform encoding ${encoding}`);
+    }
+    waveforms[name] = values;
+  }
+
+  const metaLength = varint();
+  const meta = metaLength ? JSON.parse(utf8.decode(bytes.subarray(pos, pos + metaLength))) : {};
+  return { steps, waveforms, meta };
+}
@@ -0,0 +1,60 @@
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+HALF_ADDER = """
+CIRCUIT half_adder
+INPUT a b
+OUTPUT s c
+GATE g1 XOR a b s
+GATE g2 AND a b c
+"""
+
+DIVIDER = """
+CIRCUIT divider
+OUTPUT q
+SIGNAL d
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE inv NOT q d
+DFF ff d clk q
+"""
+
+
+def _toggles(values):
+    return sum(1 for a, b in zip(values, values[1:]) if a != b)
+
+
+def test_counts_match_waveforms():
+    sim = Simulator(NetlistParser(HALF_ADDER).parse(), activity=True)
+    waveforms = sim.run(8, {"a": "01011010", "b": "00110011"})
+    stats = sim.activity
+    for name, values in waveforms.items():
+        k = stats.signals.index(name)
+        assert stats.toggles[k] == _toggles(values)
+        assert stats.ones[k] == sum(values)
+    data = stats.to_dict()
+    assert data["steps"] == 8 and data["passes"] == 8
+    assert data["gates"]["g1"] == {"output_toggles": _toggles(waveforms["s"])}
+    assert data["hottest"][0] == "a"
+
+
+def test_stats_only_run_matches_recorded_run():
+    circuit = NetlistParser(HALF_ADDER).parse()
+    inputs = {"a": "0110", "b": "1100"}
+    full = Simulator(circuit, activity=True)
+    full.run(4, inputs)
+    lean = Simulator(circuit, activity=True)
+    assert lean.run(4, inputs, record=False) == {}
+    assert lean.activity.to_dict() == full.activity.to_dict()
+
+
+def test_cycle_shortcut_still_counts_every_step():
+    circuit = NetlistParser(DIVIDER).parse()
+    fast = Simulator(circuit, activity=True)
+    waveforms = fast.run(100, {})
+    assert fast.cycle is not None
+    slow = Simulator(circuit, detect_cycles=False, activity=True)
+    slow.run(100, {})
+    assert fast.activity.steps == 100
+    assert fast.activity.toggles == slow.activity.toggles
+    assert fast.activity.ones == slow.activity.ones
+    assert fast.activity.toggles[fast.activity.signals.index("q")] == _toggles(waveforms["q"])
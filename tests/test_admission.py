@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+from admission import (FAST, SLOW, AdmissionController, AdmissionQueueFull,  # noqa: E402
+                       OverBudget, estimate_cost, estimate_equivalence_cost,
+                       estimate_truth_table_cost)
+from metrics import Metrics  # noqa: E402
+from core.parser import NetlistParser  # noqa: E402
+
+HALF_ADDER = """
+CIRCUIT ha
+INPUT a b
+OUTPUT s c
+GATE g1 XOR a b s
+GATE g2 AND a b c
+"""
+
+
+def test_estimate_cost_counts_gates_and_recorded_signals():
+    circuit = NetlistParser(HALF_ADDER).parse()
+    assert estimate_cost(circuit, 100) == 100 * (2 + 4)
+    assert estimate_cost(circuit, 100, record=False) == 100 * 2
+
+
+def test_timing_cost_includes_the_longest_delay():
+    circuit = NetlistParser(HALF_ADDER.replace("GATE g2 AND a b c", "GATE g2 AND a b c DELAY 300")).parse()
+    assert estimate_cost(circuit, 1000, timing=True) == 1000 * (2 + 4) + 300
+    assert estimate_cost(circuit, 10, timing=True) == 10 * (2 + 4) + 10
+
+
+def test_lanes_and_budget():
+    controller = AdmissionController(fast_cost=100, max_cost=1000)
+    assert controller.lane(100) == FAST
+    assert controller.lane(101) == SLOW
+    with pytest.raises(OverBudget, match="1001"):
+        asyncio.run(controller.acquire(1001, "a"))
+    assert controller.rejected["over_budget"] == 1
+
+
+def test_fast_lane_does_not_wait_behind_slow_requests():
+    async def scenario():
+        controller = AdmissionController(fast_cost=10, max_cost=1000, fast_slots=1, slow_slots=1)
+        slow = await controller.acquire(500, "batch")
+        queued = asyncio.ensure_future(controller.acquire(500, "batch"))
+        await asyncio.sleep(0)
+        fast = await asyncio.wait_for(controller.acquire(5, "editor"), timeout=1)
+        assert fast.lane == FAST and fast.wait < 1
+        assert controller.depths()[SLOW] == {"running": 1, "queued": 1, "clients": 1}
+        controller.release(fast)
+        controller.release(slow)
+        controller.release(await queued)
+        assert controller.depths()[SLOW]["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_lane_is_shared_round_robin_per_client():
+    async def scenario():
+        controller = AdmissionController(fast_cost=0, max_cost=1000, slow_slots=1)
+        order = []
+
+        async def run(client, n):
+            ticket = await controller.acquire(100, client)
+            order.append(f"{client}{n}")
+            await asyncio.sleep(0)
+            controller.release(ticket)
+
+        first = await controller.acquire(100, "hog")
+        tasks = [asyncio.ensure_future(run("hog", n)) for n in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(run("user", 0)))
+        await asyncio.sleep(0)
+        controller.release(first)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["hog0", "user0", "hog1", "hog2"]
+
+
+def test_queue_limit_and_cancellation():
+    async def scenario():
+        controller = AdmissionController(fast_cost=0, max_cost=1000, slow_slots=1, max_queued=1)
+        running = await controller.acquire(100, "a")
+        waiter = asyncio.ensure_future(controller.acquire(100, "b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionQueueFull):
+            await controller.acquire(100, "c")
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.depths()[SLOW] == {"running": 1, "queued": 0, "clients": 0}
+        controller.release(running)
+        assert controller.depths()[SLOW]["running"] == 0
+        return controller.rejected
+
+    assert asyncio.run(scenario()) == {"over_budget": 0, "queue_full": 1}
+
+
+def test_metrics_render_admission_lanes():
+    metrics = Metrics()
+    metrics.admission = AdmissionController(fast_cost=10, max_cost=100)
+    metrics.observe_admission(FAST, 0.0, 0.003)
+    text = metrics.render()
+    assert 'vhdlsim_admission_latency_seconds_bucket{lane="fast",le="0.005"} 1' in text
+    assert 'vhdlsim_admission_requests{lane="slow",state="queued"} 0' in text
+    assert 'vhdlsim_admission_rejected_total{reason="queue_full"} 0' in text
+
+
+def test_equivalence_cost_covers_exhaustive_runs():
+    circuit = NetlistParser(HALF_ADDER).parse()
+    assert estimate_equivalence_cost(circuit, circuit, 6400) == 100 * 4
+    wide = NetlistParser("CIRCUIT w\nINPUT " + " ".join(f"i{k}" for k in range(16))
+                         + "\nOUTPUT y\nGATE g1 AND i0 i1 y\n").parse()
+    assert estimate_equivalence_cost(wide, wide, 1) == (1 << 16) // 64 * 2
+
+
+def test_truth_table_cost_is_rows_times_gates():
+    circuit = NetlistParser(HALF_ADDER).parse()
+    assert estimate_truth_table_cost(circuit) == 4 * 2
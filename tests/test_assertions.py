@@ -0,0 +1,104 @@
+import pytest
+
+from core.assertions import Check, translate
+from core.optimizer import optimize_circuit
+from core.parser import NetlistParseError, NetlistParser
+from core.simulator import Simulator
+
+COUNTER = """
+CIRCUIT counter
+INPUT en
+OUTPUT q0 q1
+SIGNAL d0 d1 c0
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE g1 XOR q0 en d0
+GATE g2 AND q0 en c0
+GATE g3 XOR q1 c0 d1
+DFF f0 d0 clk q0
+DFF f1 d1 clk q1
+"""
+
+
+def _sim(extra, steps, inputs, **kwargs):
+    circuit = NetlistParser(COUNTER + extra).parse()
+    sim = Simulator(circuit, **kwargs)
+    return sim, sim.run(steps, inputs)
+
+
+@pytest.mark.parametrize("text, values, expected", [
+    ("a & b | c", {"a": 1, "b": 0, "c": 1}, 1),
+    ("a & (b | c)", {"a": 0, "b": 0, "c": 1}, 0),
+    ("!a ^ b", {"a": 1, "b": 1}, 1),
+    ("a == b & c", {"a": 1, "b": 1, "c": 0}, 0),
+    ("~(a != 1)", {"a": 1}, 1),
+])
+def test_expression_precedence(text, values, expected):
+    source, names = translate(text)
+    assert names == set(values)
+    assert int(eval(source, {}, values)) == expected
+
+
+def test_passing_assertions_run_to_the_end():
+    sim, wave = _sim("ASSERT never_both_when_off !(q0 & q1 & !en)\n", 40, {"en": "1" * 40})
+    assert len(wave["q0"]) == 40
+    assert sim.check_report.passed
+    assert sim.check_report.evaluations == 40
+    assert sim.check_report.stopped_at is None
+
+
+def test_stops_at_first_failure():
+    sim, wave = _sim("ASSERT small !q1\n", 10_000, {"en": "1"})
+    report = sim.check_report
+    assert report.stopped_at == 3      # q1 first rises at the second clock edge
+    assert len(wave["q1"]) == 4
+    assert report.failures == [{"check": "small", "step": 3, "values": {"q1": 1}}]
+
+
+def test_max_failures_and_zero():
+    sim, _ = _sim("ASSERT small !q1\n", 64, {"en": "1"}, max_failures=3)
+    assert sim.check_report.total_failures == 3
+    sim, wave = _sim("ASSERT small !q1\n", 64, {"en": "1"}, max_failures=0)
+    assert len(wave["q1"]) == 64
+    assert sim.check_report.total_failures == wave["q1"].count(1)
+
+
+def test_next_cycle_implication():
+    # With en held, q0 toggles on every edge.
+    sim, _ = _sim("ASSERT toggles @clk q0 |=> !q0\n", 64, {"en": "1"}, max_failures=0)
+    assert sim.check_report.passed
+    sim, _ = _sim("ASSERT toggles @clk q0 |=> !q0\n", 64, {"en": "110"}, max_failures=0)
+    # q0 rises at the edge at step 1 and then holds once en drops.
+    failure = sim.check_report.failures[0]
+    assert (failure["triggered_at"], failure["step"]) == (1, 3)
+    assert failure["values"]["q0"] == 1
+
+
+def test_monitor_counts_edges():
+    sim, wave = _sim("MONITOR wrap @clk q0 & q1\n", 64, {"en": "1"})
+    monitor = sim.check_report.to_dict()["monitors"]["wrap"]
+    assert monitor["count"] == 8
+    assert all(wave["q0"][t] and wave["q1"][t] and wave["clk"][t] for t in monitor["steps"])
+
+
+def test_api_checks_and_optimizer_keeps_signals():
+    circuit = NetlistParser(COUNTER).parse()
+    circuit.add_check(Check("carry", "!c0"))
+    optimize_circuit(circuit)
+    assert "c0" in circuit.signals
+    sim = Simulator(circuit, checks=[Check("q", "!q0 | q0", kind="MONITOR")])
+    sim.run(16, {"en": "1"})
+    assert not sim.check_report.passed
+    assert sim.check_report.hit_counts["q"] == sim.check_report.steps
+
+
+@pytest.mark.parametrize("line", [
+    "ASSERT bad q0 &",
+    "ASSERT bad nosuch",
+    "ASSERT bad @nosuch q0",
+    "ASSERT bad q0 |=> q1",
+    "MONITOR",
+    "ASSERT bad q0 + q1",
+])
+def test_bad_checks(line):
+    with pytest.raises(NetlistParseError):
+        NetlistParser(COUNTER + line + "\n").parse()
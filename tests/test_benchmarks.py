@@ -0,0 +1,54 @@
+import random
+
+from benchmarks import generators
+from benchmarks.run import compare, run_case
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+
+def _bus(waveforms, prefix, width, t):
+    return sum(waveforms[f"{prefix}{i}"][t] << i for i in range(width))
+
+
+def test_adder_and_multiplier_generators_compute_correctly():
+    rng = random.Random(5)
+    pairs = [(rng.randrange(16), rng.randrange(16)) for _ in range(20)]
+    inputs = {}
+    for i in range(4):
+        inputs[f"a{i}"] = "".join(str((x >> i) & 1) for x, _ in pairs)
+        inputs[f"b{i}"] = "".join(str((y >> i) & 1) for _, y in pairs)
+
+    adder = Simulator(NetlistParser(generators.ripple_carry_adder(4)).parse()).run(len(pairs), inputs)
+    mul = Simulator(NetlistParser(generators.array_multiplier(4)).parse()).run(len(pairs), inputs)
+    for t, (x, y) in enumerate(pairs):
+        assert _bus(adder, "s", 4, t) + (adder["cout"][t] << 4) == x + y
+        assert _bus(mul, "p", 8, t) == x * y
+
+
+def test_counter_and_random_dag_generators():
+    counter = Simulator(NetlistParser(generators.counter_chain(3)).parse()).run(16, {})
+    assert [_bus(counter, "q", 3, t) for t in range(1, 16, 2)] == [1, 2, 3, 4, 5, 6, 7, 0]
+
+    dag = generators.random_dag(500, seed=1)
+    assert generators.gate_count(dag) == 500 + 16
+    assert len(NetlistParser(dag).parse().gates) == 516
+
+
+def test_lfsr_case_scales_its_gates():
+    netlist = generators.dense_lfsr(100)
+    assert generators.gate_count(netlist) == 100
+    waveforms = Simulator(NetlistParser(netlist).parse(), detect_cycles=False).run(64, {})
+    states = {tuple(waveforms[f"q{i}"][t] for i in range(101)) for t in range(1, 64, 2)}
+    assert len(states) == 32
+
+
+def test_run_case_and_baseline_comparison():
+    case = {"generator": "adder", "size": 20, "steps": 4, "repeat": 1, "e2e": False}
+    result = run_case(case)
+    assert result["case"] == "adder-20"
+    assert result["gates"] == 20
+    assert result["gate_steps_per_s"] > 0
+
+    slower = dict(result, simulate_s=result["simulate_s"] * 3)
+    assert compare([slower], {"results": [result]}, tolerance=0.5) != []
+    assert compare([result], {"results": [result]}, tolerance=0.5) == []
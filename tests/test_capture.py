@@ -0,0 +1,78 @@
+import pytest
+
+from core.capture import Capture
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+COUNTER = """
+CIRCUIT counter2
+INPUT en
+OUTPUT q0 q1
+SIGNAL d0 d1 c1
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE g1 XOR q0 en d0
+GATE g2 AND q0 en c1
+GATE g3 XOR q1 c1 d1
+DFF ff0 d0 clk q0
+DFF ff1 d1 clk q1
+"""
+
+
+def run(capture, steps=200, inputs=None):
+    sim = Simulator(NetlistParser(COUNTER).parse(), recorder=capture)
+    assert sim.run(steps, inputs or {"en": "1"}) == {}
+    return sim
+
+
+def test_windows_match_full_waveform():
+    full = Simulator(NetlistParser(COUNTER).parse(), detect_cycles=False).run(200, {"en": "1"})
+    capture = Capture("q0 & q1", pre=3, post=2, max_captures=100)
+    run(capture)
+    expected_triggers = [t for t in range(200) if full["q0"][t] & full["q1"][t]
+                         and not (t and full["q0"][t - 1] & full["q1"][t - 1])]
+    assert capture.triggers == len(expected_triggers)
+    assert [w.trigger for w in capture.windows] == expected_triggers
+    for window in capture.windows:
+        start, end = window.trigger - 3, window.trigger + 3
+        assert window.start == start and window.steps == 6
+        assert window.waveforms == {name: values[start:end] for name, values in full.items()}
+
+
+def test_memory_is_bounded_and_counting_continues():
+    capture = Capture("q1", pre=4, post=4, signals=["q1", "clk"], max_captures=2)
+    run(capture, steps=5000)
+    assert len(capture.windows) == 2 and all(w.complete for w in capture.windows)
+    assert capture.triggers == 5000 // 8
+    assert len(capture._ring) == 4 * 2
+    assert set(capture.windows[0].waveforms) == {"q1", "clk"}
+
+
+def test_stop_when_full_ends_the_run():
+    capture = Capture("q1", pre=0, post=1, max_captures=2, stop_when_full=True)
+    run(capture, steps=10_000)
+    last = capture.windows[-1]
+    assert capture.steps == last.trigger + 2
+    assert capture.windows[0].to_dict()["waveforms"]["q1"] == [1, 1]
+
+
+def test_truncated_windows_at_run_edges():
+    capture = Capture("en", pre=5, post=10)
+    run(capture, steps=4)
+    window = capture.windows[0]
+    assert window.trigger == 0 and window.start == 0
+    assert window.steps == 4 and not window.complete
+
+
+def test_unknown_signals_are_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        run(Capture("nope | q0"))
+    with pytest.raises(ValueError, match="unexpectedly"):
+        Capture("q0 &")
+
+
+def test_window_sizes_are_bounded():
+    for kwargs in ({"pre": 10 ** 12}, {"post": -1}, {"max_captures": 10 ** 6}):
+        with pytest.raises(ValueError, match="between"):
+            Capture("q0", **kwargs)
+    capture = Capture("q0", pre=3, post=4, signals=["q0", "q1"], max_captures=5)
+    assert capture.max_bytes(["q0", "q1", "en"]) == (3 + 8 * 5) * 2
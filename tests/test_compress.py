@@ -0,0 +1,55 @@
+import gzip
+import json
+import os
+import sys
+
+# The backend runs from its own directory and imports its modules by name.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+from compress import compress, compress_stream, decompress, negotiate  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+
+BODY = json.dumps({"waveforms": {f"s{i}": [t % 2 for t in range(5000)] for i in range(8)}}).encode()
+
+
+def test_negotiate():
+    assert negotiate(None) is None
+    assert negotiate("identity") is None
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("*") is not None
+
+
+def test_round_trip_and_streaming():
+    data = compress(BODY, "gzip")
+    assert len(data) * 20 < len(BODY)
+    assert decompress(data, "gzip") == BODY
+    chunks = [BODY[i:i + 1000] for i in range(0, len(BODY), 1000)]
+    assert gzip.decompress(b"".join(compress_stream(chunks, "gzip"))) == BODY
+
+
+def test_cache_serves_stored_bytes_and_recodes_once():
+    cache = ResultCache()
+    key = ResultCache.key("/simulate", "netlist", 16, {"a": "01"})
+    assert cache.get(key, "gzip") is None
+    stored = compress(BODY, "gzip")
+    cache.put(key, "application/json", stored, "gzip")
+
+    media_type, data = cache.get(key, "gzip")
+    assert media_type == "application/json" and data is stored
+    _, plain = cache.get(key, None)
+    assert plain == BODY
+    assert cache.size == len(stored) + len(BODY)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=25)
+    for name in "abc":
+        cache.put(name, "application/json", b"x" * 10, None)
+    assert len(cache) == 2
+    assert cache.get("a", None) is None
+    assert cache.get("c", None) == ("application/json", b"x" * 10)
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
+    assert cache.get("c", None) is None
@@ -0,0 +1,43 @@
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+COUNTER = """
+CIRCUIT counter2
+OUTPUT q0 q1
+SIGNAL d0 d1
+CLOCK clk PERIOD 4 DUTY 0.5
+GATE g1 NOT q0 d0
+GATE g2 XOR q0 q1 d1
+DFF ff0 d0 clk q0
+DFF ff1 d1 clk q1
+"""
+
+
+def test_cycle_detection_matches_full_simulation():
+    full = Simulator(NetlistParser(COUNTER).parse(), detect_cycles=False)
+    expected = full.run(1000, {})
+
+    fast = Simulator(NetlistParser(COUNTER).parse())
+    actual = fast.run(1000, {})
+
+    assert fast.cycle is not None
+    start, length = fast.cycle
+    assert length == 16  # 4 counter states x clock period 4
+    assert start + 2 * length < 1000
+    assert actual == expected
+    assert all(len(w) == 1000 for w in actual.values())
+
+
+def test_cycle_detection_waits_for_inputs():
+    netlist = """
+    CIRCUIT follower
+    INPUT a
+    OUTPUT y
+    GATE g1 NOT a y
+    """
+    sim = Simulator(NetlistParser(netlist).parse())
+    waveforms = sim.run(50, {"a": "0110"})
+
+    assert sim.cycle == (4, 1)
+    assert waveforms["y"] == [1, 0, 0, 1] + [1] * 46
+    assert sim.history is waveforms
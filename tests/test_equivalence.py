@@ -0,0 +1,121 @@
+import os
+import sys
+
+import pytest
+
+from core.equivalence import check_equivalence, main
+from core.parser import NetlistParseError
+
+FULL_ADDER = """
+CIRCUIT fa
+INPUT a b cin
+OUTPUT sum cout
+SIGNAL s1 s2 s3
+GATE xor1 XOR a b s1
+GATE xor2 XOR s1 cin sum
+GATE and1 AND a b s2
+GATE and2 AND s1 cin s3
+GATE or1 OR s2 s3 cout
+"""
+
+# Same function built from NANDs only.
+FULL_ADDER_NAND = """
+CIRCUIT fa_nand
+INPUT cin b a
+OUTPUT cout sum
+SIGNAL n1 n2 n3 s1 n4 n5 n6
+GATE g1 NAND a b n1
+GATE g2 NAND a n1 n2
+GATE g3 NAND b n1 n3
+GATE g4 NAND n2 n3 s1
+GATE g5 NAND s1 cin n4
+GATE g6 NAND s1 n4 n5
+GATE g7 NAND cin n4 n6
+GATE g8 NAND n5 n6 sum
+GATE g9 NAND n1 n4 cout
+"""
+
+FULL_ADDER_BUG = FULL_ADDER.replace("GATE or1 OR s2 s3 cout", "GATE or1 XOR s2 s2 cout")
+
+
+def test_equivalent_netlists_exhaustive():
+    res = check_equivalence(FULL_ADDER, FULL_ADDER_NAND)
+    assert res.equivalent
+    assert res.exhaustive
+    assert res.vectors == 8
+
+
+def test_mismatch_returns_lowest_counterexample():
+    res = check_equivalence(FULL_ADDER, FULL_ADDER_BUG)
+    assert not res.equivalent
+    # cout differs first for a=1, b=1, cin=0 (row 3).
+    assert res.counterexample == [{"a": 1, "b": 1, "cin": 0}]
+    assert res.mismatch == {"output": "cout", "step": 0, "a": 1, "b": 0}
+
+
+def test_exhaustive_mode_with_any_word_width():
+    for width in (3, 5, 6):
+        assert check_equivalence(FULL_ADDER, FULL_ADDER_NAND, width=width).equivalent
+        res = check_equivalence(FULL_ADDER, FULL_ADDER_BUG, width=width)
+        assert res.counterexample == [{"a": 1, "b": 1, "cin": 0}]
+
+
+def test_random_mode_on_sequential_circuits():
+    reg = "CIRCUIT r\nINPUT d\nOUTPUT q\nCLOCK clk PERIOD 2 DUTY 0.5\nDFF ff d clk q\n"
+    inv = "CIRCUIT r\nINPUT d\nOUTPUT q\nSIGNAL nd\nCLOCK clk PERIOD 2 DUTY 0.5\nGATE g NOT d nd\nDFF ff nd clk q\n"
+
+    same = check_equivalence(reg, reg, vectors=4096, width=256, seed=1)
+    assert same.equivalent and not same.exhaustive
+
+    diff = check_equivalence(reg, inv, vectors=4096, width=256, seed=1)
+    assert not diff.equivalent
+    # The first rising edge is at step 1, so the shortest failing sequence has 2 steps.
+    assert len(diff.counterexample) == 2
+    assert diff.mismatch["step"] == 1
+
+
+def test_interface_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        check_equivalence(FULL_ADDER, FULL_ADDER.replace("OUTPUT sum cout", "OUTPUT sum carry"))
+
+
+def _memory_netlist(path, keyword="FILE"):
+    """A ROM loaded with FILE, or a RAM loaded with INIT."""
+    memory = f"ROM m ADDR a0 DOUT q0 CLK clk FILE {path}" if keyword == "FILE" else \
+        f"RAM m ADDR a0 DIN a0 DOUT q0 WE a0 CLK clk INIT {path}"
+    return f"CIRCUIT m\nINPUT a0\nOUTPUT q0\nCLOCK clk PERIOD 2 DUTY 0.5\n{memory}\n"
+
+
+def test_files_can_be_refused(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("supersecret_token\n")
+    for keyword in ("FILE", "INIT"):
+        with pytest.raises(NetlistParseError, match="not allowed") as info:
+            check_equivalence(_memory_netlist(secret, keyword), FULL_ADDER, allow_files=False)
+        assert "supersecret" not in str(info.value)
+
+
+def test_endpoint_does_not_read_server_files(tmp_path):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+    from backend.main import create_app
+
+    secret = tmp_path / "secret.txt"
+    secret.write_text("supersecret_token\n")
+    client = TestClient(create_app(prewarm_templates=[]))
+    for netlist in (_memory_netlist(secret), _memory_netlist(secret, "INIT"), _memory_netlist(tmp_path / "missing")):
+        response = client.post("/equivalence", json={"netlist_a": netlist, "netlist_b": netlist})
+        assert response.status_code == 400
+        assert "not allowed" in response.json()["detail"]
+        assert "supersecret" not in response.text
+
+
+def test_cli_exit_codes(tmp_path, capsys):
+    a, b, c = tmp_path / "a.net", tmp_path / "b.net", tmp_path / "c.net"
+    a.write_text(FULL_ADDER)
+    b.write_text(FULL_ADDER_NAND)
+    c.write_text(FULL_ADDER_BUG)
+    assert main([str(a), str(b)]) == 0
+    assert main([str(a), str(c)]) == 1
+    assert "MISMATCH on 'cout'" in capsys.readouterr().out
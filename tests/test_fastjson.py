@@ -0,0 +1,33 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+import fastjson  # noqa: E402
+
+RESPONSE = {
+    "waveforms": {"a": [0, 1, 1, 0], "naïve": [1, 1, 1, 1], "bus": [0, 2, 3, 300], "empty": []},
+    "steps": [0, 1, 2, 3],
+    "cycle": {"start": 1, "length": 2},
+}
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_dumps_matches_stdlib(monkeypatch, use_orjson):
+    if use_orjson and fastjson.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    assert json.loads(fastjson.dumps(RESPONSE)) == RESPONSE
+    as_range = {**RESPONSE, "steps": range(4)}
+    assert json.loads(fastjson.dumps(as_range)) == RESPONSE
+    assert json.loads(fastjson.dumps({"steps": range(0)})) == {"steps": []}
+
+
+def test_bit_array():
+    assert fastjson.bit_array([1, 0, 1]) == b"[1,0,1]"
+    assert fastjson.bit_array([]) == b"[]"
+    assert fastjson.bit_array([0, -1]) == b"[0,-1]"
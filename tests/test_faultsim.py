@@ -0,0 +1,71 @@
+import random
+
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core import faultsim
+from core.faultsim import simulate_faults, all_faults
+
+SHIFTER = """
+CIRCUIT shifter
+INPUT a b
+OUTPUT y q
+SIGNAL t1 t2 d
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE g1 NAND a b t1
+GATE g2 XOR t1 q t2
+GATE g3 OR t2 a d
+GATE g4 AND d b y
+DFF ff1 d clk q
+"""
+
+
+def _detect_serially(netlist, fault, inputs, steps):
+    """Reference: one full Simulator run per fault, with the net pinned."""
+    good = Simulator(NetlistParser(netlist).parse(), detect_cycles=False).run(steps, inputs)
+    circuit = NetlistParser(netlist).parse()
+    net, value = fault
+    sig = circuit.signals[net]
+    sig.set_value = lambda _v, s=sig: setattr(s, "value", value)
+    bad = Simulator(circuit, detect_cycles=False).run(steps, inputs)
+    for t in range(steps):
+        if any(good[o.name][t] != bad[o.name][t] for o in circuit.outputs):
+            return t
+    return None
+
+
+def test_fault_simulation_matches_serial_reference():
+    rng = random.Random(3)
+    steps = 24
+    inputs = {name: "".join(rng.choice("01") for _ in range(steps)) for name in ("a", "b")}
+
+    report = simulate_faults(SHIFTER, inputs, steps, group_size=5, processes=1)
+
+    assert report.total == 2 * len(NetlistParser(SHIFTER).parse().signals)
+    for fault, step in report.detections.items():
+        assert step == _detect_serially(SHIFTER, fault, inputs, steps), fault
+
+
+def test_fault_simulation_across_processes():
+    inputs = {"a": "01101001", "b": "11010110"}
+    serial = simulate_faults(SHIFTER, inputs, 8, group_size=4, processes=1)
+    parallel = simulate_faults(SHIFTER, inputs, 8, group_size=4, processes=2)
+
+    assert parallel.detections == serial.detections
+    assert 0 < parallel.coverage <= 1
+
+
+def test_untestable_fault_stays_undetected():
+    netlist = "CIRCUIT c\nINPUT a\nOUTPUT y\nSIGNAL spare\nGATE g1 BUF a y\n"
+    report = simulate_faults(netlist, {"a": "01"}, 2, processes=1)
+
+    assert ("spare", 0) in report.undetected
+    assert ("spare", 1) in report.undetected
+    assert report.detections[("a", 0)] == 1
+    assert report.detections[("y", 1)] == 0
+    assert len(all_faults(NetlistParser(netlist).parse())) == 6
+
+
+def test_compiled_cache_is_bounded():
+    for k in range(faultsim.CACHE_SIZE + 5):
+        simulate_faults(f"CIRCUIT c{k}\nINPUT a\nOUTPUT y\nGATE g1 NOT a y\n", {"a": "01"}, 2, processes=1)
+    assert len(faultsim._compiled_cache) == faultsim.CACHE_SIZE
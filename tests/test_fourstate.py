@@ -0,0 +1,131 @@
+import itertools
+
+import pytest
+
+from core.compiled import CompiledCircuit
+from core.fourstate import X, Z, FourStateSimulator, make_settle
+from core.optimizer import optimize_circuit
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+GATES = """
+CIRCUIT gates
+INPUT a b
+OUTPUT y_and y_or y_xor y_nand y_nor y_xnor y_not y_buf
+GATE g1 AND a b y_and
+GATE g2 OR a b y_or
+GATE g3 XOR a b y_xor
+GATE g4 NAND a b y_nand
+GATE g5 NOR a b y_nor
+GATE g6 XNOR a b y_xnor
+GATE g7 NOT a y_not
+GATE g8 BUF a y_buf
+"""
+
+REGISTER = """
+CIRCUIT reg
+INPUT d
+OUTPUT q
+CLOCK clk PERIOD 2 DUTY 0.5
+DFF ff d clk q
+"""
+
+SR_LATCH = """
+CIRCUIT sr
+INPUT s r
+OUTPUT q qn
+GATE g1 NOR r qn q
+GATE g2 NOR s q qn
+"""
+
+# Reference semantics: expand an unknown input to both values.
+OPS = {
+    "y_and": lambda a, b: a & b,
+    "y_or": lambda a, b: a | b,
+    "y_xor": lambda a, b: a ^ b,
+    "y_nand": lambda a, b: 1 - (a & b),
+    "y_nor": lambda a, b: 1 - (a | b),
+    "y_xnor": lambda a, b: 1 - (a ^ b),
+    "y_not": lambda a, b: 1 - a,
+    "y_buf": lambda a, b: a,
+}
+
+
+def _expected(op, a, b):
+    results = {op(x, y) for x in ((0, 1) if a >= X else (a,)) for y in ((0, 1) if b >= X else (b,))}
+    return results.pop() if len(results) == 1 else X
+
+
+def _run(netlist, steps, inputs):
+    return FourStateSimulator(NetlistParser(netlist).parse()).run(steps, inputs)
+
+
+def test_gates_match_pessimistic_truth_tables():
+    codes = "01xz"
+    pairs = list(itertools.product(range(4), repeat=2))
+    inputs = {"a": "".join(codes[a] for a, _ in pairs), "b": "".join(codes[b] for _, b in pairs)}
+    wave = _run(GATES, len(pairs), inputs)
+    for name, op in OPS.items():
+        assert wave[name] == [_expected(op, a, b) for a, b in pairs], name
+
+
+def test_known_values_match_two_state_simulator():
+    inputs = {"a": "0110", "b": "0011"}
+    two = Simulator(NetlistParser(GATES).parse()).run(4, inputs)
+    four = _run(GATES, 4, inputs)
+    for name in OPS:
+        assert four[name] == two[name]
+
+
+def test_undriven_input_is_z_and_propagates_x():
+    wave = _run(GATES, 2, {"a": "00"})
+    assert wave["b"] == [Z, Z]
+    assert wave["y_and"] == [0, 0]       # 0 AND Z is still 0
+    assert wave["y_or"] == [X, X]
+
+
+def test_optimized_circuits_are_refused():
+    netlist = "CIRCUIT t\nINPUT a\nOUTPUT y w\nSIGNAL tie\nGATE g1 AND a tie y\nGATE g2 NOT a w\n"
+    assert _run(netlist, 3, {"a": "011"})["y"] == [0, X, X]
+    circuit = NetlistParser(netlist).parse()
+    optimize_circuit(circuit)
+    # Folding ties 'tie' to 0 and drops y's driver, so y would read Z instead of 0, X, X.
+    with pytest.raises(ValueError, match="four-state"):
+        FourStateSimulator(circuit)
+
+
+def test_flipflop_is_x_until_clocked():
+    wave = _run(REGISTER, 6, {"d": "110000"})
+    # The clock rises at t=1, 3, 5; q is unknown before the first edge.
+    assert wave["q"] == [X, 1, 1, 0, 0, 0]
+
+
+def test_x_on_d_is_captured():
+    wave = _run(REGISTER, 4, {"d": "11xx"})
+    assert wave["q"] == [X, 1, 1, X]
+
+
+def test_sr_latch_without_reset_stays_x():
+    wave = _run(SR_LATCH, 4, {"s": "0000", "r": "0000"})
+    assert wave["q"] == [X] * 4
+    wave = _run(SR_LATCH, 4, {"s": "1000", "r": "0000"})
+    assert wave["q"] == [1] * 4
+    assert wave["qn"] == [0] * 4
+
+
+def test_lanes_are_independent():
+    compiled = CompiledCircuit(NetlistParser(GATES).parse())
+    settle = make_settle(compiled)
+    a, b, y = compiled.index["a"], compiled.index["b"], compiled.index["y_and"]
+    V, U = [0] * len(compiled.names), [0] * len(compiled.names)
+    # lanes: (1, 1), (1, X), (0, X)
+    V[a], U[a] = 0b011, 0b000
+    V[b], U[b] = 0b001, 0b110
+    settle(V, U, 0b111)
+    assert [(V[y] >> k & 1) | (U[y] >> k & 1) << 1 for k in range(3)] == [1, X, 0]
+
+
+@pytest.mark.parametrize("spec", [{"repeat": "01"}, {"piecewise": [[1, 2], [0, 4]]}])
+def test_stimulus_specs(spec):
+    wave = _run(GATES, 4, {"a": spec, "b": "1111"})
+    assert all(v in (0, 1) for v in wave["y_and"])
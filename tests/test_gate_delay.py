@@ -0,0 +1,128 @@
+import pytest
+
+from core.optimizer import optimize_circuit
+from core.parser import NetlistParseError, NetlistParser
+from core.simulator import Simulator
+from core.timing import TimingSimulator
+
+HAZARD = """
+CIRCUIT hazard
+INPUT a
+OUTPUT y
+SIGNAL na
+GATE g1 NOT a na {not_delay}
+GATE g2 AND a na y
+"""
+
+CHAIN = """
+CIRCUIT chain
+INPUT a
+OUTPUT y
+SIGNAL s1 s2
+DELAY BUF 3
+GATE b1 BUF a s1
+GATE b2 BUF s1 s2 DELAY 5
+GATE b3 BUF s2 y
+"""
+
+ADDER = """
+CIRCUIT adder
+INPUT a b cin
+OUTPUT s cout
+SIGNAL t1 t2 t3
+GATE g1 XOR a b t1
+GATE g2 XOR t1 cin s DELAY 2
+GATE g3 AND a b t2
+GATE g4 AND t1 cin t3
+GATE g5 OR t2 t3 cout DELAY 3
+"""
+
+
+def _timing(netlist, steps, inputs):
+    return TimingSimulator(NetlistParser(netlist).parse()).run(steps, inputs)
+
+
+def test_static_hazard_shows_a_glitch():
+    wave = _timing(HAZARD.format(not_delay=""), 6, {"a": "01"})
+    assert wave["y"] == [0, 0, 1, 0, 0, 0]
+    # A slower inverter widens the glitch (after its own start-up transient).
+    wave = _timing(HAZARD.format(not_delay="DELAY 3"), 14, {"a": "000001"})
+    assert wave["y"][4:] == [0, 0, 1, 1, 1, 0, 0, 0, 0, 0]
+
+
+def test_instance_and_type_delays_add_up_along_a_path():
+    wave = _timing(CHAIN, 16, {"a": "01"})
+    # Rises at step 1, arrives after 3 + 5 + 3 steps.
+    assert wave["y"].index(1) == 1 + 3 + 5 + 3
+
+
+def test_settles_to_zero_delay_values():
+    circuit = NetlistParser(ADDER).parse()
+    for bits in range(8):
+        inputs = {name: str(bits >> k & 1) for k, name in enumerate(("a", "b", "cin"))}
+        expected = Simulator(circuit).run(1, inputs)
+        wave = TimingSimulator(circuit).run(10, inputs)
+        for name in ("s", "cout"):
+            assert wave[name][-1] == expected[name][0]
+
+
+def test_only_affected_gates_are_evaluated():
+    sim = TimingSimulator(NetlistParser(CHAIN).parse())
+    sim.run(100, {"a": "01"})
+    # 3 gates at start-up, then one evaluation per hop.
+    assert sim.evaluations == 3 + 3
+    assert sim.events == 3
+
+
+def test_events_after_the_run_are_not_scheduled():
+    netlist = HAZARD.format(not_delay="DELAY 4096")
+    sim = TimingSimulator(NetlistParser(netlist).parse())
+    wave = sim.run(3, {"a": "0"})
+    # The inverter's rise would land at step 4096.
+    assert wave["na"] == [0, 0, 0]
+    assert sim.events == 0
+
+
+def test_optimized_circuits_are_refused():
+    netlist = "CIRCUIT c\nINPUT a\nOUTPUT y\nSIGNAL n1\nGATE g1 NOT a n1 DELAY 5\nGATE g2 NOT n1 y DELAY 5\n"
+    wave = _timing(netlist, 14, {"a": "001"})
+    assert wave["y"] == [0] * 5 + [1] * 5 + [0, 0, 1, 1]
+    circuit = NetlistParser(netlist).parse()
+    optimize_circuit(circuit)
+    # NOT-NOT would collapse into one default-delay buffer.
+    with pytest.raises(ValueError, match="delays"):
+        TimingSimulator(circuit)
+
+
+def test_flipflop_samples_delayed_d():
+    netlist = """
+    CIRCUIT reg
+    INPUT a
+    OUTPUT q
+    SIGNAL d
+    CLOCK clk PERIOD 4 DUTY 0.5
+    GATE g1 BUF a d DELAY 3
+    DFF ff d clk q
+    """
+    wave = _timing(netlist, 12, {"a": "1"})
+    # d rises at step 3; the edge at step 2 still sees 0, the one at 6 sees 1.
+    assert wave["d"].index(1) == 3
+    assert wave["q"].index(1) == 6
+
+
+@pytest.mark.parametrize("line", [
+    "GATE g1 AND a b y DELAY 0",
+    "DELAY FOO 2",
+    "DELAY AND",
+    "GATE g1 AND a b y DELAY 4097",
+    "DELAY AND 20000000",
+])
+def test_bad_delays(line):
+    with pytest.raises(NetlistParseError):
+        NetlistParser(f"CIRCUIT c\nINPUT a b\nOUTPUT y\n{line}\n").parse()
+
+
+def test_signal_named_delay_is_still_a_signal():
+    circuit = NetlistParser("CIRCUIT c\nINPUT a delay\nOUTPUT y\nGATE g1 AND a delay y\n").parse()
+    assert circuit.gates[0].input_names == ["a", "delay"]
+    assert circuit.gates[0].delay is None
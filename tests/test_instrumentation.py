@@ -0,0 +1,58 @@
+from core.instrumentation import Instrumentation
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.exporter import export_to_json
+
+HALF_ADDER = """
+CIRCUIT half_adder
+INPUT a b
+OUTPUT s c
+GATE g1 XOR a b s
+GATE g2 AND a b c
+"""
+
+SR_LATCH = """
+CIRCUIT sr
+INPUT s r
+OUTPUT q qn
+GATE g1 NOR r qn q
+GATE g2 NOR s q qn
+"""
+
+
+def test_phases_and_counters_are_recorded():
+    instr = Instrumentation()
+    circuit = NetlistParser(HALF_ADDER, instrumentation=instr).parse()
+    sim = Simulator(circuit, detect_cycles=False, instrumentation=instr)
+    sim.run(4, {"a": "0101", "b": "0011"})
+    export_to_json(circuit, sim, 4, instrumentation=instr)
+
+    data = instr.to_dict()
+    assert set(data["phases"]) == {"parse", "simulate", "export"}
+    assert all(p["calls"] == 1 and p["wall_ms"] >= 0 for p in data["phases"].values())
+    counters = data["counters"]
+    assert counters["steps"] == 4
+    # Acyclic logic settles in a single ordered pass.
+    assert counters["settle_iterations"] == 4
+    assert counters["gate_evaluations"] == 8
+    # a toggles 3x, b 1x, s 2x, c 1x
+    assert counters["signal_toggles"] == 7
+    assert instr.server_timing().startswith("parse;dur=")
+
+
+def test_latch_needs_several_settle_passes():
+    instr = Instrumentation()
+    sim = Simulator(NetlistParser(SR_LATCH).parse(), detect_cycles=False, instrumentation=instr)
+    waveforms = sim.run(4, {"s": "1000", "r": "0010"})
+
+    assert waveforms["q"] == [1, 1, 0, 0]
+    assert waveforms["qn"] == [0, 0, 1, 1]
+    assert instr.max_settle_iterations > 1
+    assert instr.settle_iterations < 4 * 3  # stops once a pass changes nothing
+
+
+def test_counters_can_be_disabled():
+    instr = Instrumentation(counters=False)
+    Simulator(NetlistParser(HALF_ADDER).parse(), instrumentation=instr).run(4, {"a": "01"})
+    assert "counters" not in instr.to_dict()
+    assert instr.steps == 0
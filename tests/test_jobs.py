@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+from jobs import DONE, JobManager, JobQueueFull  # noqa: E402
+from core.parser import NetlistParser, NetlistParseError  # noqa: E402
+from core.simulator import Simulator  # noqa: E402
+
+COUNTER = """
+CIRCUIT counter2
+INPUT en
+OUTPUT q0 q1
+SIGNAL d0 d1
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE g1 XOR q0 en d0
+GATE g2 XOR q0 q1 d1
+DFF ff0 d0 clk q0
+DFF ff1 d1 clk q1
+"""
+INPUTS = {"en": "1101"}
+
+
+def test_job_runs_and_matches_direct_simulation(tmp_path):
+    manager = JobManager(store_dir=str(tmp_path))
+    job = manager.submit(COUNTER, 300, INPUTS)
+    assert manager.submit(COUNTER, 300, INPUTS) is job  # deduplicated
+    manager.join()
+
+    assert job.status == DONE and job.step == job.steps == 300
+    waveforms, steps, meta = manager.load(job.id)
+    expected = Simulator(NetlistParser(COUNTER).parse()).run(300, INPUTS)
+    assert steps == 300 and waveforms == expected
+    assert "cycle" in meta
+    assert manager.load_netlist(job.id) == COUNTER
+
+    # A new manager (e.g. after a restart) finds the stored result.
+    again = JobManager(store_dir=str(tmp_path))
+    assert again.get(job.id).status == DONE
+    assert again.submit(COUNTER, 300, INPUTS).status == DONE
+
+
+def test_rejects_bad_netlists_and_full_queues(tmp_path):
+    manager = JobManager(store_dir=str(tmp_path), max_pending=0)
+    with pytest.raises(NetlistParseError):
+        manager.submit("GATE g1 FOO a b c", 10, {})
+    with pytest.raises(JobQueueFull):
+        manager.submit(COUNTER, 10, INPUTS)
+    assert manager.get("0" * 64) is None
+
+
+def test_malformed_job_ids_never_reach_the_store(tmp_path):
+    store = tmp_path / "store"
+    manager = JobManager(store_dir=str(store))
+    (tmp_path / "x.wave").mkdir()
+    for bad in ("../x", "0" * 63, "0" * 64 + "/..", "A" * 64):
+        assert manager.get(bad) is None
+        with pytest.raises(ValueError):
+            manager.open_result(bad)
+
+
+def test_simulator_reports_progress():
+    calls = []
+    sim = Simulator(NetlistParser(COUNTER).parse(), detect_cycles=False,
+                    progress=lambda step, total: calls.append((step, total)), progress_interval=100)
+    sim.run(250, INPUTS)
+    assert calls == [(0, 250), (100, 250), (200, 250), (250, 250)]
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from core.compiled import CompiledCircuit
+from core.lutmap import LutSimulator, map_luts
+from core.parser import NetlistParser
+from core.simulator import Simulator
+
+PARITY = """
+CIRCUIT parity
+INPUT a b c
+OUTPUT y
+SIGNAL t
+GATE g1 XOR a b t
+GATE g2 XOR t c y
+"""
+
+LATCH = """
+CIRCUIT sr
+INPUT s r
+OUTPUT q qn
+GATE g1 NOR r qn q
+GATE g2 NOR s q qn
+"""
+
+
+def _adder(n):
+    lines = ["CIRCUIT rca",
+             "INPUT " + " ".join([f"a{i}" for i in range(n)] + [f"b{i}" for i in range(n)] + ["c0"]),
+             "OUTPUT " + " ".join([f"s{i}" for i in range(n)] + [f"c{n}"])]
+    for i in range(n):
+        lines.append(f"SIGNAL x{i} g{i} p{i}" + (f" c{i}" if i else ""))
+        lines += [f"GATE gx{i} XOR a{i} b{i} x{i}", f"GATE gs{i} XOR x{i} c{i} s{i}",
+                  f"GATE ga{i} AND a{i} b{i} g{i}", f"GATE gp{i} AND x{i} c{i} p{i}",
+                  f"GATE gc{i} OR g{i} p{i} c{i + 1}"]
+    return "\n".join(lines)
+
+
+def _random_netlist(seed, inputs=10, gates=200, outputs=8):
+    rng = random.Random(seed)
+    lines = ["CIRCUIT rnd", "INPUT " + " ".join(f"i{k}" for k in range(inputs)),
+             "OUTPUT " + " ".join(f"y{k}" for k in range(outputs)),
+             "CLOCK clk PERIOD 4 DUTY 0.5", "SIGNAL q", "DFF ff n5 clk q"]
+    signals = [f"i{k}" for k in range(inputs)] + ["q"]
+    for g in range(gates):
+        kind = rng.choice(["AND", "OR", "XOR", "NAND", "NOR", "XNOR", "NOT", "BUF"])
+        lines.append(f"SIGNAL n{g}")
+        if kind in ("NOT", "BUF"):
+            lines.append(f"GATE g{g} {kind} {rng.choice(signals[-15:])} n{g}")
+        else:
+            a, b = rng.sample(signals[-15:], 2)
+            lines.append(f"GATE g{g} {kind} {a} {b} n{g}")
+        signals.append(f"n{g}")
+    for k in range(outputs):
+        lines.append(f"GATE o{k} BUF {signals[-1 - 9 * k]} y{k}")
+    return "\n".join(lines)
+
+
+def _check_equal(netlist, steps=200, **kwargs):
+    circuit = NetlistParser(netlist).parse()
+    inputs = {s.name: {"random": k} for k, s in enumerate(circuit.inputs)}
+    expected = Simulator(circuit, detect_cycles=False).run(steps, inputs)
+    sim = LutSimulator(circuit, **kwargs)
+    waveforms = sim.run(steps, inputs)
+    for name, values in waveforms.items():
+        assert values == expected[name], name
+    return sim, waveforms
+
+
+def test_parity_collapses_into_one_table():
+    mapping = map_luts(CompiledCircuit(NetlistParser(PARITY).parse()))
+    (lut,) = mapping.luts
+    assert len(lut.leaves) == 3
+    assert lut.table == 0x96
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_netlists_match_simulator(seed):
+    sim, waveforms = _check_equal(_random_netlist(seed))
+    assert {"q", "clk", "n5"} <= set(waveforms)
+    assert sim.mapping.to_dict()["luts"] * 3 <= sim.mapping.gates
+
+
+def test_adder_outputs_match_with_fewer_evaluations():
+    sim, waveforms = _check_equal(_adder(16))
+    assert all(f"s{i}" in waveforms for i in range(16))
+    assert sim.mapping.to_dict()["evaluation_ratio"] >= 3
+
+
+def test_k_limits_leaves_and_keep_retains_internal_nets():
+    sim, waveforms = _check_equal(_adder(8), k=3, keep=["x3"])
+    assert max(len(lut.leaves) for lut in sim.mapping.luts) <= 3
+    assert "x3" in waveforms
+
+
+def test_cyclic_netlists_are_rejected():
+    with pytest.raises(ValueError):
+        LutSimulator(NetlistParser(LATCH).parse())
+    with pytest.raises(ValueError):
+        map_luts(CompiledCircuit(NetlistParser(PARITY).parse()), k=7)
+    with pytest.raises(ValueError, match="between 2"):
+        map_luts(CompiledCircuit(NetlistParser(PARITY).parse()), k=1)
@@ -0,0 +1,99 @@
+from array import array
+
+import pytest
+
+from core.compiled import CompiledCircuit
+from core.exporter import export_to_json
+from core.optimizer import optimize_circuit
+from core.parser import NetlistParser, NetlistParseError
+from core.simulator import Simulator
+
+# CLOCK PERIOD 2 rises at steps 1, 3, 5, ...
+RAM_NETLIST = """
+CIRCUIT ram4x2
+INPUT a0 a1 d0 d1 we
+OUTPUT q0 q1
+CLOCK clk PERIOD 2 DUTY 0.5
+RAM mem ADDR a0 a1 DIN d0 d1 DOUT q0 q1 WE we CLK clk DATA 0 1 2 3
+"""
+
+
+def word(waveforms, bits, t):
+    return sum(waveforms[b][t] << k for k, b in enumerate(bits))
+
+
+def test_ram_reads_first_then_writes():
+    circuit = NetlistParser(RAM_NETLIST).parse()
+    (memory,) = circuit.memories
+    assert (memory.depth, memory.width) == (4, 2)
+    # Address 2 throughout: read 2, write 1 at the edge at step 3, read it back at 5.
+    inputs = {"a0": "0", "a1": "1", "d0": "1", "d1": "0", "we": "0001000"}
+    w = Simulator(circuit).run(7, inputs)
+    q = [word(w, ["q0", "q1"], t) for t in range(7)]
+    assert q == [0, 2, 2, 2, 2, 1, 1]
+    assert memory.words[2] == 1 and memory.writes == 1 and memory.reads == 3
+
+
+def test_ram_contents_reset_between_runs():
+    circuit = NetlistParser(RAM_NETLIST).parse()
+    sim = Simulator(circuit)
+    inputs = {"a0": "1", "a1": "1", "d0": "0", "d1": "0", "we": "1"}
+    first = sim.run(6, inputs)
+    assert [word(first, ["q0", "q1"], t) for t in (1, 3)] == [3, 0]
+    second = sim.run(6, inputs)
+    assert second == first
+    # Writes change state, so the run must not be folded into a repeating cycle.
+    assert sim.cycle is None
+
+
+def test_rom_from_raw_file_is_memory_mapped(tmp_path):
+    path = tmp_path / "rom.bin"
+    path.write_bytes(array("H", [0x1234, 0xBEEF, 7, 0xFFFF]).tobytes())
+    netlist = f"""
+CIRCUIT romtest
+INPUT a0 a1
+CLOCK clk PERIOD 2 DUTY 0.5
+ROM r ADDR a0 a1 DOUT {' '.join(f'q{k}' for k in range(16))} CLK clk FILE {path}
+"""
+    circuit = NetlistParser(netlist).parse()
+    rom = circuit.memories[0]
+    assert isinstance(rom.words, memoryview)
+    w = Simulator(circuit).run(8, {"a0": "00110011", "a1": "0000"})
+    bits = [f"q{k}" for k in range(16)]
+    assert word(w, bits, 1) == 0x1234 and word(w, bits, 3) == 0xBEEF
+    with pytest.raises(TypeError):
+        rom.words[0] = 1
+
+
+def test_hex_init_file_and_file_policy(tmp_path):
+    path = tmp_path / "init.hex"
+    path.write_text("// boot\n0a 0b\n0x0c\n")
+    netlist = (RAM_NETLIST.replace("DATA 0 1 2 3", f"INIT {path}")
+               .replace("DIN d0 d1 DOUT q0 q1", "DIN d0 d1 d0 d1 DOUT q0 q1 q2 q3")
+               .replace("OUTPUT q0 q1", "OUTPUT q0 q1 q2 q3"))
+    circuit = NetlistParser(netlist).parse()
+    assert list(circuit.memories[0].words) == [10, 11, 12, 0]
+    with pytest.raises(NetlistParseError, match="not allowed"):
+        NetlistParser(netlist, allow_files=False).parse()
+
+
+@pytest.mark.parametrize("line, message", [
+    ("RAM m ADDR a0 DOUT q0 CLK clk", "form"),
+    ("ROM r ADDR a0 DOUT q0 CLK clk", "FILE or DATA"),
+    ("ROM r ADDR a0 DOUT q0 CLK nope DATA 1", "unknown CLOCK"),
+    ("ROM r ADDR a0 DOUT q0 CLK clk DATA 1 2 3", "do not fit"),
+    ("ROM r ADDR a0 DOUT q0 CLK clk DATA 2", "does not fit"),
+    ("ROM r ADDR a0 DOUT q0 CLK clk DATA zz", "hex"),
+])
+def test_parse_errors(line, message):
+    with pytest.raises(NetlistParseError, match=message):
+        NetlistParser(f"CIRCUIT t\nINPUT a0\nCLOCK clk PERIOD 2 DUTY 0.5\n{line}\n").parse()
+
+
+def test_other_engines_and_tools():
+    circuit = NetlistParser(RAM_NETLIST + "SIGNAL n\nGATE g1 NOT we n\n").parse()
+    with pytest.raises(ValueError, match="step simulator"):
+        CompiledCircuit(circuit)
+    optimize_circuit(circuit)
+    exported = export_to_json(circuit, Simulator(circuit), 0)
+    assert exported["circuit"]["memories"][0]["dout"] == ["q0", "q1"]
@@ -0,0 +1,85 @@
+import random
+
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.optimizer import optimize_circuit
+
+REDUNDANT = """
+CIRCUIT redundant
+INPUT a b
+OUTPUT y z w
+SIGNAL tie n1 n2 k1 k2 unused
+GATE g1 AND a tie k1
+GATE g2 OR k1 b k2
+GATE g3 NOT a n1
+GATE g4 NOT n1 n2
+GATE g5 XOR n2 k2 y
+GATE g6 XOR k2 n2 z
+GATE g7 NAND a tie w
+GATE g8 AND a b unused
+"""
+
+D_LATCH = """
+CIRCUIT d_latch
+INPUT d enable
+OUTPUT q qn
+SIGNAL d_en q_int qn_int
+GATE nand1 NAND d enable d_en
+GATE nand2 NAND d_en qn q_int
+GATE nand3 NAND enable q qn_int
+GATE nand4 NAND q_int qn_int q
+GATE not1 NOT q qn
+"""
+
+
+def _random_inputs(circuit, steps, seed):
+    rng = random.Random(seed)
+    return {s.name: "".join(rng.choice("01") for _ in range(steps)) for s in circuit.inputs}
+
+
+def test_optimizer_removes_redundant_gates():
+    c = NetlistParser(REDUNDANT).parse()
+    report = optimize_circuit(c)
+
+    assert report.gates_before == 8
+    assert report.gates_removed == 5
+    assert report.double_inversions == 1
+    assert report.dead == 2
+    assert "unused" not in c.signals
+    types = sorted(type(g).__name__ for g in c.gates)
+    assert types == ["BufGate", "ConstGate", "XorGate"]
+
+
+def test_optimizer_preserves_visible_waveforms():
+    for netlist in (REDUNDANT, D_LATCH):
+        reference = NetlistParser(netlist).parse()
+        optimized = NetlistParser(netlist).parse()
+        optimize_circuit(optimized)
+
+        inputs = _random_inputs(reference, 64, seed=7)
+        expected = Simulator(reference).run(64, inputs)
+        actual = Simulator(optimized).run(64, inputs)
+        for sig in reference.inputs + reference.outputs:
+            assert actual[sig.name] == expected[sig.name]
+
+
+def test_optimizer_keeps_flipflop_nets():
+    netlist = """
+    CIRCUIT toggler
+    OUTPUT q
+    SIGNAL d n1 n2
+    CLOCK clk PERIOD 4 DUTY 0.5
+    GATE g1 NOT q n1
+    GATE g2 NOT n1 n2
+    GATE g3 NOT n2 d
+    DFF ff1 d clk q
+    """
+    reference = NetlistParser(netlist).parse()
+    optimized = NetlistParser(netlist).parse()
+    report = optimize_circuit(optimized)
+
+    assert report.gates_after == 2
+    expected = Simulator(reference).run(32, {})
+    actual = Simulator(optimized).run(32, {})
+    assert actual["q"] == expected["q"]
+    assert actual["d"] == expected["d"]
@@ -0,0 +1,66 @@
+import random
+from multiprocessing import shared_memory
+
+import pytest
+
+from benchmarks import generators
+from core.compiled import CompiledCircuit
+from core.parser import NetlistParser
+from core.partition import PartitionedSimulator, partition
+from core.simulator import Simulator
+
+LATCH = """
+CIRCUIT sr
+INPUT s r
+OUTPUT q qn
+GATE g1 NOR r qn q
+GATE g2 NOR s q qn
+"""
+
+
+def _random_inputs(circuit, steps, seed=0):
+    rng = random.Random(seed)
+    return {s.name: "".join(rng.choice("01") for _ in range(steps)) for s in circuit.inputs}
+
+
+def test_plan_covers_every_gate_and_respects_segments():
+    compiled = CompiledCircuit(NetlistParser(generators.random_dag(500)).parse())
+    plan = partition(compiled, 4)
+    assert sorted(gi for seg in plan.segments for part in seg for gi in part) == list(range(len(compiled.gates)))
+    assert max(plan.load()) <= 1.25 * len(compiled.gates) / 4 + len(set(compiled.levels))
+    driver = {out: plan.owner[gi] for gi, (_, _, out) in enumerate(compiled.gates)}
+    for seg in plan.segments:
+        written = {compiled.gates[gi][2] for part in seg for gi in part}
+        for p, part in enumerate(seg):
+            for gi in part:
+                for i in compiled.gates[gi][1]:
+                    assert i not in written or driver[i] == p
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_matches_simulator(workers):
+    for netlist in (generators.array_multiplier(4), generators.counter_chain(6)):
+        circuit = NetlistParser(netlist).parse()
+        inputs = _random_inputs(circuit, 40)
+        expected = Simulator(circuit, detect_cycles=False).run(40, inputs)
+        with PartitionedSimulator(circuit, workers=workers) as sim:
+            assert sim.run(40, inputs) == expected
+            assert sim.run(40, inputs) == expected  # reusable
+
+
+def test_rejects_cyclic_netlists():
+    with pytest.raises(ValueError):
+        PartitionedSimulator(NetlistParser(LATCH).parse(), workers=0)
+
+
+def test_dead_worker_fails_the_run_and_frees_shared_memory():
+    circuit = NetlistParser(generators.array_multiplier(4)).parse()
+    sim = PartitionedSimulator(circuit, workers=1, timeout=2.0)
+    name = sim._shm.name
+    sim._processes[0].kill()
+    with pytest.raises(RuntimeError, match="partition worker"):
+        sim.run(10, _random_inputs(circuit, 10))
+    assert sim._shm is None and not sim._processes
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+    sim.close()
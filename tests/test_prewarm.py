@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+from lazy import LazyModules  # noqa: E402
+from prewarm import load_templates, prewarm  # noqa: E402
+from settings import PREWARM_TEMPLATES  # noqa: E402
+
+NETLIST = """CIRCUIT inv
+INPUT a
+OUTPUT y
+GATE g1 NOT a y
+"""
+
+
+def test_lazy_modules_import_once_and_record_time():
+    modules = LazyModules("core")
+    assert modules.loaded() == {}
+    wavecodec = modules.wavecodec
+    assert wavecodec.MAGIC
+    assert modules.wavecodec is wavecodec
+    assert list(modules.loaded()) == ["core.wavecodec"]
+
+
+def test_lazy_modules_without_package():
+    modules = LazyModules()
+    assert modules.json.dumps([1]) == "[1]"
+    assert "json" in modules.loaded()
+
+
+def test_frontend_templates_are_found_and_warm():
+    netlists = load_templates(PREWARM_TEMPLATES)
+    assert len(netlists) >= 4
+    assert all(n.startswith("CIRCUIT") for n in netlists)
+    result = prewarm(netlists)
+    assert result["circuits"] == len(netlists)
+    assert result["errors"] == []
+
+
+def test_netlist_files_missing_paths_and_bad_templates(tmp_path):
+    good = tmp_path / "inv.net"
+    good.write_text(NETLIST)
+    netlists = load_templates([str(good), str(tmp_path / "missing.net")])
+    assert netlists == [NETLIST]
+    result = prewarm(netlists + ["CIRCUIT broken\nGATE g1 FOO a b y\n"])
+    assert result["circuits"] == 1
+    assert len(result["errors"]) == 1
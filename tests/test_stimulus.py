@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.stimulus import RandomBits, compile_inputs, settle_point
+
+HALF_ADDER = """
+CIRCUIT half_adder
+INPUT a b
+OUTPUT s c
+GATE g1 XOR a b s
+GATE g2 AND a b c
+"""
+
+
+def _run(inputs, steps, **kwargs):
+    return Simulator(NetlistParser(HALF_ADDER).parse(), **kwargs).run(steps, inputs)
+
+
+def test_specs_match_equivalent_strings():
+    steps = 24
+    cases = [
+        ({"a": {"repeat": "011"}}, {"a": "011" * 8}),
+        ({"a": {"piecewise": [[1, 5], [0, 9]]}}, {"a": "11111" + "0000"}),
+        ({"a,b": {"counter": {"start": 1, "every": 3}}},
+         {"a": "".join(str(((1 + t // 3) >> 0) & 1) for t in range(steps)),
+          "b": "".join(str(((1 + t // 3) >> 1) & 1) for t in range(steps))}),
+    ]
+    for specs, strings in cases:
+        assert _run(specs, steps, detect_cycles=False) == _run(strings, steps, detect_cycles=False)
+
+
+def test_file_vectors_use_offset_and_stride(tmp_path):
+    path = tmp_path / "vectors.txt"
+    path.write_text("01\n11\n10\n00\n")  # columns a, b
+    specs = {"a": {"file": str(path), "offset": 0, "stride": 3},
+             "b": {"file": str(path), "offset": 1, "stride": 3}}
+    assert _run(specs, 6) == _run({"a": "0110", "b": "1100"}, 6)
+    with pytest.raises(ValueError):
+        compile_inputs(specs, allow_files=False)
+
+
+def test_random_bits_are_seeded_and_random_access():
+    seq = RandomBits(3, p=0.25)
+    values = [seq.value(t) for t in range(10000)]
+    assert 0.2 < sum(values) / len(values) < 0.3
+    assert RandomBits(3, p=0.25).value(9999) == values[9999]
+    assert settle_point(compile_inputs({"a": {"random": 3}})) == (None, 1)
+
+
+def test_periodic_stimulus_allows_cycle_detection():
+    sim = Simulator(NetlistParser(HALF_ADDER).parse())
+    start = time.perf_counter()
+    waveforms = sim.run(1_000_000, {"a": {"repeat": "01"}, "b": {"repeat": "0011"}})
+    assert time.perf_counter() - start < 5
+    assert sim.cycle is not None and sim.cycle[1] == 4
+    assert waveforms["c"][999_996:] == [0, 0, 0, 1]
+
+
+def test_bad_specs_are_rejected():
+    for spec in ({"repeat": ""}, {"random": 1, "p": 2}, {"bogus": 1}, {"piecewise": [[1, 5], [0, 2]]},
+                 {"piecewise": [[0, 5], [2, 9]]}, 5):
+        with pytest.raises(ValueError):
+            compile_inputs({"a": spec})
@@ -0,0 +1,54 @@
+import json
+
+from core.sweep import ERROR, FAIL, PASS, iter_results, load_manifest, main, run_sweep
+
+HALF_ADDER = """
+CIRCUIT half_adder
+INPUT a b
+OUTPUT s c
+GATE g1 XOR a b s
+GATE g2 AND a b c
+"""
+
+
+def _scenarios():
+    return [
+        {"id": "ok", "netlist": HALF_ADDER, "steps": 4, "inputs": {"a": "0101", "b": "0011"},
+         "expect": {"s": "0110", "c": "0001"}},
+        {"id": "wrong", "netlist": HALF_ADDER, "steps": 4, "inputs": {"a": "0101", "b": "0011"},
+         "expect": {"c": "0011"}},
+        {"id": "broken", "netlist": "GATE g1 FOO a b c", "steps": 4},
+    ]
+
+
+def test_sweep_records_pass_fail_and_error(tmp_path):
+    out = tmp_path / "results.jsonl"
+    summary = run_sweep(_scenarios(), str(out), processes=2)
+    assert summary.counts == {PASS: 1, FAIL: 1, ERROR: 1}
+    assert not summary.ok
+
+    results = {r["id"]: r for r in iter_results(str(out))}
+    assert results["ok"]["waveforms"] == {"s": "0110", "c": "0001"}
+    assert results["wrong"]["mismatches"] == [{"signal": "c", "step": 2, "expected": "0011", "actual": "0001"}]
+    assert "NetlistParseError" in results["broken"]["error"]
+
+
+def test_resume_skips_finished_ids_and_survives_truncation(tmp_path):
+    out = tmp_path / "results.jsonl"
+    run_sweep(_scenarios()[:1], str(out), processes=1)
+    with open(out, "a") as f:
+        f.write('{"id": "wro')  # crash while writing
+    summary = run_sweep(_scenarios(), str(out), processes=1)
+    assert summary.skipped == 1
+    assert sorted(r["id"] for r in iter_results(str(out))) == ["broken", "ok", "wrong"]
+
+
+def test_cli_with_manifest_files(tmp_path):
+    (tmp_path / "ha.net").write_text(HALF_ADDER)
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(json.dumps({"netlist_file": "ha.net", "steps": 2, "inputs": {"a": "11", "b": "01"},
+                                    "expect": {"c": "01"}}) + "\n")
+    assert load_manifest(str(manifest))[0]["id"] == "0"
+    out = tmp_path / "out.jsonl"
+    assert main([str(manifest), "-o", str(out), "-j", "1"]) == 0
+    assert next(iter_results(str(out)))["status"] == PASS
@@ -0,0 +1,65 @@
+import itertools
+
+import pytest
+
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.truthtable import truth_table, iter_truth_table
+
+FULL_ADDER = """
+CIRCUIT full_adder
+INPUT a b cin
+OUTPUT sum cout
+SIGNAL s1 s2 s3
+GATE xor1 XOR a b s1
+GATE xor2 XOR s1 cin sum
+GATE and1 AND a b s2
+GATE and2 AND s1 cin s3
+GATE or1 OR s2 s3 cout
+"""
+
+
+def test_truth_table_full_adder():
+    table = truth_table(NetlistParser(FULL_ADDER).parse())
+
+    assert table.inputs == ["a", "b", "cin"]
+    assert table.rows == 8
+    for a, b, cin in itertools.product((0, 1), repeat=3):
+        row = {"a": a, "b": b, "cin": cin}
+        assert table.value("sum", row) == (a + b + cin) % 2
+        assert table.value("cout", row) == (a + b + cin) // 2
+
+
+def test_truth_table_matches_simulator():
+    netlist = "CIRCUIT wide\nINPUT " + " ".join(f"i{k}" for k in range(6)) + "\nOUTPUT y\nSIGNAL t0 t1 t2 t3\n"
+    netlist += "GATE g0 NAND i0 i1 t0\nGATE g1 XOR i2 t0 t1\nGATE g2 NOR i3 i4 t2\n"
+    netlist += "GATE g3 OR t1 t2 t3\nGATE g4 XNOR t3 i5 y\n"
+    circuit = NetlistParser(netlist).parse()
+    table = truth_table(circuit)
+
+    inputs = {f"i{k}": "".join(str((row >> k) & 1) for row in range(64)) for k in range(6)}
+    expected = Simulator(NetlistParser(netlist).parse()).run(64, inputs)["y"]
+    assert [(table.columns["y"] >> row) & 1 for row in range(64)] == expected
+
+
+def test_streamed_chunks_cover_every_row_once():
+    circuit = NetlistParser(FULL_ADDER).parse()
+    chunks = list(iter_truth_table(circuit, chunk_bits=1))
+
+    assert sorted(c.base for c in chunks) == [0, 2, 4, 6]
+    full = truth_table(NetlistParser(FULL_ADDER).parse())
+    for chunk in chunks:
+        assert chunk.columns["sum"] == (full.columns["sum"] >> chunk.base) & 0b11
+
+
+def test_truth_table_rejects_sequential_circuits():
+    netlist = "CIRCUIT seq\nINPUT d\nOUTPUT q\nCLOCK clk PERIOD 2 DUTY 0.5\nDFF ff d clk q\n"
+    with pytest.raises(ValueError):
+        truth_table(NetlistParser(netlist).parse())
+
+
+def test_truth_table_rejects_wide_circuits_before_allocating():
+    names = " ".join(f"i{k}" for k in range(60))
+    netlist = f"CIRCUIT wide\nINPUT {names}\nOUTPUT y\nGATE g1 AND i0 i59 y\n"
+    with pytest.raises(ValueError, match="at most 24 inputs"):
+        truth_table(NetlistParser(netlist).parse())
@@ -0,0 +1,58 @@
+import json
+import random
+
+import pytest
+
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.wavecodec import BITPACKED, TRANSITIONS, decode_waveforms, encode_waveforms, transitions
+
+COUNTER = """
+CIRCUIT counter2
+OUTPUT q0 q1
+SIGNAL d0 d1
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE g1 NOT q0 d0
+GATE g2 XOR q0 q1 d1
+DFF ff0 d0 clk q0
+DFF ff1 d1 clk q1
+"""
+
+
+def test_round_trip_of_simulation():
+    waveforms = Simulator(NetlistParser(COUNTER).parse()).run(1000, {})
+    data = encode_waveforms(waveforms, 1000, meta={"cycle": {"start": 1, "length": 8}})
+    decoded, steps, meta = decode_waveforms(data)
+    assert steps == 1000
+    assert decoded == waveforms
+    assert meta == {"cycle": {"start": 1, "length": 8}}
+    assert len(data) * 10 < len(json.dumps(waveforms))
+
+
+@pytest.mark.parametrize("steps", [0, 1, 7, 8, 9, 300])
+def test_round_trip_edge_lengths(steps):
+    rng = random.Random(steps)
+    waveforms = {
+        "quiet": [1] * steps,
+        "noisy": [rng.randint(0, 1) for _ in range(steps)],
+        "multi": [rng.randint(0, 3) for _ in range(steps)],
+        "naïve": [0] * steps,
+    }
+    decoded, n, meta = decode_waveforms(encode_waveforms(waveforms, steps))
+    assert (decoded, n, meta) == (waveforms, steps, {})
+
+
+def test_picks_the_smaller_encoding():
+    steps = 64
+    data = encode_waveforms({"clk": [t % 2 for t in range(steps)]}, steps)
+    assert data[4 + 1 + 1 + 1 + 3] == BITPACKED
+    data = encode_waveforms({"rst": [1] * 3 + [0] * (steps - 3)}, steps)
+    assert data[4 + 1 + 1 + 1 + 3] == TRANSITIONS
+    assert transitions(bytes([1, 1, 1, 0, 0, 1])) == [3, 5]
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        encode_waveforms({"a": [0, 1]}, 3)
+    with pytest.raises(ValueError):
+        decode_waveforms(b"JSON")
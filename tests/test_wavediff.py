@@ -0,0 +1,81 @@
+import random
+
+from core.exporter import _compress_waveform
+from core.wavecodec import decode_segments, encode_waveforms
+from core.wavediff import diff_segments, diff_streams, diff_values, segments_from_runs
+
+
+def naive_diff(a, b):
+    """Per-step reference: maximal runs where a and b differ with the same pair."""
+    out = []
+    for t, (x, y) in enumerate(zip(a, b)):
+        if x == y:
+            continue
+        if out and out[-1][1] == t and out[-1][2:] == [x, y]:
+            out[-1][1] = t + 1
+        else:
+            out.append([t, t + 1, x, y])
+    return out
+
+
+def test_diff_segments_matches_per_step_reference():
+    rng = random.Random(7)
+    for _ in range(200):
+        steps = rng.randrange(0, 60)
+        a = [int(rng.random() < 0.3) for _ in range(steps)]
+        b = [int(rng.random() < 0.3) for _ in range(steps)]
+        result = diff_values({"s": a}, {"s": b})
+        assert [list(iv) for iv in result.signals.get("s", [])] == naive_diff(a, b)
+
+
+def test_identical_runs():
+    values = {"a": [0, 1] * 50, "b": [1] * 100}
+    result = diff_values(values, dict(values))
+    assert result.identical
+    assert result.to_dict()["first_mismatch"] is None
+    assert result.compared == 2
+
+
+def test_decode_segments_for_every_encoding():
+    steps = 64
+    waveforms = {
+        "quiet": [0] * 60 + [1] * 4,            # transitions
+        "clock": [t % 2 for t in range(steps)],  # bit-packed
+        "bus": [t // 8 for t in range(steps)],   # bytes
+    }
+    data = encode_waveforms(waveforms, steps)
+    segments, decoded_steps, _ = decode_segments(data)
+    assert decoded_steps == steps
+    assert segments["quiet"] == [(0, 0), (60, 1)]
+    assert segments["clock"] == [(t, t % 2) for t in range(steps)]
+    assert segments["bus"] == [(8 * k, k) for k in range(8)]
+
+
+def test_diff_streams_reports_only_mismatches():
+    steps = 1000
+    a = {"y": [0] * steps, "clk": [t % 2 for t in range(steps)], "extra": [0] * steps}
+    b_y = [0] * steps
+    b_y[500:520] = [1] * 20
+    b = {"y": b_y, "clk": [t % 2 for t in range(steps)], "other": [1] * steps}
+    result = diff_streams(encode_waveforms(a, steps), encode_waveforms(b, steps)).to_dict()
+    assert result["signals"] == {"y": [[500, 520, 0, 1]]}
+    assert result["first_mismatch"] == {"step": 500, "signal": "y"}
+    assert result["only_a"] == ["extra"]
+    assert result["only_b"] == ["other"]
+    assert not result["identical"]
+
+
+def test_signal_filter_and_length_mismatch():
+    a = {"x": [0, 0, 1, 1, 0], "y": [1, 1, 1, 1, 1]}
+    b = {"x": [0, 1, 1], "y": [0, 0, 0]}
+    result = diff_streams(encode_waveforms(a, 5), encode_waveforms(b, 3), signals=["x"])
+    assert result.signals == {"x": [(1, 2, 0, 1)]}
+    assert (result.steps_a, result.steps_b) == (5, 3)
+    assert not result.identical
+
+
+def test_segments_from_exporter_runs():
+    values = [0, 0, 1, 1, 1, 0, 1]
+    segments = segments_from_runs(_compress_waveform(values))
+    assert segments == [(0, 0), (2, 1), (5, 0), (6, 1)]
+    assert diff_segments(segments, [(0, 0)], len(values)) == [(2, 5, 1, 0), (6, 7, 1, 0)]
@@ -0,0 +1,102 @@
+import io
+import random
+
+import pytest
+
+from core.fourstate import FourStateSimulator
+from core.parser import NetlistParser
+from core.simulator import Simulator
+from core.wavediff import diff_stores
+from core.wavestore import WaveStore, WaveStoreWriter
+
+COUNTER = """
+CIRCUIT counter3
+INPUT en
+OUTPUT q0 q1 q2
+SIGNAL d0 d1 d2 c1 c2
+CLOCK clk PERIOD 2 DUTY 0.5
+GATE g1 XOR q0 en d0
+GATE g2 AND q0 en c1
+GATE g3 XOR q1 c1 d1
+GATE g4 AND q1 c1 c2
+GATE g5 XOR q2 c2 d2
+DFF ff0 d0 clk q0
+DFF ff1 d1 clk q1
+DFF ff2 d2 clk q2
+"""
+
+
+def record(tmp_path, name, steps, inputs, chunk_steps=64, **kwargs):
+    path = str(tmp_path / name)
+    sim = Simulator(NetlistParser(COUNTER).parse(), recorder=WaveStoreWriter(path, chunk_steps=chunk_steps), **kwargs)
+    assert sim.run(steps, inputs) == {}
+    return sim, WaveStore(path)
+
+
+def test_store_matches_history_across_chunks(tmp_path):
+    rng = random.Random(3)
+    inputs = {"en": "".join(rng.choice("01") for _ in range(500))}
+    expected = Simulator(NetlistParser(COUNTER).parse()).run(500, inputs)
+    _, store = record(tmp_path, "run", 500, inputs)
+    with store:
+        assert store.steps == 500 and store.complete
+        assert store.waveforms() == expected
+        assert store.window("q1", 60, 200) == expected["q1"][60:200]
+        assert store.row(130) == [expected[name][130] for name in store.signals]
+
+
+def test_cycle_detection_replays_into_the_store(tmp_path):
+    steps = 1000
+    expected_sim = Simulator(NetlistParser(COUNTER).parse())
+    expected = expected_sim.run(steps, {"en": "1"})
+    sim, store = record(tmp_path, "cycle", steps, {"en": "1"}, chunk_steps=100)
+    assert sim.cycle == expected_sim.cycle is not None
+    with store:
+        assert store.meta["cycle"] == {"start": sim.cycle[0], "length": sim.cycle[1]}
+        assert store.waveforms() == expected
+
+
+def test_reopen_and_segments(tmp_path):
+    _, store = record(tmp_path, "seg", 300, {"en": "1" * 40 + "0"})
+    store.close()
+    with WaveStore(str(tmp_path / "seg")) as again:
+        q2 = again.window("q2")
+        runs = again.segments("q2")
+        assert [v for _, v in runs] == [q2[t] for t, _ in runs]
+        assert all(q2[t] != q2[t - 1] for t, _ in runs[1:])
+        assert again.segments("q2", 50, 70)[0][0] == 50
+        with pytest.raises(KeyError):
+            again.window("nope")
+
+
+def test_diff_stores(tmp_path):
+    _, a = record(tmp_path, "a", 200, {"en": "1"})
+    _, b = record(tmp_path, "b", 200, {"en": "1" * 100 + "0"})
+    with a, b:
+        result = diff_stores(a, b, signals=["q0", "en"])
+        assert result.signals["en"] == [(100, 200, 1, 0)]
+        assert not diff_stores(a, a).signals
+
+
+def test_vcd_export(tmp_path):
+    _, store = record(tmp_path, "vcd", 10, {"en": "1"})
+    out = io.StringIO()
+    with store:
+        store.write_vcd(out, names=["clk", "q0"])
+    text = out.getvalue()
+    assert "$var wire 1 ! clk $end" in text and "$var wire 1 \" q0 $end" in text
+    assert text.splitlines()[-1] == "#10"
+    assert "#1\n1!\n" in text
+
+
+def test_four_state_values_go_to_bytes_columns(tmp_path):
+    circuit = NetlistParser("CIRCUIT t\nINPUT a\nOUTPUT y\nGATE g1 NOT a y\n").parse()
+    path = str(tmp_path / "fs")
+    writer = WaveStoreWriter(path, chunk_steps=3)
+    history = FourStateSimulator(circuit).run(5, {"a": "01xz1"})
+    writer.start(list(history))
+    for t in range(5):
+        writer.append([history[name][t] for name in history])
+    writer.close()
+    with WaveStore(path) as store:
+        assert store.waveforms() == history